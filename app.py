@@ -1,14 +1,26 @@
+import logging
 from flask import Flask, jsonify
 from flask_cors import CORS
 from flask_restful import Api
 from config import Config
-from extensions import db, migrate  # ← Now in same directory
+from extensions import db, migrate, user_cache, token_verifier, revocation_store, exercise_catalog, password_hasher, rate_limiter, query_stats, metrics  # ← Now in same directory
 from server.routes import register_routes  # ← Changed
+from server.cli import fitflow_cli
+from server.utils.database import engine_options, pool_stats, sqlite_pragmas, install_sqlite_pragmas
+from server.utils.db_routing import init_replica
+from server.utils.json_output import output_json
+from server.utils.structured_logging import configure_logging
 
-def create_app():
+logger = logging.getLogger(__name__)
+
+def create_app(test_config=None):
     """Flask application factory"""
     app = Flask(__name__)
     app.config.from_object(Config)
+    if test_config:
+        app.config.update(test_config)
+    app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", engine_options(app.config))
+    configure_logging(app)  # before anything touches app.logger
 
     # IMPROVED CORS - allows all origins for development
     CORS(app, resources={
@@ -20,13 +32,34 @@ def create_app():
     })
 
     db.init_app(app)
-    migrate.init_app(app, db)
+    replica = init_replica(app, engine_options)
 
     with app.app_context():
-        db.create_all()
+        # Only registers a connect hook - no connection is opened here
+        for engine in [db.engine, replica]:
+            if engine is not None:
+                install_sqlite_pragmas(engine, sqlite_pragmas(app.config))
+    migrate.init_app(app, db)
+    user_cache.init_app(app)
+    token_verifier.init_app(app)
+    revocation_store.init_app(app)
+    exercise_catalog.init_app(app)
+    password_hasher.init_app(app)
+    query_stats.init_app(app)  # outermost hooks: SQL counts are live for metrics
+    metrics.init_app(app)  # before the rate limiter, so its timing covers it too
+    rate_limiter.init_app(app)  # before_request hook, runs ahead of auth and queries
+
+    # Startup does no database I/O - the schema is managed with
+    # `flask db upgrade` / `flask fitflow init-db`. AUTO_CREATE_TABLES=1
+    # brings back the old create-on-boot behaviour for quick local setups.
+    if app.config.get("AUTO_CREATE_TABLES"):
+        with app.app_context():
+            db.create_all()
 
     api = Api(app)  
+    api.representation("application/json")(output_json)  # orjson when installed
     register_routes(api)
+    app.cli.add_command(fitflow_cli)
 
     @app.route('/')
     def index():
@@ -34,13 +67,15 @@ def create_app():
 
     @app.route('/api/health')
     def health():
-        return jsonify({"status": "healthy"}), 200
+        status = {"status": "healthy", "db_pool": pool_stats(db.engine)}
+        if replica is not None:
+            status["replica_pool"] = pool_stats(replica)
+        return jsonify(status), 200
 
     @app.errorhandler(Exception)
     def handle_exception(e):
-        import traceback
-        print(f"❌ ERROR: {str(e)}")
-        traceback.print_exc()
+        # Queued and formatted (traceback included) off the request thread
+        logger.error("Unhandled exception: %s", e, exc_info=e)
         
         response = jsonify({
             "error": str(e), 
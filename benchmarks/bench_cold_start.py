@@ -0,0 +1,65 @@
+"""
+Cold-start time of `run.py` (what every gunicorn worker pays on boot).
+
+Each sample is a fresh interpreter importing run.py, timed twice:
+the in-process import + create_app() time, and the wall time of the
+whole process. Compares the default zero-I/O startup with
+AUTO_CREATE_TABLES=1 (the old create_all() on boot).
+
+    python benchmarks/bench_cold_start.py
+    python benchmarks/bench_cold_start.py --runs 20 --database-url postgresql://localhost/fitflow
+"""
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = (
+    "import time; began = time.perf_counter(); import run; "
+    "print(time.perf_counter() - began)"
+)
+
+
+def sample(env):
+    began = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=ROOT, env=env,
+        capture_output=True, text=True, check=True,
+    ).stdout
+    wall = time.perf_counter() - began
+    return float(output.strip().splitlines()[-1]), wall
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--database-url", help="defaults to a temporary copy of server/instance/app.db")
+    args = parser.parse_args()
+
+    url = args.database_url
+    if not url:
+        copy = os.path.join(tempfile.mkdtemp(), "app.db")
+        shutil.copy(os.path.join(ROOT, "server", "instance", "app.db"), copy)
+        url = "sqlite:///" + copy
+
+    modes = {
+        "zero DB I/O (default)": {"AUTO_CREATE_TABLES": "0"},
+        "create_all on boot": {"AUTO_CREATE_TABLES": "1"},
+    }
+    print(f"{args.runs} cold starts per mode against {url.split(':', 1)[0]}\n")
+    for label, extra in modes.items():
+        env = dict(os.environ, DATABASE_URL=url, **extra)
+        sample(env)  # warm the OS file cache and .pyc files
+        imports, walls = zip(*(sample(env) for _ in range(args.runs)))
+        print(f"  {label:<24} import+create_app p50 {statistics.median(imports) * 1000:7.1f} ms"
+              f"   process p50 {statistics.median(walls) * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
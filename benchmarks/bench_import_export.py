@@ -0,0 +1,97 @@
+"""
+Throughput (rows/sec) of POST /import and GET /export.
+
+Generates an NDJSON export with WORKOUTS workouts, EXERCISES exercises
+per workout and one progress log per workout, imports it through
+POST /import, exports it again through GET /export (NDJSON and CSV),
+and compares with the old path of one POST per workout and per log.
+
+    python benchmarks/bench_import_export.py
+    python benchmarks/bench_import_export.py --workouts 20000 --exercises 6
+    python benchmarks/bench_import_export.py --database-url postgresql://localhost/fitflow_bench
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from models import db, User, Exercise
+from extensions import exercise_catalog
+from server.utils.jwt_handler import create_token
+
+EXERCISE_NAMES = ["Squats", "Bench Press", "Deadlift", "Rows", "Lunges", "Plank", "Running", "Cycling"]
+
+
+def build_export(workouts, exercises_per_workout):
+    start = date(2000, 1, 1)
+    lines = []
+    for i in range(workouts):
+        day = (start + timedelta(days=i)).isoformat()
+        lines.append({"type": "workout", "id": i, "name": f"Session {i}", "date": day, "duration": 45, "workout_type": "Strength"})
+    for i in range(workouts):
+        for position in range(exercises_per_workout):
+            lines.append({"type": "workout_exercise", "workout_id": i, "exercise": EXERCISE_NAMES[position % len(EXERCISE_NAMES)],
+                          "sets": 3, "reps": 10, "order": position + 1})
+    for i in range(workouts):
+        lines.append({"type": "progress_log", "log_date": (start + timedelta(days=i)).isoformat(), "weight": 80.0})
+    return b"".join(json.dumps(line).encode() + b"\n" for line in lines), len(lines)
+
+
+def setup(app):
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        users = [User(username=f"bench{i}", email=f"bench{i}@example.com", password_hash="x") for i in range(2)]
+        db.session.add_all(users)
+        db.session.add_all([Exercise(name=name, category="Strength") for name in EXERCISE_NAMES])
+        db.session.commit()
+        exercise_catalog.invalidate()
+        return [{"Authorization": f"Bearer {create_token(u.id)}"} for u in users]
+
+
+def rate(rows, seconds):
+    return f"{rows:8d} rows in {seconds:7.2f}s  = {rows / seconds:10.0f} rows/sec"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workouts", type=int, default=5000)
+    parser.add_argument("--exercises", type=int, default=4, help="exercises per workout")
+    parser.add_argument("--single-posts", type=int, default=300, help="workouts to create one POST at a time for comparison")
+    parser.add_argument("--database-url", help="defaults to a temporary SQLite file")
+    args = parser.parse_args()
+
+    url = args.database_url or "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+    app = create_app({"SQLALCHEMY_DATABASE_URI": url, "RATE_LIMIT_ENABLED": False})
+    importer, per_row = setup(app)
+    client = app.test_client()
+
+    body, rows = build_export(args.workouts, args.exercises)
+    print(f"{args.workouts} workouts x {args.exercises} exercises + {args.workouts} logs on {url.split(':', 1)[0]}\n")
+
+    began = time.perf_counter()
+    response = client.post("/import", data=body, headers=dict(importer, **{"Content-Type": "application/x-ndjson"}))
+    assert response.status_code == 201, response.get_json()
+    print(f"  {'POST /import (NDJSON)':<28} {rate(rows, time.perf_counter() - began)}")
+
+    for label, query in (("GET /export (NDJSON)", ""), ("GET /export (CSV)", "?format=csv")):
+        began = time.perf_counter()
+        response = client.get(f"/export{query}", headers=importer, buffered=False)
+        exported = sum(chunk.count(b"\n") for chunk in response.response) - (1 if query else 0)
+        print(f"  {label:<28} {rate(exported, time.perf_counter() - began)}")
+
+    began = time.perf_counter()
+    for i in range(args.single_posts):
+        client.post("/workouts", json={"name": f"Single {i}", "date": "2024-01-01", "duration": 45}, headers=per_row)
+        client.post("/progress_logs", json={"log_date": "2024-01-01", "weight": 80.0}, headers=per_row)
+    print(f"  {'one POST per row (old path)':<28} {rate(args.single_posts * 2, time.perf_counter() - began)}")
+
+
+if __name__ == "__main__":
+    main()
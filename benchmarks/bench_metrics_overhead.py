@@ -0,0 +1,76 @@
+"""
+Per-request overhead of the /metrics instrumentation.
+
+Times the before/after hooks on their own (inside a request context,
+so this is exactly what every request pays), the bare record() call,
+and GET /api/health end to end with METRICS_ENABLED on and off.
+
+    python benchmarks/bench_metrics_overhead.py
+    python benchmarks/bench_metrics_overhead.py --requests 50000
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Response
+from app import create_app
+from extensions import metrics
+
+
+def per_call_us(fn, calls):
+    began = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - began) / calls * 1e6
+
+
+def end_to_end_us(app, requests, rounds=5):
+    client = app.test_client()
+    for _ in range(200):
+        client.get("/api/health")
+    samples = []
+    for _ in range(rounds):
+        began = time.perf_counter()
+        for _ in range(requests // rounds):
+            client.get("/api/health")
+        samples.append((time.perf_counter() - began) / (requests // rounds) * 1e6)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200000, help="hook / record() calls to time")
+    parser.add_argument("--requests", type=int, default=20000, help="requests per end-to-end run")
+    args = parser.parse_args()
+
+    base = {"TESTING": True, "SQLALCHEMY_DATABASE_URI": "sqlite://", "RATE_LIMIT_ENABLED": False}
+    app = create_app(dict(base, METRICS_ENABLED=True))
+    response = Response()
+
+    with app.test_request_context("/workouts"):
+        state = app.extensions["metrics"]
+        key = ("workoutresource", "GET", "2xx")
+        record = per_call_us(lambda: metrics.record(state, key, 0.012, 0.003, 2), args.calls)
+
+        start, finish = state.hooks
+
+        def hooks():
+            start()
+            finish(response)
+        both = per_call_us(hooks, args.calls)
+
+    with_metrics = end_to_end_us(app, args.requests)
+    without = end_to_end_us(create_app(dict(base, METRICS_ENABLED=False)), args.requests)
+
+    print(f"  {'record() alone':<34} {record:7.2f} us")
+    print(f"  {'before + after hooks per request':<34} {both:7.2f} us")
+    print(f"  {'GET /api/health, metrics off':<34} {without:7.2f} us")
+    print(f"  {'GET /api/health, metrics on':<34} {with_metrics:7.2f} us   (+{with_metrics - without:.2f} us, noisy)")
+
+
+if __name__ == "__main__":
+    main()
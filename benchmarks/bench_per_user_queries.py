@@ -0,0 +1,133 @@
+"""
+Per-user query latency with and without the composite indexes.
+
+Builds a throwaway database with USERS x WORKOUTS rows, times the
+per-user listing queries, adds the indexes from migration 4c1f2e9a7b3d
+and times them again.
+
+    python benchmarks/bench_per_user_queries.py                     # 10k users x 1k workouts, SQLite
+    python benchmarks/bench_per_user_queries.py --users 1000 --workouts 100
+    python benchmarks/bench_per_user_queries.py --database-url postgresql://localhost/fitflow_bench
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import bindparam, create_engine, insert, select, text
+from models import db, User, Workout, ProgressLog
+
+BATCH_SIZE = 50000
+
+
+def build_schema(engine):
+    db.metadata.drop_all(engine)
+    db.metadata.create_all(engine)
+    # Start from the pre-migration schema: no secondary indexes
+    with engine.begin() as conn:
+        for table in (Workout.__table__, ProgressLog.__table__):
+            for index in table.indexes:
+                index.drop(conn)
+
+
+def add_indexes(engine):
+    with engine.begin() as conn:
+        for table in (Workout.__table__, ProgressLog.__table__):
+            for index in table.indexes:
+                index.create(conn)
+        conn.execute(text("ANALYZE"))
+
+
+def populate(engine, users, workouts_per_user):
+    start = date(2020, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__), [
+            {"id": u, "username": f"user{u}", "email": f"user{u}@example.com", "password_hash": "x"}
+            for u in range(1, users + 1)
+        ])
+
+    # Rows are inserted day by day across all users, so each user's rows are
+    # scattered through the table the way they are in production
+    workout_batch, log_batch = [], []
+    with engine.begin() as conn:
+        for day in range(workouts_per_user):
+            for u in range(1, users + 1):
+                when = start + timedelta(days=day)
+                workout_batch.append({"user_id": u, "name": "Session", "date": when, "duration": 45})
+                log_batch.append({"user_id": u, "log_date": when, "weight": 80.0})
+                if len(workout_batch) >= BATCH_SIZE:
+                    conn.execute(insert(Workout.__table__), workout_batch)
+                    conn.execute(insert(ProgressLog.__table__), log_batch)
+                    workout_batch, log_batch = [], []
+        if workout_batch:
+            conn.execute(insert(Workout.__table__), workout_batch)
+            conn.execute(insert(ProgressLog.__table__), log_batch)
+
+
+def time_queries(engine, users, samples):
+    workouts, logs = Workout.__table__, ProgressLog.__table__
+    queries = {
+        "workouts page (limit 50)": select(workouts)
+            .where(workouts.c.user_id == bindparam("user_id"))
+            .order_by(workouts.c.date, workouts.c.id).limit(50),
+        "workouts full list": select(workouts)
+            .where(workouts.c.user_id == bindparam("user_id")),
+        "progress logs page (limit 50)": select(logs)
+            .where(logs.c.user_id == bindparam("user_id"))
+            .order_by(logs.c.log_date, logs.c.id).limit(50),
+    }
+    user_ids = [random.randint(1, users) for _ in range(samples)]
+    results = {}
+    with engine.connect() as conn:
+        for label, query in queries.items():
+            timings = []
+            for user_id in user_ids:
+                began = time.perf_counter()
+                rows = conn.execute(query, {"user_id": user_id}).fetchall()
+                timings.append((time.perf_counter() - began) * 1000)
+                # Every generated user has rows; an empty result means the
+                # user id never reached the query
+                assert rows, f"{label} returned no rows for user {user_id}"
+            timings.sort()
+            results[label] = (statistics.median(timings), timings[int(len(timings) * 0.95) - 1])
+    return results
+
+
+def report(title, results):
+    print(f"\n{title}")
+    for label, (p50, p95) in results.items():
+        print(f"  {label:<32} p50 {p50:9.3f} ms   p95 {p95:9.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--workouts", type=int, default=1000, help="workouts (and progress logs) per user")
+    parser.add_argument("--samples", type=int, default=200, help="random users to query")
+    parser.add_argument("--database-url", help="defaults to a temporary SQLite file")
+    args = parser.parse_args()
+
+    url = args.database_url
+    if not url:
+        url = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_engine(url)
+
+    print(f"Building {args.users} users x {args.workouts} workouts on {engine.url.drivername}...")
+    began = time.perf_counter()
+    build_schema(engine)
+    populate(engine, args.users, args.workouts)
+    print(f"Loaded {args.users * args.workouts * 2} rows in {time.perf_counter() - began:.1f}s")
+
+    report("Without indexes", time_queries(engine, args.users, args.samples))
+    add_indexes(engine)
+    report("With (user_id, date) / (user_id, log_date) indexes", time_queries(engine, args.users, args.samples))
+
+
+if __name__ == "__main__":
+    main()
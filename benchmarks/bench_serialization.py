@@ -0,0 +1,111 @@
+"""
+Serialization cost of a 5,000-row list response.
+
+Loads ROWS workouts for one user and times turning them into a JSON body:
+the old per-attribute to_dict() + stdlib json.dumps, the column-tuple
+to_dict() + json_output.dumps (orjson when installed), loading entities
+versus column-projected rows, and a full GET /workouts through the test
+client.
+
+    python benchmarks/bench_serialization.py
+    python benchmarks/bench_serialization.py --rows 20000 --runs 20
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert
+from app import create_app
+from models import db, User, Workout
+from server.utils import json_output
+from server.utils.jwt_handler import create_token
+
+
+def legacy_to_dict(workout):
+    """to_dict() as it was before the column serializers"""
+    return {
+        'id': workout.id,
+        'user_id': workout.user_id,
+        'name': workout.name,
+        'description': workout.description,
+        'date': workout.date.isoformat() if workout.date else None,
+        'duration': workout.duration,
+        'calories_burned': workout.calories_burned,
+        'workout_type': workout.workout_type
+    }
+
+
+def populate(rows):
+    db.drop_all()
+    db.create_all()
+    db.session.execute(insert(User.__table__), [{"id": 1, "username": "bench", "email": "bench@example.com", "password_hash": "x"}])
+    start = date(2010, 1, 1)
+    db.session.execute(insert(Workout.__table__), [
+        {"user_id": 1, "name": f"Session {i}", "date": start + timedelta(days=i),
+         "duration": 45, "calories_burned": 320.5, "workout_type": "Strength"}
+        for i in range(rows)
+    ])
+    db.session.commit()
+
+
+def timed(fn, runs):
+    timings = []
+    for _ in range(runs):
+        began = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - began) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    app = create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": "sqlite://", "RATE_LIMIT_ENABLED": False})
+    encoder = "orjson" if json_output.orjson else "json (orjson not installed)"
+    print(f"{args.rows} workouts, median of {args.runs} runs, encoder: {encoder}\n")
+
+    with app.app_context():
+        populate(args.rows)
+        workouts = Workout.query.all()
+        headers = {"Authorization": f"Bearer {create_token(1)}"}
+
+        old = timed(lambda: json.dumps([legacy_to_dict(w) for w in workouts]), args.runs)
+        new = timed(lambda: json_output.dumps([w.to_dict() for w in workouts]), args.runs)
+        dicts = timed(lambda: [legacy_to_dict(w) for w in workouts], args.runs)
+        tuples = timed(lambda: [w.to_dict() for w in workouts], args.runs)
+
+        def load_entities():
+            db.session.expunge_all()
+            return [w.to_dict() for w in Workout.query.filter_by(user_id=1)]
+
+        def load_rows():
+            rows = db.session.query(*Workout.serialize_columns()).filter(Workout.user_id == 1)
+            return [Workout.row_to_dict(row) for row in rows]
+
+        entities = timed(load_entities, args.runs)
+        projected = timed(load_rows, args.runs)
+
+    client = app.test_client()
+    client.get("/workouts", headers=headers)  # warm the user and token caches
+    request = timed(lambda: client.get("/workouts", headers=headers), args.runs)
+
+    print(f"  {'per-attribute to_dict only':<40} {dicts:9.2f} ms")
+    print(f"  {'column-tuple to_dict only':<40} {tuples:9.2f} ms")
+    print(f"  {'per-attribute to_dict + json.dumps':<40} {old:9.2f} ms")
+    print(f"  {'column-tuple to_dict + json_output':<40} {new:9.2f} ms   ({old / new:.1f}x)")
+    print(f"  {'query entities + to_dict':<40} {entities:9.2f} ms")
+    print(f"  {'query columns + row_to_dict':<40} {projected:9.2f} ms   ({entities / projected:.1f}x)")
+    print(f"  {'GET /workouts end to end':<40} {request:9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Concurrent write/read throughput on SQLite: stock settings vs the tuned
+profile (WAL, busy_timeout, mmap, cache_size, synchronous=NORMAL).
+
+Starts WRITERS processes inserting progress logs one commit at a time and
+READERS processes reading per-user pages, like gunicorn workers sharing
+server/instance/app.db, and counts completed operations and lock errors.
+
+    python benchmarks/bench_sqlite_concurrency.py
+    python benchmarks/bench_sqlite_concurrency.py --writers 4 --readers 8 --seconds 10
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, exc, insert, select
+from config import Config
+from models import db, User, ProgressLog
+from server.utils.database import install_sqlite_pragmas, sqlite_pragmas
+
+USERS = 200
+
+
+def make_engine(path, tuned):
+    engine = create_engine(f"sqlite:///{path}")
+    if tuned:
+        config = {key: getattr(Config, key) for key in dir(Config) if key.isupper()}
+        config["SQLITE_TUNING"] = True
+        install_sqlite_pragmas(engine, sqlite_pragmas(config))
+    return engine
+
+
+def prepare(path, tuned):
+    engine = make_engine(path, tuned)
+    db.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__), [
+            {"id": u, "username": f"user{u}", "email": f"user{u}@example.com", "password_hash": "x"}
+            for u in range(1, USERS + 1)
+        ])
+    engine.dispose()
+
+
+def writer(path, tuned, deadline, results):
+    engine = make_engine(path, tuned)
+    done = errors = 0
+    while time.time() < deadline:
+        try:
+            with engine.begin() as conn:
+                conn.execute(insert(ProgressLog.__table__).values(
+                    user_id=random.randint(1, USERS),
+                    log_date=date(2024, 1, 1) + timedelta(days=random.randint(0, 365)),
+                    weight=random.uniform(50, 100),
+                ))
+            done += 1
+        except exc.OperationalError:
+            errors += 1
+    results.put(("write", done, errors))
+
+
+def reader(path, tuned, deadline, results):
+    engine = make_engine(path, tuned)
+    table = ProgressLog.__table__
+    done = errors = 0
+    while time.time() < deadline:
+        try:
+            with engine.connect() as conn:
+                conn.execute(
+                    select(table).where(table.c.user_id == random.randint(1, USERS))
+                    .order_by(table.c.log_date, table.c.id).limit(50)
+                ).fetchall()
+            done += 1
+        except exc.OperationalError:
+            errors += 1
+    results.put(("read", done, errors))
+
+
+def run(tuned, args):
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    prepare(path, tuned)
+
+    results = multiprocessing.Queue()
+    deadline = time.time() + args.seconds
+    workers = [multiprocessing.Process(target=writer, args=(path, tuned, deadline, results)) for _ in range(args.writers)]
+    workers += [multiprocessing.Process(target=reader, args=(path, tuned, deadline, results)) for _ in range(args.readers)]
+    for worker in workers:
+        worker.start()
+    totals = {"write": [0, 0], "read": [0, 0]}
+    for _ in workers:
+        kind, done, errors = results.get()
+        totals[kind][0] += done
+        totals[kind][1] += errors
+    for worker in workers:
+        worker.join()
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+
+    print(f"{args.writers} writers + {args.readers} readers for {args.seconds:g}s each\n")
+    for label, tuned in (("stock SQLite", False), ("tuned profile", True)):
+        totals = run(tuned, args)
+        writes, write_errors = totals["write"]
+        reads, read_errors = totals["read"]
+        print(f"  {label:<14} writes {writes / args.seconds:9.0f}/s ({write_errors} lock errors)"
+              f"   reads {reads / args.seconds:9.0f}/s ({read_errors} lock errors)")
+
+
+if __name__ == "__main__":
+    main()
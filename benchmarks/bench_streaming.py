@@ -0,0 +1,74 @@
+"""
+Peak memory of GET /progress_logs, buffered vs streamed.
+
+Loads N progress logs for one user, then measures the peak traced Python
+allocation (tracemalloc) while the response body is produced and
+consumed, for the plain list and for ?stream=1 / NDJSON. The streamed
+peak should stay flat as N grows.
+
+    python benchmarks/bench_streaming.py
+    python benchmarks/bench_streaming.py --rows 10000 50000 200000
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert
+from app import create_app
+from models import db, User, ProgressLog
+from server.utils.jwt_handler import create_token
+
+
+def populate(rows):
+    db.drop_all()
+    db.create_all()
+    db.session.execute(insert(User.__table__), [{"id": 1, "username": "bench", "email": "bench@example.com", "password_hash": "x"}])
+    start = date(1950, 1, 1)
+    db.session.execute(insert(ProgressLog.__table__), [
+        {"user_id": 1, "log_date": start + timedelta(days=i), "weight": 80.0, "notes": "steady progress"}
+        for i in range(rows)
+    ])
+    db.session.commit()
+
+
+def measure(client, url, headers):
+    tracemalloc.start()
+    began = time.perf_counter()
+    response = client.get(url, headers=headers, buffered=False)
+    size = sum(len(chunk) for chunk in response.response)
+    elapsed = time.perf_counter() - began
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024 / 1024, elapsed * 1000, size / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 50000])
+    args = parser.parse_args()
+
+    app = create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": "sqlite://", "RATE_LIMIT_ENABLED": False})
+    client = app.test_client()
+    modes = {
+        "buffered list": ("/progress_logs", {}),
+        "?stream=1 (JSON array)": ("/progress_logs?stream=1", {}),
+        "NDJSON": ("/progress_logs", {"Accept": "application/x-ndjson"}),
+    }
+    for rows in args.rows:
+        with app.app_context():
+            populate(rows)
+            auth = {"Authorization": f"Bearer {create_token(1)}"}
+        client.get("/progress_logs?limit=1", headers=auth)  # warm the user and token caches
+        print(f"\n{rows} progress logs")
+        for label, (url, extra) in modes.items():
+            peak, elapsed, size = measure(client, url, dict(auth, **extra))
+            print(f"  {label:<24} peak {peak:8.1f} MiB   {elapsed:8.1f} ms   body {size:6.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,13 @@ basedir = os.path.abspath(os.path.dirname(__file__))
 class Config:
     SECRET_KEY = os.getenv("SECRET_KEY", "fitflow-secret-key-2024")
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "fitflow-jwt-secret-key-2024")
+    JWT_EXPIRATION_SECONDS = int(os.getenv("JWT_EXPIRATION_SECONDS", 24 * 60 * 60))
+    JWT_LEEWAY_SECONDS = int(os.getenv("JWT_LEEWAY_SECONDS", 0))
+
+    # Where logged-out tokens are remembered: memory, database or redis.
+    # Use database or redis when running more than one worker.
+    REVOCATION_BACKEND = os.getenv("REVOCATION_BACKEND", "memory")
+    REVOCATION_REDIS_URL = os.getenv("REVOCATION_REDIS_URL", "redis://localhost:6379/0")
     
     # FIXED: Handle both Render PostgreSQL and local SQLite
     database_url = os.getenv('DATABASE_URL')
@@ -22,4 +29,80 @@ class Config:
         # Fallback to SQLite for local development - CORRECTED PATH
         SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(basedir, 'server', 'instance', 'app.db')}"
     
-    SQLALCHEMY_TRACK_MODIFICATIONS = False
\ No newline at end of file
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Optional read replica - GET handlers read from it, writes always go to the primary
+    READ_REPLICA_URL = os.getenv('READ_REPLICA_URL')
+    if READ_REPLICA_URL and READ_REPLICA_URL.startswith('postgres://'):
+        READ_REPLICA_URL = READ_REPLICA_URL.replace('postgres://', 'postgresql://', 1)
+
+    # Connection pool for Postgres (ignored for SQLite) - sized per gunicorn worker
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 3))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 2))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 10))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 300))   # seconds; drop connections before Render's idle cutoff
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "1") == "1"
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 0))  # 0 = no limit
+
+    # SQLite profile for single-node deployments (WAL, mmap, synchronous=NORMAL)
+    SQLITE_TUNING = os.getenv("SQLITE_TUNING", "1") == "1"
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))
+    SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", -64000))        # negative = KiB, so ~64MB
+    SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024))
+    # Create missing tables when the app starts (off: use migrations or `flask fitflow init-db`)
+    AUTO_CREATE_TABLES = os.getenv("AUTO_CREATE_TABLES", "0") == "1"
+
+    # Logging: JSON lines on stderr, written by a background thread
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    LOG_LEVELS = {  # per-module levels, e.g. LOG_LEVELS="server.utils.jwt_handler=DEBUG,sqlalchemy.engine=INFO"
+        name.strip(): level.strip().upper()
+        for name, level in (item.split("=", 1) for item in os.getenv("LOG_LEVELS", "").split(",") if "=" in item)
+    }
+    LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", 10000))
+    # Repeated warnings/errors: the first LOG_SAMPLE_BURST per LOG_SAMPLE_WINDOW seconds, then 1 in LOG_SAMPLE_EVERY
+    LOG_SAMPLE_BURST = int(os.getenv("LOG_SAMPLE_BURST", 10))
+    LOG_SAMPLE_EVERY = int(os.getenv("LOG_SAMPLE_EVERY", 100))
+    LOG_SAMPLE_WINDOW = float(os.getenv("LOG_SAMPLE_WINDOW", 60))
+
+    # Per-endpoint request counters and latency histograms at /metrics (Prometheus format)
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+
+    # Query diagnostics: slow statements and repeated (N+1) statements are logged as warnings
+    SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", 200))   # 0 = log no slow queries
+    N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", 10))
+    # Server-Timing header with DB time per response; unset = on only in debug
+    SERVER_TIMING = os.getenv("SERVER_TIMING") == "1" if os.getenv("SERVER_TIMING") else None
+
+    # Password hashing runs on a small per-worker pool; logins past the queue get a 503
+    PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "pbkdf2:sha256:600000")
+    PASSWORD_HASH_TARGET_MS = int(os.getenv("PASSWORD_HASH_TARGET_MS", 0))  # >0: calibrate pbkdf2 to this latency at startup
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+    PASSWORD_HASH_QUEUE_SIZE = int(os.getenv("PASSWORD_HASH_QUEUE_SIZE", 8))
+    PASSWORD_HASH_QUEUE_TIMEOUT = float(os.getenv("PASSWORD_HASH_QUEUE_TIMEOUT", 5))
+
+    # Token-bucket rate limits: capacity is the burst, refill is tokens per second
+    RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "1") == "1"
+    RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")  # memory | sqlite | redis
+    RATE_LIMIT_SQLITE_PATH = os.getenv("RATE_LIMIT_SQLITE_PATH", os.path.join(basedir, "server", "instance", "rate_limits.db"))
+    RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0")
+    RATE_LIMIT_USER_CAPACITY = int(os.getenv("RATE_LIMIT_USER_CAPACITY", 60))
+    RATE_LIMIT_USER_REFILL = float(os.getenv("RATE_LIMIT_USER_REFILL", 2))
+    RATE_LIMIT_IP_CAPACITY = int(os.getenv("RATE_LIMIT_IP_CAPACITY", 30))
+    RATE_LIMIT_IP_REFILL = float(os.getenv("RATE_LIMIT_IP_REFILL", 1))
+    # Reverse proxies in front of the app; anonymous clients are keyed on X-Forwarded-For
+    # from that many hops back. Render (which sets RENDER) runs one proxy.
+    RATE_LIMIT_TRUSTED_PROXIES = int(os.getenv("RATE_LIMIT_TRUSTED_PROXIES", 1 if os.getenv("RENDER") else 0))
+    # Per-endpoint costs, e.g. RATE_LIMIT_COSTS="loginapi=10,workoutresource=2"
+    RATE_LIMIT_COSTS = {
+        name.strip(): int(cost)
+        for name, cost in (item.split("=", 1) for item in os.getenv("RATE_LIMIT_COSTS", "").split(",") if "=" in item)
+    }
+
+    # Authenticated user lookups are cached per worker for this many seconds
+    USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", 60))
+    USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", 10000))
+
+    # How long clients may use the exercise catalogue before revalidating (0 = always revalidate)
+    EXERCISE_CACHE_MAX_AGE = int(os.getenv("EXERCISE_CACHE_MAX_AGE", 0))
+    # How often each worker checks whether another worker changed the exercise library
+    EXERCISE_CATALOG_CHECK_INTERVAL = float(os.getenv("EXERCISE_CATALOG_CHECK_INTERVAL", 5))
\ No newline at end of file
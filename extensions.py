@@ -3,6 +3,23 @@
 
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
+from server.utils.user_cache import UserCache
+from server.utils.token_verifier import TokenVerifier
+from server.utils.revocation import RevocationStore
+from server.utils.exercise_catalog import ExerciseCatalog
+from server.utils.db_routing import RoutingSession
+from server.utils.password_hasher import PasswordHasher
+from server.utils.rate_limit import RateLimiter
+from server.utils.metrics import Metrics
+from server.utils.query_stats import QueryStats
 
-db = SQLAlchemy()      # Main database instance
-migrate = Migrate()    # Migration manager
\ No newline at end of file
+db = SQLAlchemy(session_options={"class_": RoutingSession})  # Main database instance (reads can go to a replica)
+migrate = Migrate()        # Migration manager
+user_cache = UserCache()   # Authenticated user lookups
+token_verifier = TokenVerifier()  # JWT issuing and verification
+revocation_store = RevocationStore()  # Logged-out tokens
+exercise_catalog = ExerciseCatalog()  # In-process copy of the exercise library
+password_hasher = PasswordHasher()  # Bounded pool for password hashing
+rate_limiter = RateLimiter()  # Token buckets per user / IP
+query_stats = QueryStats()  # Per-request SQL counts, slow-query and N+1 logging
+metrics = Metrics()  # Per-endpoint request metrics at /metrics
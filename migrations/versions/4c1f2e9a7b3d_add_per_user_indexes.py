@@ -0,0 +1,40 @@
+"""Add per-user, date-ordered indexes
+
+Revision ID: 4c1f2e9a7b3d
+Revises: 30aaa8d1b0a0
+Create Date: 2026-10-18 09:12:41.118302
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4c1f2e9a7b3d'
+down_revision = '30aaa8d1b0a0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('workouts', schema=None) as batch_op:
+        batch_op.create_index('ix_workouts_user_id_date', ['user_id', 'date'], unique=False)
+
+    with op.batch_alter_table('progress_logs', schema=None) as batch_op:
+        batch_op.create_index('ix_progress_logs_user_id_log_date', ['user_id', 'log_date'], unique=False)
+
+    with op.batch_alter_table('workout_exercises', schema=None) as batch_op:
+        batch_op.create_index('ix_workout_exercises_workout_id_order', ['workout_id', 'order'], unique=False)
+        batch_op.create_index('ix_workout_exercises_user_id', ['user_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('workout_exercises', schema=None) as batch_op:
+        batch_op.drop_index('ix_workout_exercises_user_id')
+        batch_op.drop_index('ix_workout_exercises_workout_id_order')
+
+    with op.batch_alter_table('progress_logs', schema=None) as batch_op:
+        batch_op.drop_index('ix_progress_logs_user_id_log_date')
+
+    with op.batch_alter_table('workouts', schema=None) as batch_op:
+        batch_op.drop_index('ix_workouts_user_id_date')
@@ -0,0 +1,43 @@
+"""Add workout_daily_stats rollup table
+
+Revision ID: b7d2a4f08e19
+Revises: 8e3b5d21c6f4
+Create Date: 2026-10-18 13:40:02.715364
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d2a4f08e19'
+down_revision = '8e3b5d21c6f4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('workout_daily_stats',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('workout_type', sa.String(length=50), nullable=False),
+        sa.Column('workout_count', sa.Integer(), nullable=False),
+        sa.Column('total_duration', sa.Integer(), nullable=False),
+        sa.Column('total_calories', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('user_id', 'day', 'workout_type')
+    )
+
+    # Backfill from existing workouts
+    op.execute("""
+        INSERT INTO workout_daily_stats
+            (user_id, day, workout_type, workout_count, total_duration, total_calories)
+        SELECT user_id, date, COALESCE(workout_type, ''), COUNT(*),
+               COALESCE(SUM(duration), 0), COALESCE(SUM(calories_burned), 0)
+        FROM workouts
+        GROUP BY user_id, date, COALESCE(workout_type, '')
+    """)
+
+
+def downgrade():
+    op.drop_table('workout_daily_stats')
@@ -0,0 +1,29 @@
+"""Add catalog_versions table
+
+Revision ID: d41c9a6e2f57
+Revises: b7d2a4f08e19
+Create Date: 2026-10-18 15:22:19.093471
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd41c9a6e2f57'
+down_revision = 'b7d2a4f08e19'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    catalog_versions = op.create_table('catalog_versions',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+    op.bulk_insert(catalog_versions, [{'name': 'exercises', 'version': 1}])
+
+
+def downgrade():
+    op.drop_table('catalog_versions')
@@ -1,14 +1,14 @@
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy_serializer import SerializerMixin
-from sqlalchemy.orm import validates
+from sqlalchemy.orm import validates, selectinload
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
-from extensions import db
+from extensions import db, password_hasher
+from server.utils.serializers import ColumnSerializerMixin
 
 # -----------------------
 # User model
 # -----------------------
-class User(db.Model, SerializerMixin):
+class User(db.Model, ColumnSerializerMixin, SerializerMixin):
     __tablename__ = "users"
 
     id = db.Column(db.Integer, primary_key=True)
@@ -27,28 +27,24 @@ class User(db.Model, SerializerMixin):
     workouts = db.relationship("Workout", backref="user", cascade="all, delete-orphan", lazy=True)
     progress_logs = db.relationship("ProgressLog", backref="user", cascade="all, delete-orphan", lazy=True)
     workout_exercises = db.relationship("WorkoutExercise", backref="user", cascade="all, delete-orphan", lazy=True)
+    workout_stats = db.relationship("WorkoutDailyStat", cascade="all, delete-orphan", lazy=True)
 
     # FIXED: Proper serialize_rules for DateTime handling
-    serialize_rules = ('-password_hash', '-workouts', '-progress_logs', '-workout_exercises', '-created_at')
+    serialize_rules = ('-password_hash', '-workouts', '-progress_logs', '-workout_exercises', '-workout_stats', '-created_at')
+    # to_dict() for auth responses (it excludes created_at)
+    serialize_fields = ('id', 'username', 'email', 'age', 'height', 'weight', 'fitness_goal', 'target_weight')
 
+    # Hashing runs on the bounded password_hasher pool (503 when it is saturated)
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
-
-    # Keep this for auth responses (it excludes created_at)
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'username': self.username,
-            'email': self.email,
-            'age': self.age,
-            'height': self.height,
-            'weight': self.weight,
-            'fitness_goal': self.fitness_goal,
-            'target_weight': self.target_weight
-        }
+        """Verify a password, upgrading the stored hash if it uses outdated parameters (caller commits)"""
+        if not password_hasher.verify(self.password_hash, password):
+            return False
+        if password_hasher.needs_rehash(self.password_hash):
+            self.set_password(password)
+        return True
 
     @validates("username")
     def validate_username(self, key, username):
@@ -65,7 +61,7 @@ class User(db.Model, SerializerMixin):
 # -----------------------
 # Workout model
 # -----------------------
-class Workout(db.Model, SerializerMixin):
+class Workout(db.Model, ColumnSerializerMixin, SerializerMixin):
     __tablename__ = "workouts"
 
     id = db.Column(db.Integer, primary_key=True)
@@ -79,27 +75,37 @@ class Workout(db.Model, SerializerMixin):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     workout_exercises = db.relationship("WorkoutExercise", backref="workout", cascade="all, delete-orphan", lazy=True)
+
+    # Per-user listings are filtered by user and ordered by date
+    __table_args__ = (
+        db.Index("ix_workouts_user_id_date", "user_id", "date"),
+    )
     
     # FIXED: Exclude DateTime fields and relationships
     serialize_rules = ('-workout_exercises', '-created_at')
     
-    def to_dict(self):
-        """Custom serialization to ensure date is included"""
-        return {
-            'id': self.id,
-            'user_id': self.user_id,
-            'name': self.name,
-            'description': self.description,
-            'date': self.date.isoformat() if self.date else None,
-            'duration': self.duration,
-            'calories_burned': self.calories_burned,
-            'workout_type': self.workout_type
-        }
+    serialize_fields = ('id', 'user_id', 'name', 'description', 'date', 'duration', 'calories_burned', 'workout_type')
+    serialize_dates = ('date',)
+
+    def to_dict_with_exercises(self):
+        """Workout plus its exercises in order - load with expand_exercises() first to avoid N+1 queries"""
+        data = self.to_dict()
+        entries = sorted(self.workout_exercises, key=lambda we: (we.order is None, we.order or 0, we.id))
+        data['exercises'] = [
+            dict(we.to_dict(), exercise=we.exercise.to_dict() if we.exercise else None)
+            for we in entries
+        ]
+        return data
+
+    @staticmethod
+    def expand_exercises():
+        """Loader option fetching workout -> workout_exercises -> exercise in one extra query"""
+        return selectinload(Workout.workout_exercises).joinedload(WorkoutExercise.exercise)
 
 # -----------------------
 # Exercise model
 # -----------------------
-class Exercise(db.Model, SerializerMixin):
+class Exercise(db.Model, ColumnSerializerMixin, SerializerMixin):
     __tablename__ = "exercises"
 
     id = db.Column(db.Integer, primary_key=True)
@@ -114,20 +120,12 @@ class Exercise(db.Model, SerializerMixin):
     # FIXED: Exclude DateTime field
     serialize_rules = ('-workout_exercises', '-created_at')
     
-    def to_dict(self):
-        """Custom serialization for Exercise"""
-        return {
-            'id': self.id,
-            'name': self.name,
-            'category': self.category,
-            'muscle_group': self.muscle_group,
-            'description': self.description
-        }
+    serialize_fields = ('id', 'name', 'category', 'muscle_group', 'description')
 
 # -----------------------
 # WorkoutExercise model
 # -----------------------
-class WorkoutExercise(db.Model, SerializerMixin):
+class WorkoutExercise(db.Model, ColumnSerializerMixin, SerializerMixin):
     __tablename__ = "workout_exercises"
 
     id = db.Column(db.Integer, primary_key=True)
@@ -144,29 +142,21 @@ class WorkoutExercise(db.Model, SerializerMixin):
     order = db.Column(db.Integer)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    # Exercises are always read per workout, in order
+    __table_args__ = (
+        db.Index("ix_workout_exercises_workout_id_order", "workout_id", "order"),
+        db.Index("ix_workout_exercises_user_id", "user_id"),
+    )
+
     # FIXED: Exclude DateTime field
     serialize_rules = ('-created_at',)
     
-    def to_dict(self):
-        """Custom serialization for WorkoutExercise"""
-        return {
-            'id': self.id,
-            'user_id': self.user_id,
-            'workout_id': self.workout_id,
-            'exercise_id': self.exercise_id,
-            'sets': self.sets,
-            'reps': self.reps,
-            'weight': self.weight,
-            'duration': self.duration,
-            'distance': self.distance,
-            'notes': self.notes,
-            'order': self.order
-        }
+    serialize_fields = ('id', 'user_id', 'workout_id', 'exercise_id', 'sets', 'reps', 'weight', 'duration', 'distance', 'notes', 'order')
 
 # -----------------------
 # ProgressLog model
 # -----------------------
-class ProgressLog(db.Model, SerializerMixin):
+class ProgressLog(db.Model, ColumnSerializerMixin, SerializerMixin):
     __tablename__ = "progress_logs"
 
     id = db.Column(db.Integer, primary_key=True)
@@ -182,21 +172,50 @@ class ProgressLog(db.Model, SerializerMixin):
     notes = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    # Per-user listings are filtered by user and ordered by log date
+    __table_args__ = (
+        db.Index("ix_progress_logs_user_id_log_date", "user_id", "log_date"),
+    )
+
     # FIXED: Exclude DateTime fields
     serialize_rules = ('-created_at',)
     
-    def to_dict(self):
-        """Custom serialization to ensure log_date is included"""
-        return {
-            'id': self.id,
-            'user_id': self.user_id,
-            'log_date': self.log_date.isoformat() if self.log_date else None,
-            'weight': self.weight,
-            'body_fat': self.body_fat,
-            'chest': self.chest,
-            'waist': self.waist,
-            'hips': self.hips,
-            'biceps': self.biceps,
-            'thighs': self.thighs,
-            'notes': self.notes
-        }
\ No newline at end of file
+    serialize_fields = ('id', 'user_id', 'log_date', 'weight', 'body_fat', 'chest', 'waist', 'hips', 'biceps', 'thighs', 'notes')
+    serialize_dates = ('log_date',)
+
+# -----------------------
+# CatalogVersion model
+# -----------------------
+class CatalogVersion(db.Model):
+    """Version counters for shared catalogues, bumped on every change (used for ETags)"""
+    __tablename__ = "catalog_versions"
+
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+# -----------------------
+# WorkoutDailyStat model
+# -----------------------
+class WorkoutDailyStat(db.Model):
+    """
+    Per-user, per-day, per-type workout totals. Updated alongside every
+    workout write so stats never have to re-scan the workouts table.
+    """
+    __tablename__ = "workout_daily_stats"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    workout_type = db.Column(db.String(50), primary_key=True)  # '' when the workout has no type
+    workout_count = db.Column(db.Integer, nullable=False, default=0)
+    total_duration = db.Column(db.Integer, nullable=False, default=0)
+    total_calories = db.Column(db.Float, nullable=False, default=0)
+
+# -----------------------
+# RevokedToken model
+# -----------------------
+class RevokedToken(db.Model):
+    """Logged-out tokens, kept until they would have expired anyway"""
+    __tablename__ = "revoked_tokens"
+
+    jti = db.Column(db.String(64), primary_key=True)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
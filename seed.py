@@ -1,5 +1,6 @@
 from app import create_app, db
-from models import User, Workout, Exercise, WorkoutExercise, ProgressLog
+from models import User, Workout, Exercise, WorkoutExercise, ProgressLog, WorkoutDailyStat
+from server.utils.workout_stats import rebuild_workout_stats
 from datetime import datetime, timedelta
 import random
 
@@ -9,6 +10,7 @@ def clear_data():
     """Clear existing data from all tables"""
     print("Clearing existing data...")
     db.session.query(WorkoutExercise).delete()
+    db.session.query(WorkoutDailyStat).delete()
     db.session.query(ProgressLog).delete()
     db.session.query(Workout).delete()
     db.session.query(Exercise).delete()
@@ -118,6 +120,8 @@ def create_workouts(users, exercises):
     ))
     
     db.session.add_all(workouts)
+    db.session.flush()
+    rebuild_workout_stats()
     db.session.commit()
     return workouts
 
@@ -270,6 +274,7 @@ def create_progress_logs(users):
 if __name__ == '__main__':
     with app.app_context():
         print("Starting FitFlow database seeding...")
+        db.create_all()
         clear_data()
         exercises = create_exercises()
         users = create_users()
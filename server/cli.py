@@ -0,0 +1,92 @@
+import click
+from flask.cli import AppGroup
+from alembic.runtime.migration import MigrationContext
+from flask_migrate import stamp, upgrade
+from sqlalchemy import inspect
+from sqlalchemy.exc import SQLAlchemyError
+from extensions import db
+from server.utils.catalog_version import get_version, bump_version
+from server.utils.workout_stats import rebuild_workout_stats
+from server.utils.data_transfer import read_ndjson, read_csv, import_records, RecordError
+
+fitflow_cli = AppGroup("fitflow", help="FitFlow maintenance commands.")
+
+
+@fitflow_cli.command("init-db")
+def init_db_command():
+    """Create or upgrade the schema to the latest migration (replaces create_all on every boot)."""
+    inspector = inspect(db.engine)
+    existing = set(inspector.get_table_names())
+    with db.engine.connect() as conn:
+        revision = MigrationContext.configure(conn).get_current_revision()
+
+    if not existing:
+        # Brand new database: it already matches the latest migration
+        db.create_all()
+        stamp()
+        click.echo("✅ Database created at the latest migration")
+    elif revision is not None:
+        # Managed by migrations: let them bring it up to date
+        upgrade()
+        click.echo("✅ Database upgraded to the latest migration")
+    else:
+        adopt_unversioned_database(inspector, existing)
+        stamp()
+        click.echo("✅ Existing database brought up to the latest migration and stamped")
+
+
+def adopt_unversioned_database(inspector, existing):
+    """
+    Bring a database built by the old boot-time create_all() level with the
+    latest migration: the initial migration can't run against it, so do what
+    the later migrations would have done.
+    """
+    db.create_all()  # new tables, with their indexes
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing:
+            continue
+        present = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in present:
+                index.create(db.engine)
+
+    # Data the migrations add along with their tables
+    if "workout_daily_stats" not in existing:
+        rebuild_workout_stats()
+    if not get_version():
+        bump_version(db.session.connection())
+    db.session.commit()
+
+
+@fitflow_cli.command("rebuild-stats")
+@click.option("--user-id", type=int, help="Only rebuild this user's rows.")
+def rebuild_stats_command(user_id):
+    """Recompute the workout_daily_stats rollup from the workouts table."""
+    rebuild_workout_stats(user_id)
+    db.session.commit()
+    click.echo("✅ Workout stats rebuilt")
+
+
+@fitflow_cli.command("import")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--user-id", type=int, required=True, help="Account to add the records to.")
+@click.option("--format", "fmt", type=click.Choice(["ndjson", "csv"]), help="Defaults to the file extension.")
+def import_command(path, user_id, fmt):
+    """Import a GET /export file (NDJSON or CSV) into an account."""
+    from models import User
+    if db.session.get(User, user_id) is None:
+        raise click.ClickException(f"No user with id {user_id}")
+    fmt = fmt or ("csv" if path.lower().endswith(".csv") else "ndjson")
+    with open(path, "rb") as f:
+        records = read_csv(f) if fmt == "csv" else read_ndjson(f)
+        try:
+            counts = import_records(user_id, records)
+            db.session.commit()
+        except RecordError as e:
+            db.session.rollback()
+            raise click.ClickException(f"Import failed at {e}")
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise click.ClickException(f"Import failed: the database rejected a record ({e})")
+    summary = ", ".join(f"{count} {kind}s" for kind, count in counts.items())
+    click.echo(f"✅ Imported {summary}")
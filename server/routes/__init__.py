@@ -11,11 +11,12 @@ from .users import (
     UserLogoutResource,
     UserResource,
 )
-from .workouts import WorkoutResource
+from .workouts import WorkoutResource, WorkoutFullResource, WorkoutStatsResource
 from .exercises import ExerciseResource
-from .workout_exercises import WorkoutExerciseResource
-from .progress_logs import ProgressLogResource
+from .workout_exercises import WorkoutExerciseResource, WorkoutExerciseListResource
+from .progress_logs import ProgressLogResource, ProgressLogSummaryResource, ProgressLogBulkResource
 from .auth import RegisterAPI, LoginAPI, CurrentUserAPI
+from .data_transfer import ExportResource, ImportResource
 
 def register_routes(api: Api):
     """Register all API routes"""
@@ -33,12 +34,21 @@ def register_routes(api: Api):
 
     # Workouts
     api.add_resource(WorkoutResource, "/workouts", "/workouts/<int:workout_id>")
+    api.add_resource(WorkoutFullResource, "/workouts/full")
+    api.add_resource(WorkoutStatsResource, "/workouts/stats")
 
     # Exercises
     api.add_resource(ExerciseResource, "/exercises", "/exercises/<int:exercise_id>")
 
     # WorkoutExercises
-    api.add_resource(WorkoutExerciseResource, "/workout_exercises", "/workout_exercises/<int:we_id>")
+    api.add_resource(WorkoutExerciseListResource, "/workout_exercises")
+    api.add_resource(WorkoutExerciseResource, "/workout_exercises/<int:we_id>")
 
     # ProgressLogs
-    api.add_resource(ProgressLogResource, "/progress_logs", "/progress_logs/<int:log_id>")
\ No newline at end of file
+    api.add_resource(ProgressLogResource, "/progress_logs", "/progress_logs/<int:log_id>")
+    api.add_resource(ProgressLogSummaryResource, "/progress_logs/summary")
+    api.add_resource(ProgressLogBulkResource, "/progress_logs/bulk")
+
+    # Bulk export / import
+    api.add_resource(ExportResource, "/export")
+    api.add_resource(ImportResource, "/import")
\ No newline at end of file
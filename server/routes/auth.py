@@ -41,6 +41,7 @@ class LoginAPI(Resource):
         user = User.query.filter_by(username=username).first()
         if not user or not user.check_password(password):
             return {"error": "Invalid credentials"}, 401
+        db.session.commit()  # saves the upgraded hash if check_password rehashed it
 
         token = create_token(user.id)
         if not token:
@@ -52,4 +53,8 @@ class CurrentUserAPI(Resource):
     """Get current authenticated user - ADDED to fix /auth/me endpoint"""
     @token_required
     def get(self, current_user):
-        return {"user": current_user.to_dict()}, 200
+        # current_user is the cached identity - load the full profile here
+        user = User.query.get(current_user.id)
+        if not user:
+            return {"error": "User not found"}, 404
+        return {"user": user.to_dict()}, 200
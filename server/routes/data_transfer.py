@@ -0,0 +1,42 @@
+from flask import request, Response, stream_with_context
+from flask_restful import Resource
+from sqlalchemy.exc import SQLAlchemyError
+from models import db
+from server.utils.jwt_handler import token_required
+from server.utils.data_transfer import (
+    export_records, ndjson_chunks, csv_chunks, read_ndjson, read_csv, import_records, RecordError,
+)
+
+class ExportResource(Resource):
+    """Stream the current user's workouts, workout exercises and progress logs"""
+
+    @token_required
+    def get(self, current_user):
+        as_csv = request.args.get('format') == 'csv' or request.accept_mimetypes.best == 'text/csv'
+        records = export_records(current_user.id)
+        if as_csv:
+            body, mimetype, extension = csv_chunks(records), 'text/csv', 'csv'
+        else:
+            body, mimetype, extension = ndjson_chunks(records), 'application/x-ndjson', 'ndjson'
+        headers = {"Content-Disposition": f'attachment; filename="fitflow-export.{extension}"'}
+        return Response(stream_with_context(body), mimetype=mimetype, headers=headers)
+
+class ImportResource(Resource):
+    """Add an export file (NDJSON, or CSV with Content-Type: text/csv) to the current user's account"""
+
+    @token_required
+    def post(self, current_user):
+        # Read the body as it arrives instead of loading it all with get_json()
+        stream = request.stream
+        records = read_csv(stream) if request.mimetype == 'text/csv' else read_ndjson(stream)
+        try:
+            counts = import_records(current_user.id, records)
+            db.session.commit()
+        except RecordError as e:
+            db.session.rollback()
+            return {"error": f"Import failed at {e}"}, 400
+        except SQLAlchemyError as e:
+            # A value the database refused - nothing from the file is kept
+            db.session.rollback()
+            return {"error": f"Import failed: the database rejected a record ({e.__class__.__name__})"}, 400
+        return {"message": "Import complete", "imported": counts}, 201
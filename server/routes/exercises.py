@@ -1,18 +1,45 @@
-from flask import request
+from flask import request, current_app, Response
 from flask_restful import Resource
 from models import db, Exercise
+from extensions import exercise_catalog
+from server.utils.db_routing import use_replica
 from server.utils.jwt_handler import token_required
 
+def cache_headers(etag):
+    """Let clients keep the catalogue and revalidate it with If-None-Match"""
+    max_age = current_app.config.get("EXERCISE_CACHE_MAX_AGE", 0)
+    cache_control = f"private, max-age={max_age}" if max_age else "private, no-cache"
+    return {"ETag": f'"{etag}"', "Cache-Control": cache_control}
+
 class ExerciseResource(Resource):
+    @use_replica
     @token_required
     def get(self, current_user, exercise_id=None):  # Fixed: self first
+        try:
+            fields = Exercise.parse_fields(request.args.get('fields'))
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        # The whole library shares one version, bumped on every exercise change.
+        # ETag and body both come from this one snapshot.
+        catalog = exercise_catalog.snapshot()
+        etag = f"exercises-v{catalog.version}"
+        if exercise_id:
+            etag = f"{etag}-{exercise_id}"
+        headers = cache_headers(etag)
+        if request.if_none_match.contains(etag):
+            return Response(status=304, headers=headers)
+
+        # Served from the in-process catalogue - no query unless it is stale
         if exercise_id:
-            exercise = Exercise.query.get(exercise_id)
+            exercise = catalog.by_id.get(exercise_id)
             if not exercise:
                 return {"error": "Exercise not found"}, 404
-            return exercise.to_dict(), 200
-        exercises = Exercise.query.all()
-        return [e.to_dict() for e in exercises], 200
+            return {name: exercise[name] for name in fields}, 200, headers
+        exercises = catalog.items
+        if fields != Exercise.serialize_fields:
+            exercises = [{name: e[name] for name in fields} for e in exercises]
+        return exercises, 200, headers
 
     @token_required
     def post(self, current_user):  # Fixed: self first
@@ -26,6 +53,7 @@ class ExerciseResource(Resource):
             )
             db.session.add(exercise)
             db.session.commit()
+            exercise_catalog.invalidate()
             return {"message": "Exercise created", "exercise": exercise.to_dict()}, 201
         except Exception as e:
             db.session.rollback()
@@ -41,6 +69,7 @@ class ExerciseResource(Resource):
             if key in data:
                 setattr(exercise, key, data[key])
         db.session.commit()
+        exercise_catalog.invalidate()
         return {"message": "Exercise updated", "exercise": exercise.to_dict()}, 200
 
     @token_required
@@ -50,4 +79,5 @@ class ExerciseResource(Resource):
             return {"error": "Exercise not found"}, 404
         db.session.delete(exercise)
         db.session.commit()
+        exercise_catalog.invalidate()
         return {"message": "Exercise deleted"}, 200
\ No newline at end of file
@@ -1,11 +1,27 @@
 from flask import request
 from flask_restful import Resource
+from datetime import date
+from sqlalchemy import func, select, insert, update, bindparam
 from models import db, ProgressLog
+from server.utils.db_routing import use_replica
 from server.utils.jwt_handler import token_required
+from server.utils.pagination import wants_page, parse_page_args, keyset_page
+from server.utils.streaming import stream_format, stream_rows
+from server.utils.date_buckets import bucket_start, parse_date_range, isoformat
+
+SUMMARY_METRICS = ['weight', 'body_fat', 'chest', 'waist', 'hips', 'biceps', 'thighs']
+LOG_FIELDS = SUMMARY_METRICS + ['notes']
+MAX_BULK_LOGS = 1000
 
 class ProgressLogResource(Resource):
+    @use_replica
     @token_required
     def get(self, current_user, log_id=None):
+        try:
+            fields = ProgressLog.parse_fields(request.args.get('fields'))
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
         if log_id:
             # FIXED: Filter by user_id
             log = ProgressLog.query.filter_by(
@@ -14,11 +30,28 @@ class ProgressLogResource(Resource):
             ).first()
             if not log:
                 return {"error": "Progress log not found"}, 404
-            return log.to_dict(), 200
+            data = log.to_dict()
+            return {name: data[name] for name in fields}, 200
         
         # Already filtered by user - good!
-        logs = ProgressLog.query.filter_by(user_id=current_user.id).all()
-        return [l.to_dict() for l in logs], 200
+        # Select just the serialized columns - no entities, no identity map
+        query = db.session.query(*ProgressLog.serialize_columns(fields, extra=('log_date', 'id')))
+        query = query.filter(ProgressLog.user_id == current_user.id)
+        fmt = stream_format(request)
+        if fmt:
+            # Whole history, fetched and written in batches
+            query = query.order_by(ProgressLog.log_date, ProgressLog.id)
+            return stream_rows(query, lambda l: ProgressLog.row_to_dict(l, fields), fmt)
+        if wants_page(request.args):
+            try:
+                after, limit = parse_page_args(request.args)
+            except ValueError as e:
+                return {"error": str(e)}, 400
+            logs, next_cursor = keyset_page(query, ProgressLog.log_date, ProgressLog.id, after, limit)
+            return {"items": [ProgressLog.row_to_dict(l, fields) for l in logs], "next_cursor": next_cursor}, 200
+
+        logs = query.all()
+        return [ProgressLog.row_to_dict(l, fields) for l in logs], 200
 
     @token_required
     def post(self, current_user):  # Fixed: self first
@@ -83,4 +116,147 @@ class ProgressLogResource(Resource):
             return {"error": "Progress log not found"}, 404
         db.session.delete(log)
         db.session.commit()
-        return {"message": "Progress log deleted"}, 200
\ No newline at end of file
+        return {"message": "Progress log deleted"}, 200
+
+def parse_reading(reading):
+    """Validate one bulk reading. Returns (log_date, values) or raises ValueError."""
+    if not isinstance(reading, dict):
+        raise ValueError("must be an object")
+    try:
+        log_date = date.fromisoformat(reading['log_date'])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError("log_date must be YYYY-MM-DD")
+    values = {key: reading[key] for key in LOG_FIELDS if key in reading}
+    for key in SUMMARY_METRICS:
+        value = values.get(key)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))):
+            raise ValueError(f"{key} must be a number")
+    return log_date, values
+
+class ProgressLogBulkResource(Resource):
+    """
+    Upsert many readings at once (smart scales, wearables). One log per
+    day: a reading updates the fields it carries on that day's latest log,
+    or creates the log if the day has none.
+    """
+
+    @token_required
+    def post(self, current_user):
+        data = request.get_json(silent=True)
+        readings = data.get('logs') if isinstance(data, dict) else data
+        if not isinstance(readings, list) or not readings:
+            return {"error": "Expected a non-empty list of progress logs"}, 400
+        if len(readings) > MAX_BULK_LOGS:
+            return {"error": f"At most {MAX_BULK_LOGS} progress logs per request"}, 400
+
+        # Validate everything before touching the database; later readings for a day win
+        by_date, errors = {}, []
+        for index, reading in enumerate(readings):
+            try:
+                log_date, values = parse_reading(reading)
+            except ValueError as e:
+                errors.append({"index": index, "error": str(e)})
+                continue
+            by_date.setdefault(log_date, {}).update(values)
+        if errors:
+            return {"error": "Invalid progress logs", "details": errors}, 400
+
+        # No unique (user_id, log_date) constraint - older data can have several
+        # logs per day - so look the days up instead of INSERT ... ON CONFLICT
+        existing = dict(
+            db.session.query(ProgressLog.log_date, func.max(ProgressLog.id))
+            .filter(ProgressLog.user_id == current_user.id, ProgressLog.log_date.in_(list(by_date)))
+            .group_by(ProgressLog.log_date)
+        )
+
+        new_rows, changes = [], {}
+        for log_date, values in by_date.items():
+            if log_date in existing:
+                if values:
+                    # executemany needs the same columns in every row
+                    changes.setdefault(tuple(sorted(values)), []).append(dict(values, log_id=existing[log_date]))
+            else:
+                new_rows.append(dict(dict.fromkeys(LOG_FIELDS), **values, user_id=current_user.id, log_date=log_date))
+
+        table = ProgressLog.__table__
+        if new_rows:
+            db.session.execute(insert(table), new_rows)
+        for columns, rows in changes.items():
+            stmt = update(table).where(table.c.id == bindparam('log_id')).values({name: bindparam(name) for name in columns})
+            db.session.execute(stmt, rows)
+        db.session.commit()
+
+        return {
+            "message": "Progress logs saved",
+            "created": len(new_rows),
+            "updated": len(by_date) - len(new_rows),
+        }, 200
+
+class ProgressLogSummaryResource(Resource):
+    """Per-week or per-month min/max/avg/first/last of each measurement, aggregated in SQL"""
+
+    @use_replica
+    @token_required
+    def get(self, current_user):
+        bucket_name = request.args.get('bucket', 'week')
+        try:
+            start, end = parse_date_range(request.args)
+            bucket = bucket_start(ProgressLog.log_date, bucket_name)
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        # Inner query: one row per log with its bucket and the bucket's first/last values.
+        # Each metric's window is split on IS NULL so partial logs don't supply a
+        # null first/last; the null partition's values are dropped by min() below.
+        order = (ProgressLog.log_date, ProgressLog.id)
+        columns = [bucket.label('bucket')]
+        for name in SUMMARY_METRICS:
+            column = getattr(ProgressLog, name)
+            window = {'partition_by': (bucket, column.is_(None)), 'order_by': order, 'rows': (None, None)}
+            columns += [
+                column.label(name),
+                func.first_value(column).over(**window).label(f'{name}_first'),
+                func.last_value(column).over(**window).label(f'{name}_last'),
+            ]
+        logs = select(*columns).where(ProgressLog.user_id == current_user.id)
+        if start:
+            logs = logs.where(ProgressLog.log_date >= start)
+        if end:
+            logs = logs.where(ProgressLog.log_date <= end)
+        logs = logs.subquery()
+
+        # Outer query: GROUP BY bucket
+        aggregates = [logs.c.bucket, func.count().label('count')]
+        for name in SUMMARY_METRICS:
+            aggregates += [
+                func.min(logs.c[name]),
+                func.max(logs.c[name]),
+                func.avg(logs.c[name]),
+                func.min(logs.c[f'{name}_first']),
+                func.min(logs.c[f'{name}_last']),
+            ]
+        rows = db.session.execute(
+            select(*aggregates).group_by(logs.c.bucket).order_by(logs.c.bucket)
+        ).all()
+
+        points = []
+        for row in rows:
+            point = {'period_start': isoformat(row[0]), 'count': row[1]}
+            for i, name in enumerate(SUMMARY_METRICS):
+                low, high, avg, first, last = row[2 + i * 5: 7 + i * 5]
+                point[name] = {
+                    'min': low,
+                    'max': high,
+                    'avg': float(avg) if avg is not None else None,
+                    'first': first,
+                    'last': last,
+                    'change': last - first if first is not None and last is not None else None,
+                }
+            points.append(point)
+
+        return {
+            'bucket': bucket_name,
+            'from': start.isoformat() if start else None,
+            'to': end.isoformat() if end else None,
+            'points': points,
+        }, 200
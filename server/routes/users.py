@@ -1,13 +1,9 @@
-from flask import request, current_app
+from flask import request
 from flask_restful import Resource
 from models import User
-from extensions import db
-from server.utils.jwt_handler import token_required  # ← ADDED 'server.'
-import jwt
-from datetime import datetime, timedelta
-
-# In-memory token blacklist
-BLACKLIST = set()
+from extensions import db, user_cache, token_verifier, revocation_store
+from server.utils.db_routing import use_replica
+from server.utils.jwt_handler import token_required, create_token  # ← ADDED 'server.'
 
 # User registration
 class UserRegisterResource(Resource):
@@ -44,13 +40,11 @@ class UserLoginResource(Resource):
         user = User.query.filter_by(username=username).first()
         if not user or not user.check_password(password):
             return {"message": "Invalid credentials"}, 401
+        db.session.commit()  # saves the upgraded hash if check_password rehashed it
 
-        payload = {
-            "user_id": user.id,
-            "username": user.username,
-            "exp": datetime.utcnow() + timedelta(hours=1)
-        }
-        token = jwt.encode(payload, current_app.config["JWT_SECRET_KEY"], algorithm="HS256")
+        token = create_token(user.id, username=user.username)
+        if not token:
+            return {"message": "Token creation failed"}, 500
         return {"message": "Login successful", "token": token, "user": user.to_dict()}, 200  # Added user to response
 
 # User logout
@@ -59,11 +53,17 @@ class UserLogoutResource(Resource):
         token = request.headers.get("Authorization", "").replace("Bearer ", "")
         if not token:
             return {"message": "Token missing"}, 400
-        BLACKLIST.add(token)
+        try:
+            claims = token_verifier.decode(token)
+        except Exception:
+            return {"message": "Invalid or expired token"}, 401
+        # Remembered only until the token would have expired anyway
+        revocation_store.revoke(claims["jti"], claims["exp"])
         return {"message": "Logged out successfully"}, 200
 
 # User profile CRUD
 class UserResource(Resource):
+    @use_replica
     @token_required  # Added decorator
     def get(self, current_user, user_id=None):  # Fixed: self first, added current_user
         if user_id:
@@ -86,6 +86,7 @@ class UserResource(Resource):
         if "password" in data:
             user.set_password(data["password"])
         db.session.commit()
+        user_cache.invalidate(user.id)
         return {"message": "User updated", "user": user.to_dict()}, 200
 
     @token_required  # Added decorator
@@ -95,4 +96,5 @@ class UserResource(Resource):
             return {"message": "User not found"}, 404
         db.session.delete(user)
         db.session.commit()
+        user_cache.invalidate(user_id)
         return {"message": "User deleted"}, 200
\ No newline at end of file
@@ -1,8 +1,13 @@
 from flask_restful import Resource
 from flask import request
-from models import db, WorkoutExercise
+from models import db, Workout, WorkoutExercise
+from extensions import exercise_catalog
 from server.utils.jwt_handler import token_required
 
+def is_id(value):
+    """True for an integer id from JSON (bools are ints in Python, but not ids)"""
+    return isinstance(value, int) and not isinstance(value, bool)
+
 class WorkoutExerciseResource(Resource):
     @token_required
     def get(self, current_user, we_id):
@@ -16,7 +21,14 @@ class WorkoutExerciseResource(Resource):
         entry = WorkoutExercise.query.get(we_id)
         if not entry:
             return {"error": "WorkoutExercise not found"}, 404
-        data = request.get_json()
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return {"error": "Request body must be a JSON object"}, 400
+        if 'exercise_id' in data:
+            if not is_id(data['exercise_id']):
+                return {"error": "exercise_id must be an integer"}, 400
+            if not exercise_catalog.get(data['exercise_id']):
+                return {"error": "Exercise not found"}, 404
         for key, value in data.items():
             if hasattr(entry, key):
                 setattr(entry, key, value)
@@ -35,11 +47,23 @@ class WorkoutExerciseResource(Resource):
 class WorkoutExerciseListResource(Resource):
     @token_required
     def get(self, current_user):
-        return [e.to_dict() for e in WorkoutExercise.query.all()], 200
+        # Only the current user's entries
+        entries = WorkoutExercise.query.filter_by(user_id=current_user.id).all()
+        return [e.to_dict() for e in entries], 200
 
     @token_required
     def post(self, current_user):
-        data = request.get_json()
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return {"error": "Request body must be a JSON object"}, 400
+        for key in ('workout_id', 'exercise_id'):
+            if not is_id(data.get(key)):
+                return {"error": f"{key} must be an integer"}, 400
+        # Only allow adding exercises to your own workouts
+        if not Workout.query.filter_by(id=data.get('workout_id'), user_id=current_user.id).first():
+            return {"error": "Workout not found"}, 404
+        if not exercise_catalog.get(data['exercise_id']):
+            return {"error": "Exercise not found"}, 404
         entry = WorkoutExercise(
             user_id=current_user.id,
             workout_id=data['workout_id'],
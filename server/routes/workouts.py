@@ -1,45 +1,120 @@
+import math
+from datetime import datetime
 from flask import request
 from flask_restful import Resource
-from models import db, Workout
+from sqlalchemy import func, insert
+from sqlalchemy.exc import SQLAlchemyError
+from models import db, Workout, WorkoutExercise, WorkoutDailyStat
+from extensions import exercise_catalog
+from server.utils.db_routing import use_replica
 from server.utils.jwt_handler import token_required
+from server.utils.pagination import wants_page, parse_page_args, keyset_page
+from server.utils.streaming import stream_format, stream_rows
+from server.utils.date_buckets import bucket_start, parse_date_range, isoformat
+from server.utils.workout_stats import workout_delta, merge_deltas, apply_deltas
+
+WORKOUT_EXERCISE_FIELDS = ['sets', 'reps', 'weight', 'duration', 'distance', 'notes', 'order']
+
+# Fields that feed the stats rollup's arithmetic, and the type each must have
+WORKOUT_NUMBERS = {'duration': int, 'calories_burned': float}
+
+def parse_numbers(data):
+    """Coerce duration/calories_burned in request JSON to numbers, in place. Raises ValueError."""
+    for key, kind in WORKOUT_NUMBERS.items():
+        value = data.get(key)
+        if value is None:
+            continue
+        try:
+            if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+                raise ValueError
+            number = float(value)
+            if not math.isfinite(number) or (kind is int and not number.is_integer()):
+                raise ValueError
+        except ValueError:
+            raise ValueError(f"{key} must be a number")
+        data[key] = int(value) if kind is int and isinstance(value, int) else kind(number)
+
+def build_workout(data, user_id):
+    """Build a Workout from request JSON, parsing the date string and numbers"""
+    parse_numbers(data)
+    workout_date = data.get('date')
+    if workout_date and isinstance(workout_date, str):
+        workout_date = datetime.strptime(workout_date, '%Y-%m-%d').date()
+
+    return Workout(
+        user_id=user_id,
+        name=data['name'],
+        description=data.get('description'),
+        date=workout_date,
+        duration=data.get('duration'),
+        calories_burned=data.get('calories_burned'),
+        workout_type=data.get('workout_type')
+    )
+
+def sparse(serialize, fields):
+    """Wrap an entity serializer so it only keeps the ?fields= keys (plus nested exercises)"""
+    keep = set(fields) | {'exercises'}
+    return lambda obj: {key: value for key, value in serialize(obj).items() if key in keep}
 
 class WorkoutResource(Resource):
+    @use_replica
     @token_required
     def get(self, current_user, workout_id=None):
+        # ?expand=exercises nests each workout's exercises, loaded up front
+        expand = 'exercises' in request.args.get('expand', '').split(',')
+        try:
+            fields = Workout.parse_fields(request.args.get('fields'))
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        if workout_id or expand:
+            query = Workout.query
+            if expand:
+                query = query.options(Workout.expand_exercises())
+            serialize = Workout.to_dict_with_exercises if expand else Workout.to_dict
+            if fields != Workout.serialize_fields:
+                serialize = sparse(serialize, fields)
+        else:
+            # Plain lists select just the serialized columns - no entities, no identity map
+            query = db.session.query(*Workout.serialize_columns(fields, extra=('date', 'id')))
+            serialize = lambda row: Workout.row_to_dict(row, fields)
+
         if workout_id:
             # FIXED: Filter by user_id to prevent accessing other users' workouts
-            workout = Workout.query.filter_by(
+            workout = query.filter_by(
                 id=workout_id,
                 user_id=current_user.id
             ).first()
             if not workout:
                 return {"error": "Workout not found"}, 404
-            return workout.to_dict(), 200
+            return serialize(workout), 200
         
         # FIXED: Only return current user's workouts
-        workouts = Workout.query.filter_by(user_id=current_user.id).all()
-        return [w.to_dict() for w in workouts], 200
+        query = query.filter(Workout.user_id == current_user.id)
+        fmt = stream_format(request)
+        if fmt and not expand:
+            # Whole history, fetched and written in batches
+            query = query.order_by(Workout.date, Workout.id)
+            return stream_rows(query, serialize, fmt)
+        if wants_page(request.args):
+            try:
+                after, limit = parse_page_args(request.args)
+            except ValueError as e:
+                return {"error": str(e)}, 400
+            workouts, next_cursor = keyset_page(query, Workout.date, Workout.id, after, limit)
+            return {"items": [serialize(w) for w in workouts], "next_cursor": next_cursor}, 200
+
+        workouts = query.all()
+        return [serialize(w) for w in workouts], 200
 
     @token_required
     def post(self, current_user):  # ← FIXED: self first!
         data = request.get_json()
         try:
-            # Parse date string to date object
-            from datetime import datetime
-            workout_date = data.get('date')
-            if workout_date and isinstance(workout_date, str):
-                workout_date = datetime.strptime(workout_date, '%Y-%m-%d').date()
-            
-            workout = Workout(
-                user_id=current_user.id,
-                name=data['name'],
-                description=data.get('description'),
-                date=workout_date,
-                duration=data.get('duration'),
-                calories_burned=data.get('calories_burned'),
-                workout_type=data.get('workout_type')
-            )
+            workout = build_workout(data, current_user.id)
             db.session.add(workout)
+            db.session.flush()
+            apply_deltas(workout_delta(workout))
             db.session.commit()
             return {"message": "Workout created", "workout": workout.to_dict()}, 201
         except Exception as e:
@@ -58,14 +133,19 @@ class WorkoutResource(Resource):
         
         data = request.get_json()
         
-        # Parse date if provided
-        from datetime import datetime
-        if 'date' in data and isinstance(data['date'], str):
-            data['date'] = datetime.strptime(data['date'], '%Y-%m-%d').date()
+        try:
+            # Parse date if provided
+            if 'date' in data and isinstance(data['date'], str):
+                data['date'] = datetime.strptime(data['date'], '%Y-%m-%d').date()
+            parse_numbers(data)
+        except ValueError as e:
+            return {"error": str(e)}, 400
         
+        removed = workout_delta(workout, -1)
         for key in ['name', 'description', 'date', 'duration', 'calories_burned', 'workout_type']:
             if key in data:
                 setattr(workout, key, data[key])
+        apply_deltas(merge_deltas(removed, workout_delta(workout)))
         db.session.commit()
         return {"message": "Workout updated", "workout": workout.to_dict()}, 200
 
@@ -78,6 +158,109 @@ class WorkoutResource(Resource):
         ).first()
         if not workout:
             return {"error": "Workout not found"}, 404
+        apply_deltas(workout_delta(workout, -1))
         db.session.delete(workout)
         db.session.commit()
-        return {"message": "Workout deleted"}, 200
\ No newline at end of file
+        return {"message": "Workout deleted"}, 200
+
+class WorkoutFullResource(Resource):
+    """Create a workout together with all of its exercises in one request and one commit"""
+
+    @token_required
+    def post(self, current_user):
+        data = request.get_json(silent=True) or {}
+        if not isinstance(data, dict):
+            return {"error": "Request body must be a JSON object"}, 400
+        entries = data.get('exercises') or []
+        if not isinstance(entries, list):
+            return {"error": "exercises must be a list"}, 400
+        for entry in entries:
+            if not isinstance(entry, dict):
+                return {"error": "Each exercise must be a JSON object"}, 400
+            exercise_id = entry.get('exercise_id')
+            if not isinstance(exercise_id, int) or isinstance(exercise_id, bool):
+                return {"error": f"Invalid exercise_id: {exercise_id!r}"}, 400
+
+        try:
+            missing = exercise_catalog.missing({entry['exercise_id'] for entry in entries})
+            if missing:
+                return {"error": f"Unknown exercise_id: {sorted(missing)}"}, 400
+
+            workout = build_workout(data, current_user.id)
+            db.session.add(workout)
+            db.session.flush()  # assigns workout.id without committing
+            apply_deltas(workout_delta(workout))
+
+            rows = []
+            for position, entry in enumerate(entries, start=1):
+                row = {key: entry.get(key) for key in WORKOUT_EXERCISE_FIELDS}
+                row.update(user_id=current_user.id, workout_id=workout.id, exercise_id=entry['exercise_id'])
+                if row['order'] is None:
+                    row['order'] = position
+                rows.append(row)
+            if rows:
+                # One executemany instead of an INSERT per exercise
+                db.session.execute(insert(WorkoutExercise.__table__), rows)
+            db.session.commit()
+        except (KeyError, TypeError, ValueError) as e:
+            db.session.rollback()
+            return {"error": f"Invalid workout data: {e}"}, 400
+        except SQLAlchemyError as e:
+            # Values the database refuses (wrong types, constraints) - nothing is kept
+            db.session.rollback()
+            return {"error": f"Invalid workout data: {e.__class__.__name__}"}, 400
+
+        exercises = WorkoutExercise.query.filter_by(workout_id=workout.id).order_by(WorkoutExercise.order).all()
+        result = workout.to_dict()
+        result['exercises'] = [e.to_dict() for e in exercises]
+        return {"message": "Workout created", "workout": result}, 201
+
+class WorkoutStatsResource(Resource):
+    """Workout totals read from the per-day rollup table instead of scanning workouts"""
+
+    @use_replica
+    @token_required
+    def get(self, current_user):
+        bucket_name = request.args.get('bucket', 'week')
+        try:
+            start, end = parse_date_range(request.args)
+            bucket = bucket_start(WorkoutDailyStat.day, bucket_name).label('bucket')
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        totals = (
+            func.sum(WorkoutDailyStat.workout_count),
+            func.sum(WorkoutDailyStat.total_duration),
+            func.sum(WorkoutDailyStat.total_calories),
+        )
+        filters = [WorkoutDailyStat.user_id == current_user.id]
+        if start:
+            filters.append(WorkoutDailyStat.day >= start)
+        if end:
+            filters.append(WorkoutDailyStat.day <= end)
+
+        per_period = db.session.query(bucket, *totals).filter(*filters).group_by(bucket).order_by(bucket).all()
+        per_type = (
+            db.session.query(WorkoutDailyStat.workout_type, *totals)
+            .filter(*filters)
+            .group_by(WorkoutDailyStat.workout_type)
+            .order_by(WorkoutDailyStat.workout_type)
+            .all()
+        )
+
+        def totals_dict(count, duration, calories):
+            return {'workouts': int(count or 0), 'duration': int(duration or 0), 'calories_burned': float(calories or 0)}
+
+        by_type = [dict(workout_type=row[0] or None, **totals_dict(*row[1:])) for row in per_type]
+        return {
+            'bucket': bucket_name,
+            'from': start.isoformat() if start else None,
+            'to': end.isoformat() if end else None,
+            'totals': totals_dict(
+                sum(t['workouts'] for t in by_type),
+                sum(t['duration'] for t in by_type),
+                sum(t['calories_burned'] for t in by_type),
+            ),
+            'by_type': by_type,
+            'points': [dict(period_start=isoformat(row[0]), **totals_dict(*row[1:])) for row in per_period],
+        }, 200
@@ -0,0 +1,166 @@
+from datetime import date, timedelta
+from app import create_app, db
+from models import User, ProgressLog, WorkoutDailyStat
+from server.utils.workout_stats import rebuild_workout_stats
+from server.utils.jwt_handler import create_token
+
+app = create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": "sqlite://"})
+
+
+def setup_user():
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        user = User(username="analyst", email="analyst@example.com")
+        user.set_password("password123")
+        db.session.add(user)
+        db.session.commit()
+        return user.id, {"Authorization": f"Bearer {create_token(user.id)}"}
+
+
+def test_progress_summary_by_week_and_month():
+    user_id, headers = setup_user()
+    client = app.test_client()
+    with app.app_context():
+        # Monday 2024-01-01 .. Sunday 2024-01-14: two full weeks, one log a day
+        for i in range(14):
+            db.session.add(ProgressLog(
+                user_id=user_id,
+                log_date=date(2024, 1, 1) + timedelta(days=i),
+                weight=90 - i * 0.5,
+                waist=100 if i < 7 else None,
+            ))
+        db.session.add(ProgressLog(user_id=user_id, log_date=date(2024, 2, 10), weight=80))
+        db.session.commit()
+
+    response = client.get("/progress_logs/summary?bucket=week&to=2024-01-31", headers=headers)
+    assert response.status_code == 200
+    points = response.get_json()["points"]
+    assert [p["period_start"] for p in points] == ["2024-01-01", "2024-01-08"]
+    first_week = points[0]
+    assert first_week["count"] == 7
+    assert first_week["weight"] == {"min": 87.0, "max": 90.0, "avg": 88.5, "first": 90.0, "last": 87.0, "change": -3.0}
+    assert points[1]["waist"]["max"] is None
+
+    response = client.get("/progress_logs/summary?bucket=month", headers=headers)
+    points = response.get_json()["points"]
+    assert [(p["period_start"], p["count"]) for p in points] == [("2024-01-01", 14), ("2024-02-01", 1)]
+    print("✅ Progress summary aggregates per week and per month")
+
+
+def test_progress_summary_skips_partial_boundary_logs():
+    user_id, headers = setup_user()
+    client = app.test_client()
+    with app.app_context():
+        # Weight-only entries open and close the week; body fat sits in between
+        for day, weight, body_fat in [(1, 90, None), (2, None, 25.0), (3, 89, 24.0), (4, None, 23.5), (5, 88, None)]:
+            db.session.add(ProgressLog(user_id=user_id, log_date=date(2024, 1, day), weight=weight, body_fat=body_fat))
+        db.session.commit()
+
+    point = client.get("/progress_logs/summary?bucket=week", headers=headers).get_json()["points"][0]
+    assert point["count"] == 5
+    assert (point["weight"]["first"], point["weight"]["last"], point["weight"]["change"]) == (90.0, 88.0, -2.0)
+    assert (point["body_fat"]["first"], point["body_fat"]["last"], point["body_fat"]["change"]) == (25.0, 23.5, -1.5)
+    assert point["waist"]["first"] is None and point["waist"]["change"] is None
+    print("✅ First/last ignore logs that don't record the metric")
+
+
+def test_progress_summary_rejects_bad_args():
+    user_id, headers = setup_user()
+    client = app.test_client()
+    assert client.get("/progress_logs/summary?bucket=year", headers=headers).status_code == 400
+    assert client.get("/progress_logs/summary?from=yesterday", headers=headers).status_code == 400
+    print("✅ Unknown buckets and bad dates are rejected")
+
+
+def stats_rows():
+    with app.app_context():
+        return sorted(
+            (str(s.day), s.workout_type, s.workout_count, s.total_duration, s.total_calories)
+            for s in WorkoutDailyStat.query.all()
+        )
+
+
+def test_workout_stats_rollup_follows_writes():
+    user_id, headers = setup_user()
+    client = app.test_client()
+
+    run = {"name": "Run", "date": "2024-01-02", "duration": 30, "calories_burned": 300, "workout_type": "Cardio"}
+    lift = {"name": "Lift", "date": "2024-01-02", "duration": 60, "calories_burned": 400, "workout_type": "Strength"}
+    first = client.post("/workouts", json=run, headers=headers).get_json()["workout"]["id"]
+    client.post("/workouts", json=run, headers=headers)
+    client.post("/workouts/full", json=dict(lift, exercises=[]), headers=headers)
+    assert stats_rows() == [("2024-01-02", "Cardio", 2, 60, 600.0), ("2024-01-02", "Strength", 1, 60, 400.0)]
+
+    # Moving a workout to another day/type moves its totals with it
+    client.put(f"/workouts/{first}", json={"date": "2024-01-09", "workout_type": None, "duration": 20}, headers=headers)
+    assert stats_rows() == [
+        ("2024-01-02", "Cardio", 1, 30, 300.0),
+        ("2024-01-02", "Strength", 1, 60, 400.0),
+        ("2024-01-09", "", 1, 20, 300.0),
+    ]
+
+    client.delete(f"/workouts/{first}", headers=headers)
+    assert [row[0] for row in stats_rows()] == ["2024-01-02", "2024-01-02"]
+
+    # The incremental rollup matches a full rebuild
+    before = stats_rows()
+    with app.app_context():
+        rebuild_workout_stats(user_id)
+        db.session.commit()
+    assert stats_rows() == before
+    print("✅ Workout writes keep the daily rollup in sync")
+
+
+def test_workout_numbers_are_validated_before_the_rollup():
+    user_id, headers = setup_user()
+    client = app.test_client()
+
+    run = {"name": "Run", "date": "2024-01-02", "duration": 30, "calories_burned": 300, "workout_type": "Cardio"}
+    workout_id = client.post("/workouts", json=run, headers=headers).get_json()["workout"]["id"]
+
+    # Numeric strings are still accepted, as before the rollup existed
+    response = client.put(f"/workouts/{workout_id}", json={"duration": "45", "calories_burned": "350.5"}, headers=headers)
+    assert response.status_code == 200
+    assert response.get_json()["workout"]["duration"] == 45
+    assert stats_rows() == [("2024-01-02", "Cardio", 1, 45, 350.5)]
+
+    for bad in ({"duration": "abc"}, {"duration": 12.5}, {"calories_burned": [300]}, {"calories_burned": True},
+                {"calories_burned": "nan"}):
+        assert client.put(f"/workouts/{workout_id}", json=bad, headers=headers).status_code == 400, bad
+        assert client.post("/workouts", json=dict(run, **bad), headers=headers).status_code == 400, bad
+        assert client.post("/workouts/full", json=dict(run, exercises=[], **bad), headers=headers).status_code == 400, bad
+
+    # Nothing half-applied: the rollup still matches a rebuild
+    before = stats_rows()
+    assert before == [("2024-01-02", "Cardio", 1, 45, 350.5)]
+    with app.app_context():
+        rebuild_workout_stats(user_id)
+        db.session.commit()
+    assert stats_rows() == before
+    print("✅ Bad durations and calories get a 400 and leave the rollup alone")
+
+
+def test_workout_stats_endpoint():
+    user_id, headers = setup_user()
+    client = app.test_client()
+    for day, kind, minutes in [("2024-01-01", "Cardio", 30), ("2024-01-03", "Cardio", 20), ("2024-01-10", "Yoga", 45)]:
+        client.post("/workouts", json={"name": kind, "date": day, "duration": minutes, "calories_burned": minutes * 10, "workout_type": kind}, headers=headers)
+
+    body = client.get("/workouts/stats?bucket=week", headers=headers).get_json()
+    assert body["totals"] == {"workouts": 3, "duration": 95, "calories_burned": 950.0}
+    assert [(t["workout_type"], t["workouts"]) for t in body["by_type"]] == [("Cardio", 2), ("Yoga", 1)]
+    assert [(p["period_start"], p["workouts"]) for p in body["points"]] == [("2024-01-01", 2), ("2024-01-08", 1)]
+
+    body = client.get("/workouts/stats?bucket=day&from=2024-01-02", headers=headers).get_json()
+    assert body["totals"]["workouts"] == 2
+    print("✅ /workouts/stats reads totals from the rollup")
+
+
+if __name__ == "__main__":
+    test_progress_summary_by_week_and_month()
+    test_progress_summary_skips_partial_boundary_logs()
+    test_progress_summary_rejects_bad_args()
+    test_workout_stats_rollup_follows_writes()
+    test_workout_numbers_are_validated_before_the_rollup()
+    test_workout_stats_endpoint()
@@ -0,0 +1,62 @@
+from datetime import date
+from app import create_app, db
+from models import User, ProgressLog
+from server.utils.jwt_handler import create_token
+
+app = create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": "sqlite://"})
+
+
+def setup_user():
+    """A user who already logged their measurements on March 1st"""
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        user = User(username="scale", email="scale@example.com")
+        user.set_password("password123")
+        db.session.add(user)
+        db.session.commit()
+        db.session.add(ProgressLog(user_id=user.id, log_date=date(2024, 3, 1), weight=82.0, waist=90.0))
+        db.session.commit()
+        return user.id, {"Authorization": f"Bearer {create_token(user.id)}"}
+
+
+def test_bulk_upsert():
+    user_id, headers = setup_user()
+    client = app.test_client()
+
+    readings = [
+        {"log_date": "2024-03-01", "weight": 81.6, "body_fat": 18.2},
+        {"log_date": "2024-03-02", "weight": 81.4},
+        {"log_date": "2024-03-02", "weight": 81.3},  # same day again - the later reading wins
+        {"log_date": "2024-03-03", "weight": 81.1, "body_fat": 18.0},
+    ]
+    response = client.post("/progress_logs/bulk", json=readings, headers=headers)
+    assert response.status_code == 200, response.get_json()
+    assert response.get_json()["created"] == 2 and response.get_json()["updated"] == 1
+
+    with app.app_context():
+        logs = {l.log_date.day: l for l in ProgressLog.query.filter_by(user_id=user_id)}
+        assert sorted(logs) == [1, 2, 3]
+        assert (logs[1].weight, logs[1].body_fat, logs[1].waist) == (81.6, 18.2, 90.0)
+        assert logs[2].weight == 81.3
+    print("✅ Bulk upload updates existing days and inserts new ones")
+
+
+def test_bulk_rejects_bad_readings():
+    user_id, headers = setup_user()
+    client = app.test_client()
+
+    readings = [{"log_date": "2024-03-05", "weight": 80}, {"log_date": "03/06/2024"}, {"log_date": "2024-03-07", "weight": "heavy"}]
+    response = client.post("/progress_logs/bulk", json={"logs": readings}, headers=headers)
+    assert response.status_code == 400
+    assert [d["index"] for d in response.get_json()["details"]] == [1, 2]
+    assert client.post("/progress_logs/bulk", json=[], headers=headers).status_code == 400
+
+    with app.app_context():
+        assert ProgressLog.query.filter_by(user_id=user_id).count() == 1
+    print("✅ One bad reading rejects the whole batch")
+
+
+if __name__ == "__main__":
+    test_bulk_upsert()
+    test_bulk_rejects_bad_readings()
@@ -0,0 +1,177 @@
+import json
+import os
+import tempfile
+from datetime import date
+from sqlalchemy import text
+from app import create_app, db
+from models import User, Exercise, Workout, WorkoutExercise, ProgressLog, WorkoutDailyStat
+from extensions import exercise_catalog
+from server.utils.data_transfer import RecordError, import_records
+from server.utils.jwt_handler import create_token
+from server.utils.workout_stats import rebuild_workout_stats
+
+# Imports are expensive under the rate limiter; throttling has its own tests
+app = create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": "sqlite://", "RATE_LIMIT_ENABLED": False})
+
+
+def setup_users():
+    """A source account with a little history and an empty target account"""
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        exercise_catalog.invalidate()
+        users = []
+        for name in ("source", "target"):
+            user = User(username=name, email=f"{name}@example.com")
+            user.set_password("password123")
+            db.session.add(user)
+            users.append(user)
+        squat = Exercise(name="Squats", category="Strength")
+        db.session.add(squat)
+        db.session.commit()
+
+        source = users[0]
+        for day in (1, 2):
+            workout = Workout(user_id=source.id, name=f"Legs {day}", date=date(2024, 5, day), duration=40, workout_type="Strength")
+            db.session.add(workout)
+            db.session.flush()
+            db.session.add(WorkoutExercise(user_id=source.id, workout_id=workout.id, exercise_id=squat.id, sets=5, reps=5, order=1))
+        db.session.add(ProgressLog(user_id=source.id, log_date=date(2024, 5, 2), weight=81.2, notes="felt strong, slept well"))
+        rebuild_workout_stats(source.id)
+        db.session.commit()
+        return [(u.id, {"Authorization": f"Bearer {create_token(u.id)}"}) for u in users]
+
+
+def account_snapshot(user_id):
+    workouts = Workout.query.filter_by(user_id=user_id).order_by(Workout.date).all()
+    return {
+        "workouts": [(w.name, w.date, w.duration, [(e.exercise.name, e.sets) for e in w.workout_exercises]) for w in workouts],
+        "logs": [(l.log_date, l.weight, l.notes) for l in ProgressLog.query.filter_by(user_id=user_id)],
+        "stats": sorted((s.day, s.workout_count, s.total_duration) for s in WorkoutDailyStat.query.filter_by(user_id=user_id)),
+    }
+
+
+def test_ndjson_round_trip():
+    (source_id, source), (target_id, target) = setup_users()
+    client = app.test_client()
+
+    response = client.get("/export", headers=source)
+    assert response.status_code == 200 and response.is_streamed
+    lines = response.get_data().splitlines()
+    assert [json.loads(line)["type"] for line in lines] == ["workout", "workout", "workout_exercise", "workout_exercise", "progress_log"]
+
+    response = client.post("/import", data=response.get_data(), headers=dict(target, **{"Content-Type": "application/x-ndjson"}))
+    assert response.status_code == 201, response.get_json()
+    assert response.get_json()["imported"] == {"workout": 2, "workout_exercise": 2, "progress_log": 1}
+    with app.app_context():
+        assert account_snapshot(target_id) == account_snapshot(source_id)
+    print("✅ NDJSON export imports into another account, rollup included")
+
+
+def test_csv_round_trip():
+    (source_id, source), (target_id, target) = setup_users()
+    client = app.test_client()
+
+    body = client.get("/export?format=csv", headers=source).get_data()
+    assert body.startswith(b"type,")
+    response = client.post("/import", data=body, headers=dict(target, **{"Content-Type": "text/csv"}))
+    assert response.status_code == 201, response.get_json()
+    with app.app_context():
+        assert account_snapshot(target_id) == account_snapshot(source_id)
+    print("✅ CSV export imports into another account")
+
+
+def test_bad_record_rolls_back_import():
+    (source_id, source), (target_id, target) = setup_users()
+    client = app.test_client()
+
+    body = b'{"type": "workout", "id": 1, "name": "Ok"}\n{"type": "workout_exercise", "workout_id": 1, "exercise": "Nope"}\n'
+    response = client.post("/import", data=body, headers=target)
+    assert response.status_code == 400
+    assert "line 2" in response.get_json()["error"]
+    with app.app_context():
+        assert Workout.query.filter_by(user_id=target_id).count() == 0
+    print("✅ A bad record fails the whole import")
+
+
+def test_mistyped_values_are_rejected():
+    (source_id, source), (target_id, target) = setup_users()
+
+    with app.app_context():
+        for record in (
+            {"type": "workout", "name": "Run", "duration": {}},
+            {"type": "workout", "name": ["Run"]},
+            {"type": "progress_log", "log_date": "2024-01-01", "weight": True},
+            {"type": "workout_exercise", "workout_id": [1], "exercise": "Squats"},
+        ):
+            try:
+                import_records(target_id, [(1, {"type": "workout", "id": 1, "name": "Ok"}), (2, record)])
+            except RecordError as e:
+                assert e.line == 2
+            else:
+                raise AssertionError(f"accepted {record}")
+            finally:
+                db.session.rollback()
+
+    body = b'{"type": "workout", "id": 1, "name": "Ok"}\n{"type": "workout", "name": "Run", "date": 20240101}\n'
+    response = app.test_client().post("/import", data=body, headers=target)
+    assert response.status_code == 400
+    assert "line 2: invalid date" in response.get_json()["error"]
+    with app.app_context():
+        assert Workout.query.filter_by(user_id=target_id).count() == 0
+    print("✅ Values of the wrong type are rejected with their line")
+
+
+def test_unreadable_csv_and_database_errors_are_400s():
+    (source_id, source), (target_id, target) = setup_users()
+    client = app.test_client()
+    csv_headers = dict(target, **{"Content-Type": "text/csv"})
+
+    response = client.post("/import", data=b"type,name\nworkout,Run\nworkout,\xff\xfe\n", headers=csv_headers)
+    assert response.status_code == 400
+    assert "unreadable CSV" in response.get_json()["error"]
+    # Past csv.field_size_limit - the csv module's own error
+    response = client.post("/import", data=b"type,name\nworkout," + b"x" * 200000 + b"\n", headers=csv_headers)
+    assert response.status_code == 400 and "line 2" in response.get_json()["error"]
+
+    body = b'{"type": "workout", "name": "Run", "duration": 99999999999999999999}\n'
+    response = client.post("/import", data=body, headers=target)
+    assert response.status_code == 400 and "invalid duration" in response.get_json()["error"]
+
+    with app.app_context():
+        # A rule only the database knows about
+        db.session.execute(text(
+            "CREATE TRIGGER no_negative_weight BEFORE INSERT ON progress_logs WHEN NEW.weight < 0 "
+            "BEGIN SELECT RAISE(ABORT, 'weight must not be negative'); END"
+        ))
+        db.session.commit()
+    body = b'{"type": "workout", "name": "Run"}\n{"type": "progress_log", "log_date": "2024-01-01", "weight": -1}\n'
+    response = client.post("/import", data=body, headers=target)
+    assert response.status_code == 400
+    assert "database rejected" in response.get_json()["error"]
+    with app.app_context():
+        assert Workout.query.filter_by(user_id=target_id).count() == 0
+    print("✅ Unreadable CSV and database errors fail the import with a 400")
+
+
+def test_import_cli():
+    (source_id, source), (target_id, target) = setup_users()
+    body = app.test_client().get("/export", headers=source).get_data()
+    path = os.path.join(tempfile.mkdtemp(), "export.ndjson")
+    with open(path, "wb") as f:
+        f.write(body)
+
+    result = app.test_cli_runner().invoke(args=["fitflow", "import", path, "--user-id", str(target_id)])
+    assert result.exit_code == 0, result.output
+    with app.app_context():
+        assert account_snapshot(target_id) == account_snapshot(source_id)
+    print("✅ flask fitflow import loads an export file")
+
+
+if __name__ == "__main__":
+    test_ndjson_round_trip()
+    test_csv_round_trip()
+    test_bad_record_rolls_back_import()
+    test_mistyped_values_are_rejected()
+    test_unreadable_csv_and_database_errors_are_400s()
+    test_import_cli()
@@ -0,0 +1,102 @@
+import os
+import tempfile
+from sqlalchemy import create_engine, text
+from app import create_app, db
+from config import Config
+from server.utils.database import InstrumentedQueuePool, engine_options, pool_stats
+
+app = create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": "sqlite://"})
+
+
+def config_for(uri, **overrides):
+    config = {key: getattr(Config, key) for key in dir(Config) if key.isupper()}
+    config.update(SQLALCHEMY_DATABASE_URI=uri, **overrides)
+    return config
+
+
+def test_postgres_engine_options():
+    options = engine_options(config_for("postgresql://db/fitflow", DB_POOL_SIZE=4, DB_STATEMENT_TIMEOUT_MS=5000))
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert options["pool_size"] == 4
+    assert options["pool_pre_ping"] is True
+    assert options["pool_recycle"] == Config.DB_POOL_RECYCLE
+    assert options["connect_args"] == {"options": "-c statement_timeout=5000"}
+
+    assert "connect_args" not in engine_options(config_for("postgresql://db/fitflow", DB_STATEMENT_TIMEOUT_MS=0))
+    print("✅ Pool settings come from the DB_* config")
+
+
+def test_pool_stats_track_checkouts():
+    path = os.path.join(tempfile.mkdtemp(), "pool.db")
+    engine = create_engine(f"sqlite:///{path}", poolclass=InstrumentedQueuePool, pool_size=2, max_overflow=0)
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        stats = pool_stats(engine)
+        assert stats["checkedout"] == 1
+    stats = pool_stats(engine)
+    assert stats["checkedout"] == 0
+    assert stats["checkouts"] == 1
+    assert stats["wait_ms_max"] >= 0
+
+    response = app.test_client().get("/api/health")
+    assert response.status_code == 200
+    assert "db_pool" in response.get_json()
+    print("✅ Pool metrics are reported by /api/health")
+
+
+def test_sqlite_profile_applies_pragmas():
+    path = os.path.join(tempfile.mkdtemp(), "tuned.db")
+    tuned_app = create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}"})
+    with tuned_app.app_context():
+        pragma = lambda name: db.session.execute(text(f"PRAGMA {name}")).scalar()
+        assert pragma("journal_mode") == "wal"
+        assert pragma("synchronous") == 1  # NORMAL
+        assert pragma("busy_timeout") == Config.SQLITE_BUSY_TIMEOUT_MS
+        assert pragma("mmap_size") == Config.SQLITE_MMAP_SIZE
+
+    plain_path = os.path.join(tempfile.mkdtemp(), "plain.db")
+    plain_app = create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": f"sqlite:///{plain_path}", "SQLITE_TUNING": False})
+    with plain_app.app_context():
+        assert db.session.execute(text("PRAGMA journal_mode")).scalar() == "delete"
+    print("✅ SQLite profile switches on WAL and friends")
+
+
+def test_init_db_adopts_unversioned_database():
+    path = os.path.join(tempfile.mkdtemp(), "legacy.db")
+    legacy_app = create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}"})
+    with legacy_app.app_context():
+        # What the old boot-time create_all() left behind: no newer tables or indexes, no stamp
+        db.create_all()
+        db.session.execute(text("DROP TABLE workout_daily_stats"))
+        db.session.execute(text("DROP TABLE catalog_versions"))
+        db.session.execute(text("DROP TABLE revoked_tokens"))
+        db.session.execute(text("DROP INDEX ix_workouts_user_id_date"))
+        db.session.execute(text("INSERT INTO users (id, username, email, password_hash) VALUES (1, 'old', 'old@example.com', 'x')"))
+        db.session.execute(text(
+            "INSERT INTO workouts (user_id, name, date, duration, calories_burned, workout_type) "
+            "VALUES (1, 'Run', '2024-01-01', 30, 300, 'Cardio'), (1, 'Run', '2024-01-01', 20, 200, 'Cardio')"
+        ))
+        db.session.commit()
+
+    result = legacy_app.test_cli_runner().invoke(args=["fitflow", "init-db"])
+    assert result.exit_code == 0, result.output
+    assert "stamped" in result.output
+
+    with legacy_app.app_context():
+        scalar = lambda sql: db.session.execute(text(sql)).scalar()
+        assert scalar("SELECT version_num FROM alembic_version") == "d41c9a6e2f57"
+        assert scalar("SELECT version FROM catalog_versions WHERE name = 'exercises'") == 1
+        assert scalar("SELECT count(*) FROM sqlite_master WHERE name = 'ix_workouts_user_id_date'") == 1
+        assert db.session.execute(text("SELECT workout_count, total_duration FROM workout_daily_stats")).all() == [(2, 50)]
+
+    # Once stamped, init-db hands over to the migrations
+    result = legacy_app.test_cli_runner().invoke(args=["fitflow", "init-db"])
+    assert result.exit_code == 0 and "upgraded" in result.output, result.output
+    print("✅ init-db brings a create_all-era database to the latest migration")
+
+
+if __name__ == "__main__":
+    test_postgres_engine_options()
+    test_pool_stats_track_checkouts()
+    test_sqlite_profile_applies_pragmas()
+    test_init_db_adopts_unversioned_database()
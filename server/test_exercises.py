@@ -0,0 +1,126 @@
+from sqlalchemy import event
+from app import create_app, db
+from extensions import exercise_catalog
+from models import User, Exercise
+from server.utils.jwt_handler import create_token
+
+# Check the catalogue version on every access so out-of-band changes show up at once
+app = create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": "sqlite://", "EXERCISE_CATALOG_CHECK_INTERVAL": 0})
+
+
+def setup_user():
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        user = User(username="coach", email="coach@example.com")
+        user.set_password("password123")
+        db.session.add(user)
+        db.session.add(Exercise(name="Squats", category="Strength"))
+        db.session.commit()
+        exercise_catalog.invalidate()
+        return {"Authorization": f"Bearer {create_token(user.id)}"}
+
+
+def test_exercise_library_etag():
+    headers = setup_user()
+    client = app.test_client()
+
+    response = client.get("/exercises", headers=headers)
+    etag = response.headers["ETag"]
+    assert response.status_code == 200
+    assert "no-cache" in response.headers["Cache-Control"]
+
+    response = client.get("/exercises", headers=dict(headers, **{"If-None-Match": etag}))
+    assert response.status_code == 304
+    assert response.data == b""
+
+    # Any change to the library invalidates the ETag
+    client.post("/exercises", json={"name": "Lunges", "category": "Strength"}, headers=headers)
+    response = client.get("/exercises", headers=dict(headers, **{"If-None-Match": etag}))
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert len(response.get_json()) == 2
+    print("✅ Exercise library revalidates with ETag / If-None-Match")
+
+
+def test_bulk_changes_bump_the_version():
+    headers = setup_user()
+    client = app.test_client()
+    etag = client.get("/exercises/1", headers=headers).headers["ETag"]
+
+    with app.app_context():
+        db.session.query(Exercise).filter_by(id=1).update({"muscle_group": "Legs"})
+        db.session.commit()
+    response = client.get("/exercises/1", headers=dict(headers, **{"If-None-Match": etag}))
+    assert response.status_code == 200
+    assert response.get_json()["muscle_group"] == "Legs"
+    print("✅ Bulk updates also change the ETag")
+
+
+def test_catalogue_lookups_skip_the_database():
+    headers = setup_user()
+    client = app.test_client()
+    state = app.extensions["exercise_catalog"]
+    state.check_interval = 60
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    try:
+        client.get("/exercises", headers=headers)  # loads the catalogue
+        with app.app_context():
+            engine = db.engine
+        event.listen(engine, "before_cursor_execute", record)
+        assert client.get("/exercises", headers=headers).status_code == 200
+        with app.app_context():
+            assert exercise_catalog.id_for_name("squats") == 1
+            assert exercise_catalog.missing({1, 42}) == {42}
+        assert statements == []
+
+        # A write through the API is visible straight away
+        client.put("/exercises/1", json={"name": "Back Squats"}, headers=headers)
+        assert client.get("/exercises/1", headers=headers).get_json()["name"] == "Back Squats"
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+        state.check_interval = 0
+    print("✅ Exercise lookups are served from the in-process catalogue")
+
+
+def test_reload_leaves_snapshots_intact():
+    headers = setup_user()
+    client = app.test_client()
+    with app.app_context():
+        before = exercise_catalog.snapshot()
+    client.post("/exercises", json={"name": "Lunges", "category": "Strength"}, headers=headers)
+
+    with app.app_context():
+        after = exercise_catalog.snapshot()
+    # A response still holding the old snapshot sees one consistent version
+    assert after.version != before.version
+    assert [e["name"] for e in before.items] == ["Squats"] and list(before.by_id) == [1]
+    assert [e["name"] for e in after.items] == ["Squats", "Lunges"]
+    print("✅ A catalogue reload builds a new snapshot")
+
+
+def test_unhashable_exercise_ids_are_rejected():
+    headers = setup_user()
+    client = app.test_client()
+    workout_id = client.post("/workouts", json={"name": "Legs"}, headers=headers).get_json()["workout"]["id"]
+
+    response = client.post("/workout_exercises", json={"workout_id": workout_id, "exercise_id": [1]}, headers=headers)
+    assert response.status_code == 400
+    response = client.post("/workout_exercises", json=[{"workout_id": workout_id, "exercise_id": 1}], headers=headers)
+    assert response.status_code == 400
+    entry_id = client.post("/workout_exercises", json={"workout_id": workout_id, "exercise_id": 1}, headers=headers).get_json()["entry"]["id"]
+    response = client.put(f"/workout_exercises/{entry_id}", json={"exercise_id": {"id": 1}}, headers=headers)
+    assert response.status_code == 400
+    print("✅ Non-integer exercise ids get a 400")
+
+
+if __name__ == "__main__":
+    test_exercise_library_etag()
+    test_bulk_changes_bump_the_version()
+    test_catalogue_lookups_skip_the_database()
+    test_reload_leaves_snapshots_intact()
+    test_unhashable_exercise_ids_are_rejected()
@@ -0,0 +1,97 @@
+import re
+import threading
+from app import create_app, db
+from models import User
+from extensions import metrics
+from server.utils.jwt_handler import create_token
+
+app = create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": "sqlite://"})
+
+
+def setup_user():
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        user = User(username="metered", email="metered@example.com")
+        user.set_password("password123")
+        db.session.add(user)
+        db.session.commit()
+        return {"Authorization": f"Bearer {create_token(user.id)}"}
+
+
+def sample(text, name, **labels):
+    """Value of one sample in Prometheus text output"""
+    label_text = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    match = re.search(rf"^{name}\{{{re.escape(label_text)}\}} (\S+)$", text, re.M)
+    assert match, f"{name}{{{label_text}}} missing"
+    return float(match.group(1))
+
+
+def test_metrics_endpoint():
+    headers = setup_user()
+    client = app.test_client()
+    for _ in range(3):
+        assert client.get("/workouts", headers=headers).status_code == 200
+    assert client.get("/workouts").status_code == 401
+    assert client.get("/workouts/9999", headers=headers).status_code == 404
+    client.get("/no-such-page")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.content_type.startswith("text/plain; version=0.0.4")
+    text = response.get_data(as_text=True)
+
+    ok = dict(endpoint="workoutresource", method="GET", status="2xx")
+    assert sample(text, "fitflow_http_requests_total", **ok) == 3
+    assert sample(text, "fitflow_http_requests_total", endpoint="workoutresource", method="GET", status="4xx") == 2
+    assert 'fitflow_http_requests_total{endpoint="unmatched",method="GET"' in text
+    assert sample(text, "fitflow_http_request_duration_seconds_bucket", **ok, le="+Inf") == 3
+    assert sample(text, "fitflow_http_request_duration_seconds_count", **ok) == 3
+    assert sample(text, "fitflow_http_request_db_seconds_sum", **ok) > 0
+    assert sample(text, "fitflow_db_queries_total", **ok) >= 3
+    print("✅ /metrics reports per-endpoint counts, latency and DB time")
+
+
+def test_threads_aggregate_separately():
+    with app.app_context():
+        state = app.extensions["metrics"]
+        key = ("threaded", "GET", "2xx")
+
+        def work():
+            for _ in range(1000):
+                metrics.record(state, key, 0.002, 0.001, 1)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        series = metrics.collect()[key]
+        assert series[0] == 4000 and series[3] == 4000
+        assert sum(series[4]) == 4000
+    print("✅ Per-thread series add up on scrape")
+
+
+def test_exited_threads_are_retired():
+    with app.app_context():
+        state = app.extensions["metrics"]
+        key = ("one-shot", "GET", "2xx")
+        before = len(state.stores)
+
+        # One thread per request, as app.run() does
+        for _ in range(200):
+            thread = threading.Thread(target=metrics.record, args=(state, key, 0.002, 0.001, 1))
+            thread.start()
+            thread.join()
+
+        assert metrics.collect()[key][0] == 200
+        assert len(state.stores) <= before + 1
+        assert metrics.collect()[key][0] == 200
+    print("✅ Exited threads fold into one retired total")
+
+
+if __name__ == "__main__":
+    test_metrics_endpoint()
+    test_threads_aggregate_separately()
+    test_exited_threads_are_retired()
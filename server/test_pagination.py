@@ -0,0 +1,111 @@
+from app import create_app, db
+from models import User, Workout, ProgressLog
+from server.utils.jwt_handler import create_token
+from datetime import date, timedelta
+import json
+from server.utils.streaming import stream_rows
+
+app = create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": "sqlite://"})
+
+
+def setup_user():
+    """Create a user with 7 workouts and 7 progress logs, some sharing a date"""
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        user = User(username="pager", email="pager@example.com")
+        user.set_password("password123")
+        db.session.add(user)
+        db.session.commit()
+
+        start = date(2024, 1, 1)
+        for i in range(7):
+            day = start + timedelta(days=i // 2)  # two rows per day
+            db.session.add(Workout(user_id=user.id, name=f"Workout {i}", date=day))
+            db.session.add(ProgressLog(user_id=user.id, log_date=day, weight=80 - i))
+        db.session.commit()
+        return {"Authorization": f"Bearer {create_token(user.id)}"}
+
+
+def collect_pages(client, url, headers):
+    items, cursor = [], None
+    while True:
+        query = f"{url}?limit=3" + (f"&after={cursor}" if cursor else "")
+        response = client.get(query, headers=headers)
+        assert response.status_code == 200
+        body = response.get_json()
+        assert len(body["items"]) <= 3
+        items.extend(body["items"])
+        cursor = body["next_cursor"]
+        if not cursor:
+            return items
+
+
+def test_workouts_keyset_pagination():
+    headers = setup_user()
+    client = app.test_client()
+
+    items = collect_pages(client, "/workouts", headers)
+    keys = [(w["date"], w["id"]) for w in items]
+    assert len(items) == 7
+    assert keys == sorted(keys)
+
+    # Without paging params the old plain list is still returned
+    assert len(client.get("/workouts", headers=headers).get_json()) == 7
+    print("✅ Workout pages walk the whole history in (date, id) order")
+
+
+def test_progress_logs_keyset_pagination():
+    headers = setup_user()
+    client = app.test_client()
+
+    items = collect_pages(client, "/progress_logs", headers)
+    keys = [(l["log_date"], l["id"]) for l in items]
+    assert len(items) == 7
+    assert keys == sorted(keys)
+    print("✅ Progress log pages walk the whole history in (log_date, id) order")
+
+
+def test_invalid_page_args():
+    headers = setup_user()
+    client = app.test_client()
+
+    assert client.get("/workouts?after=not-a-cursor", headers=headers).status_code == 400
+    assert client.get("/progress_logs?limit=abc", headers=headers).status_code == 400
+    print("✅ Bad cursors and limits are rejected")
+
+
+def test_streamed_lists():
+    headers = setup_user()
+    client = app.test_client()
+
+    response = client.get("/progress_logs?stream=1", headers=headers)
+    assert response.is_streamed and response.content_type == "application/json"
+    logs = response.get_json()
+    keys = [(l["log_date"], l["id"]) for l in logs]
+    assert len(logs) == 7 and keys == sorted(keys)
+
+    response = client.get("/workouts", headers=dict(headers, Accept="application/x-ndjson"))
+    assert response.content_type == "application/x-ndjson"
+    lines = response.get_data(as_text=True).splitlines()
+    assert [json.loads(line)["name"] for line in lines] == [f"Workout {i}" for i in range(7)]
+    print("✅ ?stream=1 and Accept: application/x-ndjson stream the whole list")
+
+
+def test_stream_batches():
+    setup_user()
+    with app.test_request_context():
+        query = db.session.query(ProgressLog.id).order_by(ProgressLog.id)
+        chunks = list(stream_rows(query, lambda row: row.id, batch_size=3).response)
+        assert chunks == [b"[", b"1,2,3", b",4,5,6", b",7", b"]\n"]
+        chunks = list(stream_rows(query, lambda row: row.id, "ndjson", batch_size=3).response)
+        assert chunks == [b"1\n2\n3\n", b"4\n5\n6\n", b"7\n"]
+    print("✅ Streams are written one batch at a time")
+
+
+if __name__ == "__main__":
+    test_workouts_keyset_pagination()
+    test_progress_logs_keyset_pagination()
+    test_invalid_page_args()
+    test_streamed_lists()
+    test_stream_batches()
@@ -0,0 +1,92 @@
+from werkzeug.security import generate_password_hash
+from app import create_app, db
+from models import User
+from extensions import password_hasher
+from server.utils.password_hasher import calibrate_pbkdf2, MIN_PBKDF2_ITERATIONS
+
+# Cheap hashes keep the test fast; QUEUE_SIZE=0 makes the single slot easy to saturate
+app = create_app({
+    "TESTING": True,
+    "SQLALCHEMY_DATABASE_URI": "sqlite://",
+    "PASSWORD_HASH_METHOD": "pbkdf2:sha256:2000",
+    "PASSWORD_HASH_WORKERS": 1,
+    "PASSWORD_HASH_QUEUE_SIZE": 0,
+    "PASSWORD_HASH_QUEUE_TIMEOUT": 0.05,
+})
+
+
+def setup_user(password_hash):
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        db.session.add(User(username="hasher", email="hasher@example.com", password_hash=password_hash))
+        db.session.commit()
+
+
+def stored_hash():
+    with app.app_context():
+        return User.query.filter_by(username="hasher").one().password_hash
+
+
+def test_outdated_hash_is_upgraded_on_login():
+    setup_user(generate_password_hash("password123", "pbkdf2:sha256:1000"))
+    client = app.test_client()
+
+    assert client.post("/login", json={"username": "hasher", "password": "wrong"}).status_code == 401
+    assert stored_hash().startswith("pbkdf2:sha256:1000$")
+
+    assert client.post("/login", json={"username": "hasher", "password": "password123"}).status_code == 200
+    upgraded = stored_hash()
+    assert upgraded.startswith("pbkdf2:sha256:2000$")
+
+    # Already current - left alone, and still valid
+    assert client.post("/users/login", json={"username": "hasher", "password": "password123"}).status_code == 200
+    assert stored_hash() == upgraded
+    print("✅ Logins rehash passwords stored with old parameters")
+
+
+def test_stronger_hash_is_kept():
+    # Another worker calibrated a higher count - not worth a write per login
+    stronger = generate_password_hash("password123", "pbkdf2:sha256:3000")
+    setup_user(stronger)
+    assert app.test_client().post("/login", json={"username": "hasher", "password": "password123"}).status_code == 200
+    assert stored_hash() == stronger
+
+    with app.app_context():
+        assert app.extensions["password_hasher"].prefix == "pbkdf2:sha256:2000"
+        assert password_hasher.needs_rehash("pbkdf2:sha256:1999$salt$hash")
+        assert password_hasher.needs_rehash("pbkdf2:sha1:9000$salt$hash")
+        assert password_hasher.needs_rehash("scrypt:32768:8:1$salt$hash")
+        assert not password_hasher.needs_rehash("pbkdf2:sha256:600000$salt$hash")
+    print("✅ Hashes with more iterations than configured are left alone")
+
+
+def test_saturated_pool_returns_503():
+    setup_user(generate_password_hash("password123", "pbkdf2:sha256:2000"))
+    client = app.test_client()
+
+    slots = app.extensions["password_hasher"].slots
+    slots.acquire()  # a login that never finishes
+    try:
+        response = client.post("/login", json={"username": "hasher", "password": "password123"})
+    finally:
+        slots.release()
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert client.post("/login", json={"username": "hasher", "password": "password123"}).status_code == 200
+    print("✅ Logins get a 503 instead of queueing forever")
+
+
+def test_calibration():
+    method = calibrate_pbkdf2(1)
+    name, hash_name, iterations = method.split(":")
+    assert (name, hash_name) == ("pbkdf2", "sha256")
+    assert int(iterations) >= MIN_PBKDF2_ITERATIONS
+    print(f"✅ Calibrated method: {method}")
+
+
+if __name__ == "__main__":
+    test_outdated_hash_is_upgraded_on_login()
+    test_stronger_hash_is_kept()
+    test_saturated_pool_returns_503()
+    test_calibration()
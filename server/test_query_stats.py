@@ -0,0 +1,130 @@
+import logging
+from datetime import date
+from flask import Response
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from app import create_app, db
+from models import User, Exercise, Workout, WorkoutExercise
+from server.utils.jwt_handler import create_token
+from server.utils.query_stats import query_budget
+
+app = create_app({
+    "TESTING": True,
+    "SQLALCHEMY_DATABASE_URI": "sqlite://",
+    "SERVER_TIMING": True,
+    "SLOW_QUERY_MS": 0.0001,  # every statement counts as slow
+    "N_PLUS_ONE_THRESHOLD": 3,
+})
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def capture_logs():
+    handler = ListHandler()
+    logging.getLogger("server.utils.query_stats").addHandler(handler)
+    return handler
+
+
+def setup_data(workouts=5):
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        user = User(username="counted", email="counted@example.com")
+        user.set_password("password123")
+        db.session.add(user)
+        squat = Exercise(name="Squats", category="Strength")
+        db.session.add(squat)
+        db.session.commit()
+        for i in range(workouts):
+            workout = Workout(user_id=user.id, name=f"W{i}", date=date(2024, 1, i + 1))
+            workout.workout_exercises.append(WorkoutExercise(user_id=user.id, exercise_id=squat.id, order=1))
+            db.session.add(workout)
+        db.session.commit()
+        return {"Authorization": f"Bearer {create_token(user.id)}"}
+
+
+def test_server_timing_header():
+    headers = setup_data()
+    response = app.test_client().get("/workouts", headers=headers)
+    timing = response.headers["Server-Timing"]
+    assert timing.startswith("db;dur=") and 'desc="' in timing and "app;dur=" in timing
+    print(f"✅ Server-Timing: {timing}")
+
+
+def test_slow_queries_are_logged_with_call_site():
+    setup_data()
+    handler = capture_logs()
+    try:
+        response = app.test_client().post("/register", json={"username": "newbie", "email": "n@example.com", "password": "pw123456"})
+    finally:
+        logging.getLogger("server.utils.query_stats").removeHandler(handler)
+    assert response.status_code == 201
+    slow = [r for r in handler.records if r.getMessage().startswith("Slow query")]
+    insert = next(r for r in slow if "INSERT INTO users" in r.getMessage())
+    assert insert.call_site.startswith("server/routes/auth.py:")
+    assert "'password_hash': '[REDACTED]'" in insert.parameters
+    print("✅ Slow queries are logged with masked parameters and call site")
+
+
+def test_n_plus_one_is_reported():
+    setup_data()
+    handler = capture_logs()
+    try:
+        with app.test_request_context("/workouts"):
+            app.preprocess_request()
+            for workout in Workout.query.all():
+                len(workout.workout_exercises)  # lazy load per workout
+            app.process_response(Response())
+    finally:
+        logging.getLogger("server.utils.query_stats").removeHandler(handler)
+    warnings = [r for r in handler.records if r.getMessage().startswith("Possible N+1")]
+    assert len(warnings) == 1
+    assert "test_query_stats.py" in warnings[0].getMessage()
+    print("✅ Repeated per-row queries are flagged as N+1")
+
+
+def test_failed_statements_leave_nothing_on_the_connection():
+    setup_data()
+    with app.app_context():
+        with db.engine.connect() as conn:
+            for _ in range(5):
+                try:
+                    conn.execute(text("SELECT * FROM no_such_table"))
+                except OperationalError:
+                    conn.rollback()
+            assert conn.execute(text("SELECT 1")).scalar() == 1
+            assert not any(isinstance(value, list) for value in conn.info.values())
+    print("✅ Failed statements don't leak timing state")
+
+
+def test_query_budget_helper():
+    headers = setup_data()
+    client = app.test_client()
+    client.get("/workouts", headers=headers)  # warm the user cache
+
+    with query_budget(2) as budget:
+        client.get("/workouts?expand=exercises", headers=headers)
+    assert budget.count == 2
+
+    try:
+        with query_budget(1):
+            client.get("/workouts?expand=exercises", headers=headers)
+        assert False, "budget was not enforced"
+    except AssertionError as e:
+        assert "2 queries, budget was 1" in str(e)
+    print("✅ query_budget fails handlers that go over their query budget")
+
+
+if __name__ == "__main__":
+    test_server_timing_header()
+    test_slow_queries_are_logged_with_call_site()
+    test_n_plus_one_is_reported()
+    test_failed_statements_leave_nothing_on_the_connection()
+    test_query_budget_helper()
@@ -0,0 +1,153 @@
+import os
+import tempfile
+import pytest
+from app import create_app, db
+from models import User
+from server.utils.jwt_handler import create_token
+from server.utils.rate_limit import MemoryRateLimitBackend, RedisRateLimitBackend
+
+LIMITS = {
+    "TESTING": True,
+    "SQLALCHEMY_DATABASE_URI": "sqlite://",
+    "RATE_LIMIT_IP_CAPACITY": 10,
+    "RATE_LIMIT_IP_REFILL": 0.1,
+    "RATE_LIMIT_USER_CAPACITY": 5,
+    "RATE_LIMIT_USER_REFILL": 0.1,
+}
+app = create_app(LIMITS)
+
+
+def setup_user(target=app):
+    with target.app_context():
+        db.drop_all()
+        db.create_all()
+        user = User(username="limited", email="limited@example.com")
+        user.set_password("password123")
+        db.session.add(user)
+        db.session.commit()
+        return {"Authorization": f"Bearer {create_token(user.id)}"}
+
+
+def test_login_burst_gets_429_before_db_work():
+    headers = setup_user()
+    app.extensions["rate_limiter"].backend = MemoryRateLimitBackend()
+    client = app.test_client()
+    credentials = {"username": "limited", "password": "password123"}
+
+    # Logins cost 5 of the IP's 10 tokens
+    assert client.post("/login", json=credentials).status_code == 200
+    assert client.post("/login", json=credentials).status_code == 200
+    with app.app_context():
+        db.drop_all()  # any query now would fail with a 500
+    response = client.post("/login", json=credentials)
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) == 50  # 5 tokens at 0.1/s
+
+    # Authenticated requests draw from the user's own bucket
+    setup_user()
+    assert client.get("/workouts", headers=headers).status_code == 200
+    assert client.get("/api/health").status_code == 200
+    print("✅ Exhausted buckets return 429 with Retry-After")
+
+
+def test_forwarded_clients_get_their_own_buckets():
+    proxied = create_app(dict(LIMITS, RATE_LIMIT_TRUSTED_PROXIES=1))
+    setup_user(proxied)
+    client = proxied.test_client()
+    credentials = {"username": "limited", "password": "password123"}
+
+    def login(forwarded_for):
+        # Every request arrives from the proxy's address
+        return client.post("/login", json=credentials, headers={"X-Forwarded-For": forwarded_for},
+                           environ_base={"REMOTE_ADDR": "10.0.0.1"}).status_code
+
+    assert [login("203.0.113.5") for _ in range(3)] == [200, 200, 429]
+    assert login("198.51.100.7") == 200
+    # Only the hop the proxy appended counts - a spoofed prefix doesn't buy a new bucket
+    assert login("1.2.3.4, 203.0.113.5") == 429
+
+    # Without trusted proxies the header is ignored: everyone shares the proxy's bucket
+    direct_app = create_app(LIMITS)
+    setup_user(direct_app)
+    direct = direct_app.test_client()
+    codes = [direct.post("/login", json=credentials, headers={"X-Forwarded-For": f"192.0.2.{n}"},
+                         environ_base={"REMOTE_ADDR": "10.0.0.1"}).status_code for n in range(3)]
+    assert codes == [200, 200, 429]
+    print("✅ Clients behind a trusted proxy are limited by X-Forwarded-For")
+
+
+def test_user_bucket_refills():
+    backend = MemoryRateLimitBackend()
+    assert [backend.take("user:1", 1, 3, 1.0, 100.0) for _ in range(4)] == [0, 0, 0, 1.0]
+    assert backend.take("user:1", 1, 3, 1.0, 101.0) == 0  # one token back after a second
+    assert backend.take("user:1", 2, 3, 1.0, 101.0) == 2.0
+    assert backend.take("user:2", 1, 3, 1.0, 101.0) == 0
+    print("✅ Buckets refill continuously and are per identity")
+
+
+def test_sqlite_backend_is_shared_between_workers():
+    directory = tempfile.mkdtemp()
+    config = dict(
+        LIMITS,
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{os.path.join(directory, 'app.db')}",
+        RATE_LIMIT_BACKEND="sqlite",
+        RATE_LIMIT_SQLITE_PATH=os.path.join(directory, "rate_limits.db"),
+    )
+    workers = [create_app(config), create_app(config)]
+    setup_user(workers[0])
+    credentials = {"username": "limited", "password": "password123"}
+
+    assert workers[0].test_client().post("/login", json=credentials).status_code == 200
+    assert workers[1].test_client().post("/login", json=credentials).status_code == 200
+    assert workers[0].test_client().post("/login", json=credentials).status_code == 429
+    assert workers[1].test_client().post("/login", json=credentials).status_code == 429
+    print("✅ SQLite buckets are shared across app instances")
+
+
+class LuaRedis:
+    """Just enough of a Redis client to run the limiter's script under Lua 5.1, as Redis does"""
+
+    def __init__(self):
+        self.hashes = {}
+        self.ttls = {}
+        self.lua = pytest.importorskip("lupa.lua51").LuaRuntime()
+
+    def call(self, command, key, *args):
+        fields = self.hashes.setdefault(key, {})
+        if command == "HMGET":
+            # Missing fields come back as false, like a nil bulk reply
+            return self.lua.table(*(fields.get(name, False) for name in args))
+        if command == "HSET":
+            fields.update(zip(args[::2], args[1::2]))
+            return len(args) // 2
+        if command == "EXPIRE":
+            self.ttls[key] = args[0]
+            return 1
+        raise AssertionError(f"unexpected command {command}")
+
+    def register_script(self, script):
+        function = self.lua.eval(f"function(KEYS, ARGV, redis) {script} end")
+        redis = self.lua.table(call=self.call)
+
+        def run(keys, args):
+            return function(self.lua.table(*keys), self.lua.table(*(str(arg) for arg in args)), redis)
+        return run
+
+
+def test_redis_script_matches_memory_backend():
+    redis_backend = RedisRateLimitBackend(None, client=LuaRedis())
+    memory_backend = MemoryRateLimitBackend()
+    calls = [("user:1", 1, 100.0)] * 4 + [("user:1", 1, 101.0), ("user:1", 2, 101.0), ("user:2", 1, 101.5), ("user:1", 1, 110.0)]
+    for key, cost, now in calls:
+        assert redis_backend.take(key, cost, 3, 1.0, now) == memory_backend.take(key, cost, 3, 1.0, now)
+    assert set(redis_backend.client.hashes) == {"fitflow:ratelimit:user:1", "fitflow:ratelimit:user:2"}
+    assert redis_backend.client.ttls["fitflow:ratelimit:user:1"] == 4  # full after 3s, plus one
+    print("✅ The Redis Lua script agrees with the in-memory buckets")
+
+
+if __name__ == "__main__":
+    test_login_burst_gets_429_before_db_work()
+    test_forwarded_clients_get_their_own_buckets()
+    test_user_bucket_refills()
+    test_sqlite_backend_is_shared_between_workers()
+    test_redis_script_matches_memory_backend()
@@ -0,0 +1,89 @@
+import os
+from datetime import date
+import tempfile
+from flask import g
+from sqlalchemy import create_engine
+from app import create_app, db
+from models import User, Workout
+from server.utils.jwt_handler import create_token
+
+directory = tempfile.mkdtemp()
+PRIMARY = f"sqlite:///{os.path.join(directory, 'primary.db')}"
+REPLICA = f"sqlite:///{os.path.join(directory, 'replica.db')}"
+
+app = create_app({
+    "TESTING": True,
+    "SQLALCHEMY_DATABASE_URI": PRIMARY,
+    "READ_REPLICA_URL": REPLICA,
+    "REVOCATION_BACKEND": "database",
+})
+
+
+def setup_databases():
+    """Same user in both databases; a workout that only exists on the replica"""
+    replica = create_engine(REPLICA)
+    db.metadata.drop_all(replica)
+    db.metadata.create_all(replica)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        user = User(username="reader", email="reader@example.com", password_hash="x")
+        db.session.add(user)
+        db.session.commit()
+        token = create_token(user.id)
+    with replica.begin() as conn:
+        conn.execute(User.__table__.insert().values(id=1, username="reader", email="reader@example.com", password_hash="x"))
+        conn.execute(Workout.__table__.insert().values(user_id=1, name="Replica only", date=date(2024, 1, 1)))
+    replica.dispose()
+    return replica, {"Authorization": f"Bearer {token}"}
+
+
+def test_get_handlers_read_from_replica():
+    replica, headers = setup_databases()
+    client = app.test_client()
+
+    workouts = client.get("/workouts", headers=headers).get_json()
+    assert [w["name"] for w in workouts] == ["Replica only"]
+
+    # Writes land on the primary
+    assert client.post("/workouts", json={"name": "Primary"}, headers=headers).status_code == 201
+    with app.app_context():
+        assert [w.name for w in Workout.query.all()] == ["Primary"]
+    print("✅ GET /workouts reads the replica, POST writes the primary")
+
+
+def test_reads_after_a_write_stay_on_primary():
+    setup_databases()
+    with app.test_request_context():
+        g.use_replica = True
+        assert [w.name for w in Workout.query.all()] == ["Replica only"]
+
+        db.session.add(Workout(user_id=1, name="Fresh"))
+        db.session.flush()
+        assert [w.name for w in Workout.query.all()] == ["Fresh"]
+        db.session.rollback()
+    print("✅ Reads after a write in the same request go to the primary")
+
+
+def test_auth_lookups_use_primary():
+    setup_databases()
+    client = app.test_client()
+    with app.app_context():
+        # Signed up a moment ago: on the primary, not yet on the replica
+        user = User(username="newcomer", email="newcomer@example.com", password_hash="x")
+        db.session.add(user)
+        db.session.commit()
+        headers = {"Authorization": f"Bearer {create_token(user.id)}"}
+
+    assert client.get("/workouts", headers=headers).status_code == 200
+
+    # The revocation is only on the primary too
+    assert client.post("/users/logout", headers=headers).status_code == 200
+    assert client.get("/workouts", headers=headers).status_code == 401
+    print("✅ Token revocation and user lookups ignore replica lag")
+
+
+if __name__ == "__main__":
+    test_get_handlers_read_from_replica()
+    test_reads_after_a_write_stay_on_primary()
+    test_auth_lookups_use_primary()
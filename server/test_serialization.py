@@ -0,0 +1,102 @@
+from datetime import date
+import pytest
+from app import create_app, db
+from models import User, Workout, ProgressLog, Exercise
+from extensions import exercise_catalog
+from server.utils import json_output
+from server.utils.jwt_handler import create_token
+
+app = create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": "sqlite://"})
+
+
+def setup_user():
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        user = User(username="serial", email="serial@example.com")
+        user.set_password("password123")
+        db.session.add(user)
+        db.session.commit()
+        db.session.add(Workout(user_id=user.id, name="Legs", date=date(2024, 2, 1), duration=45))
+        db.session.add(ProgressLog(user_id=user.id, log_date=date(2024, 2, 1), weight=80.5))
+        db.session.add(Exercise(name="Lunges", category="Strength"))
+        db.session.commit()
+        exercise_catalog.invalidate()
+        return user.id, {"Authorization": f"Bearer {create_token(user.id)}"}
+
+
+def test_to_dict_matches_columns():
+    user_id, headers = setup_user()
+    with app.app_context():
+        workout = Workout.query.one()
+        expected = {
+            "id": workout.id, "user_id": user_id, "name": "Legs", "description": None,
+            "date": "2024-02-01", "duration": 45, "calories_burned": None, "workout_type": None,
+        }
+        assert workout.to_dict() == expected
+
+        # Expired instances are refreshed through the ORM
+        db.session.expire(workout)
+        assert workout.to_dict() == expected
+
+        row = db.session.query(*Workout.serialize_columns()).one()
+        assert Workout.row_to_dict(row) == expected
+        assert "password_hash" not in User.query.one().to_dict()
+    print("✅ Column serializers produce the same dicts as before")
+
+
+def test_responses_use_fast_encoder():
+    user_id, headers = setup_user()
+    client = app.test_client()
+
+    response = client.get("/progress_logs", headers=headers)
+    assert response.status_code == 200
+    assert response.content_type == "application/json"
+    assert response.get_json()[0]["log_date"] == "2024-02-01"
+    print("✅ API responses go through the JSON representation")
+
+
+def test_sparse_fieldsets():
+    user_id, headers = setup_user()
+    client = app.test_client()
+
+    assert client.get("/workouts?fields=name,duration", headers=headers).get_json() == [{"name": "Legs", "duration": 45}]
+    page = client.get("/progress_logs?fields=weight&limit=1", headers=headers).get_json()
+    assert page == {"items": [{"weight": 80.5}], "next_cursor": None}
+    assert client.get("/exercises?fields=name", headers=headers).get_json() == [{"name": "Lunges"}]
+
+    workouts = client.get("/workouts?expand=exercises&fields=id", headers=headers).get_json()
+    assert set(workouts[0]) == {"id", "exercises"}
+    assert client.get("/workouts?fields=password", headers=headers).status_code == 400
+    # A list that names nothing is an error on every path, not "all fields" on some
+    for url in ("/workouts?fields=,", "/workouts?expand=exercises&fields=,", "/progress_logs?fields=,%20", "/exercises?fields=,"):
+        assert client.get(url, headers=headers).status_code == 400, url
+    print("✅ ?fields= trims list responses to the requested columns")
+
+
+PAYLOAD = {"day": date(2024, 2, 1), "values": [1, 2.5, None], "notes": "Café – 5×5 squats 💪"}
+EXPECTED = '{"day":"2024-02-01","values":[1,2.5,null],"notes":"Café – 5×5 squats 💪"}'.encode()
+
+
+def test_stdlib_fallback():
+    orjson, json_output.orjson = json_output.orjson, None
+    try:
+        assert json_output.dumps(PAYLOAD) == EXPECTED
+    finally:
+        json_output.orjson = orjson
+    print("✅ The stdlib fallback writes compact UTF-8 JSON")
+
+
+def test_orjson_matches_fallback():
+    pytest.importorskip("orjson")
+    assert json_output.orjson is not None
+    assert json_output.dumps(PAYLOAD) == EXPECTED
+    print("✅ orjson and the fallback produce the same bytes")
+
+
+if __name__ == "__main__":
+    test_to_dict_matches_columns()
+    test_responses_use_fast_encoder()
+    test_sparse_fieldsets()
+    test_stdlib_fallback()
+    test_orjson_matches_fallback()
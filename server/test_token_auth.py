@@ -0,0 +1,148 @@
+import time
+import jwt
+from app import create_app, db
+from extensions import token_verifier, revocation_store, user_cache
+from models import User, RevokedToken
+from server.utils.jwt_handler import create_token
+from server.utils.revocation import MemoryRevocationBackend
+
+app = create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": "sqlite://"})
+
+
+def setup_user(username="tokenuser"):
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        user = User(username=username, email=f"{username}@example.com")
+        user.set_password("password123")
+        db.session.add(user)
+        db.session.commit()
+        return user.id, {"Authorization": f"Bearer {create_token(user.id)}"}
+
+
+def test_user_lookup_is_cached():
+    user_id, headers = setup_user()
+    client = app.test_client()
+
+    assert client.get("/workouts", headers=headers).status_code == 200
+    with app.app_context():
+        # Remove the row behind the cache's back - the cached identity still answers
+        db.session.query(User).filter_by(id=user_id).delete()
+        db.session.commit()
+    assert client.get("/workouts", headers=headers).status_code == 200
+    print("✅ Repeated requests are served from the user cache")
+
+
+def test_user_cache_invalidated_on_update_and_delete():
+    user_id, headers = setup_user()
+    client = app.test_client()
+
+    response = client.put(f"/users/{user_id}", json={"username": "renamed"}, headers=headers)
+    assert response.status_code == 200
+    with app.app_context():
+        assert app.extensions["user_cache"].cache.get(user_id) is None
+
+    assert client.delete(f"/users/{user_id}", headers=headers).status_code == 200
+    assert client.get("/workouts", headers=headers).status_code == 401
+    print("✅ Updating or deleting a user drops the cached identity")
+
+
+def test_user_cache_bookkeeping_is_bounded():
+    with app.app_context():
+        cache = user_cache._state
+
+        def loader(user_id):
+            # Another request updates the user mid-load: the stale row isn't cached
+            user_cache.invalidate(user_id)
+            return User(id=user_id, username="stale")
+
+        assert user_cache.get(424242, loader).username == "stale"
+        assert cache.cache.get(424242) is None
+
+        for user_id in range(1000, 3000):
+            user_cache.invalidate(user_id)
+        assert cache.loading == {}
+    print("✅ Invalidations leave no per-user state behind")
+
+
+def test_tokens_carry_and_enforce_expiry():
+    user_id, headers = setup_user()
+    client = app.test_client()
+    secret = app.config["JWT_SECRET_KEY"]
+
+    with app.app_context():
+        claims = token_verifier.decode(headers["Authorization"].split(" ", 1)[1])
+    assert {"exp", "iat", "nbf"} <= set(claims)
+
+    expired = jwt.encode({"user_id": user_id, "iat": 0, "exp": int(time.time()) - 10}, secret, algorithm="HS256")
+    no_expiry = jwt.encode({"user_id": user_id}, secret, algorithm="HS256")
+    assert client.get("/workouts", headers={"Authorization": f"Bearer {expired}"}).status_code == 401
+    assert client.get("/workouts", headers={"Authorization": f"Bearer {no_expiry}"}).status_code == 401
+    print("✅ Expired tokens and tokens without exp are rejected")
+
+
+def test_verified_tokens_are_memoized():
+    user_id, headers = setup_user()
+    token = headers["Authorization"].split(" ", 1)[1]
+
+    with app.app_context():
+        first = token_verifier.decode(token)
+        assert app.extensions["token_verifier"].cache.get(token) is first
+        assert token_verifier.decode(token) is first
+
+        # Once a cached token's exp passes it is rejected without re-verifying
+        first["exp"] = int(time.time()) - 1
+        try:
+            token_verifier.decode(token)
+            assert False, "expired cached token was accepted"
+        except jwt.ExpiredSignatureError:
+            pass
+    print("✅ Verified tokens are cached until they expire")
+
+
+def test_logout_revokes_token():
+    user_id, headers = setup_user()
+    client = app.test_client()
+
+    assert client.get("/workouts", headers=headers).status_code == 200
+    assert client.post("/users/logout", headers=headers).status_code == 200
+    assert client.get("/workouts", headers=headers).status_code == 401
+    print("✅ Logged-out tokens are rejected")
+
+
+def test_database_revocation_backend():
+    db_app = create_app({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": "sqlite://",
+        "REVOCATION_BACKEND": "database",
+    })
+    with db_app.app_context():
+        db.create_all()
+        revocation_store.revoke("stale", time.time() - 5)
+        revocation_store.revoke("live", time.time() + 60)
+        assert revocation_store.is_revoked("live")
+        assert not revocation_store.is_revoked("stale")
+        # Expired rows are purged on the next revoke
+        revocation_store.revoke("another", time.time() + 60)
+        assert db.session.get(RevokedToken, "stale") is None
+    print("✅ Database backend shares revocations and purges expired rows")
+
+
+def test_memory_backend_evicts_expired_tokens():
+    backend = MemoryRevocationBackend()
+    backend.revoke("old", time.time() - 1)
+    backend.revoke("new", time.time() + 60)
+    assert len(backend) == 1
+    assert backend.is_revoked("new") and not backend.is_revoked("old")
+    print("✅ Memory backend drops tokens once they expire")
+
+
+if __name__ == "__main__":
+    test_user_lookup_is_cached()
+    test_user_cache_invalidated_on_update_and_delete()
+    test_user_cache_bookkeeping_is_bounded()
+    test_tokens_carry_and_enforce_expiry()
+    test_verified_tokens_are_memoized()
+    test_logout_revokes_token()
+    test_database_revocation_backend()
+    test_memory_backend_evicts_expired_tokens()
@@ -0,0 +1,150 @@
+from contextlib import contextmanager
+from sqlalchemy import event
+from app import create_app, db
+from models import User, Exercise, Workout, WorkoutExercise
+from server.utils.jwt_handler import create_token
+
+app = create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": "sqlite://"})
+
+
+def setup_data():
+    """A user plus a small exercise library"""
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        user = User(username="lifter", email="lifter@example.com")
+        user.set_password("password123")
+        db.session.add(user)
+        db.session.add_all([
+            Exercise(name="Squats", category="Strength"),
+            Exercise(name="Bench Press", category="Strength"),
+            Exercise(name="Running", category="Cardio"),
+        ])
+        db.session.commit()
+        exercise_ids = [e.id for e in Exercise.query.order_by(Exercise.id)]
+        return {"Authorization": f"Bearer {create_token(user.id)}"}, exercise_ids
+
+
+def full_workout_payload(exercise_ids, count=12):
+    return {
+        "name": "Push Day",
+        "date": "2024-03-01",
+        "duration": 60,
+        "workout_type": "Strength",
+        "exercises": [
+            {"exercise_id": exercise_ids[i % len(exercise_ids)], "sets": 3, "reps": 10}
+            for i in range(count)
+        ],
+    }
+
+
+def test_create_full_workout():
+    headers, exercise_ids = setup_data()
+    client = app.test_client()
+
+    response = client.post("/workouts/full", json=full_workout_payload(exercise_ids), headers=headers)
+    assert response.status_code == 201
+    workout = response.get_json()["workout"]
+    assert workout["date"] == "2024-03-01"
+    assert [e["order"] for e in workout["exercises"]] == list(range(1, 13))
+
+    with app.app_context():
+        assert WorkoutExercise.query.filter_by(workout_id=workout["id"]).count() == 12
+    print("✅ Workout and 12 exercises created in one request")
+
+
+def test_full_workout_is_all_or_nothing():
+    headers, exercise_ids = setup_data()
+    client = app.test_client()
+
+    payload = full_workout_payload(exercise_ids, count=2)
+    payload["exercises"].append({"exercise_id": 9999})
+    response = client.post("/workouts/full", json=payload, headers=headers)
+    assert response.status_code == 400
+
+    with app.app_context():
+        assert Workout.query.count() == 0
+        assert WorkoutExercise.query.count() == 0
+    print("✅ An unknown exercise rejects the whole workout")
+
+
+def test_full_workout_rejects_malformed_bodies():
+    headers, exercise_ids = setup_data()
+    client = app.test_client()
+
+    bad_bodies = [
+        [full_workout_payload(exercise_ids, count=1)],
+        dict(full_workout_payload(exercise_ids, count=1), exercises=["Squats"]),
+        dict(full_workout_payload(exercise_ids, count=1), exercises=[{"exercise_id": [exercise_ids[0]]}]),
+        # Reach the database before failing - still a 400, and rolled back
+        dict(full_workout_payload(exercise_ids, count=1), duration={"minutes": 60}),
+        dict(full_workout_payload(exercise_ids, count=1), date=20240301),
+    ]
+    for body in bad_bodies:
+        response = client.post("/workouts/full", json=body, headers=headers)
+        assert response.status_code == 400, body
+
+    with app.app_context():
+        assert Workout.query.count() == 0
+    assert client.post("/workouts/full", json=full_workout_payload(exercise_ids, count=1), headers=headers).status_code == 201
+    print("✅ Malformed bodies get a 400 and leave nothing behind")
+
+
+def test_workout_exercises_list_is_registered():
+    headers, exercise_ids = setup_data()
+    client = app.test_client()
+
+    workout_id = client.post("/workouts", json={"name": "Solo"}, headers=headers).get_json()["workout"]["id"]
+    response = client.post("/workout_exercises", json={"workout_id": workout_id, "exercise_id": exercise_ids[0]}, headers=headers)
+    assert response.status_code == 201
+    assert len(client.get("/workout_exercises", headers=headers).get_json()) == 1
+    print("✅ POST /workout_exercises works")
+
+
+@contextmanager
+def count_queries():
+    """Count SQL statements sent to the database inside the block"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def test_expand_exercises_uses_bounded_queries():
+    headers, exercise_ids = setup_data()
+    client = app.test_client()
+    for _ in range(5):
+        client.post("/workouts/full", json=full_workout_payload(exercise_ids, count=6), headers=headers)
+    client.get("/workouts", headers=headers)  # warm the user cache
+
+    with count_queries() as statements:
+        response = client.get("/workouts?expand=exercises", headers=headers)
+    assert response.status_code == 200
+    workouts = response.get_json()
+    assert len(workouts) == 5
+    assert all(len(w["exercises"]) == 6 and w["exercises"][0]["exercise"]["name"] for w in workouts)
+    # workouts + (workout_exercises JOIN exercises), however many rows there are
+    assert len(statements) == 2, statements
+
+    with count_queries() as statements:
+        response = client.get(f"/workouts/{workouts[0]['id']}?expand=exercises", headers=headers)
+    assert response.status_code == 200
+    assert len(response.get_json()["exercises"]) == 6
+    assert len(statements) == 2, statements
+    print("✅ ?expand=exercises loads nested exercises in 2 queries")
+
+
+if __name__ == "__main__":
+    test_create_full_workout()
+    test_full_workout_is_all_or_nothing()
+    test_full_workout_rejects_malformed_bodies()
+    test_workout_exercises_list_is_registered()
+    test_expand_exercises_uses_bounded_queries()
@@ -0,0 +1,43 @@
+from sqlalchemy import event, insert, update
+from sqlalchemy.orm import Session
+from models import db, Exercise, CatalogVersion
+
+EXERCISES = "exercises"
+
+table = CatalogVersion.__table__
+
+
+def get_version(name=EXERCISES):
+    """Current version of a catalogue - one primary key lookup"""
+    version = db.session.query(CatalogVersion.version).filter_by(name=name).scalar()
+    return version or 0
+
+
+def bump_version(connection, name=EXERCISES):
+    result = connection.execute(
+        update(table).where(table.c.name == name).values(version=table.c.version + 1)
+    )
+    if result.rowcount == 0:
+        connection.execute(insert(table).values(name=name, version=1))
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_on_exercise_flush(session, flush_context):
+    """Any flush that adds, changes or deletes an Exercise bumps the exercise catalogue version"""
+    changed = (
+        any(isinstance(obj, Exercise) for obj in session.new)
+        or any(isinstance(obj, Exercise) for obj in session.deleted)
+        or any(isinstance(obj, Exercise) and session.is_modified(obj) for obj in session.dirty)
+    )
+    if changed:
+        bump_version(session.connection())
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _bump_on_bulk_exercise_change(orm_execute_state):
+    """Bulk inserts/updates/deletes on Exercise skip the flush, so catch them here too"""
+    is_insert = getattr(orm_execute_state, "is_insert", False)
+    if is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None and mapper.class_ is Exercise:
+            bump_version(orm_execute_state.session.connection())
@@ -0,0 +1,255 @@
+import csv
+import io
+import json
+from datetime import date
+from sqlalchemy import insert
+from models import db, Workout, WorkoutExercise, ProgressLog
+from extensions import exercise_catalog
+from server.utils.json_output import dumps
+from server.utils.workout_stats import workout_delta, merge_deltas, apply_deltas
+
+IMPORT_BATCH_SIZE = 1000
+# Integer columns are 32-bit on Postgres
+INTEGER_RANGE = range(-2 ** 31, 2 ** 31)
+
+# Record types in export order - workouts come before the exercises that point at them.
+# "id" on a workout and "workout_id" on an exercise only link records within one file;
+# imported rows get new ids.
+RECORD_FIELDS = {
+    "workout": ('id', 'name', 'description', 'date', 'duration', 'calories_burned', 'workout_type'),
+    "workout_exercise": ('workout_id', 'exercise_id', 'exercise', 'sets', 'reps', 'weight', 'duration', 'distance', 'notes', 'order'),
+    "progress_log": ('log_date', 'weight', 'body_fat', 'chest', 'waist', 'hips', 'biceps', 'thighs', 'notes'),
+}
+CSV_COLUMNS = ['type'] + list(dict.fromkeys(name for fields in RECORD_FIELDS.values() for name in fields))
+
+
+class RecordError(ValueError):
+    """A record that can't be imported - carries the line it came from"""
+
+    def __init__(self, line, message):
+        super().__init__(f"line {line}: {message}")
+        self.line = line
+
+
+# -----------------------
+# Export
+# -----------------------
+def export_records(user_id, batch_size=IMPORT_BATCH_SIZE):
+    """Every workout, workout exercise and progress log of one user, as plain dicts"""
+    workout_fields = RECORD_FIELDS["workout"]
+    query = db.session.query(*Workout.serialize_columns(workout_fields)).filter(Workout.user_id == user_id)
+    for row in query.order_by(Workout.date, Workout.id).yield_per(batch_size):
+        yield dict(Workout.row_to_dict(row, workout_fields), type="workout")
+
+    exercise_fields = tuple(name for name in RECORD_FIELDS["workout_exercise"] if name != 'exercise')
+    query = db.session.query(*WorkoutExercise.serialize_columns(exercise_fields)).filter(WorkoutExercise.user_id == user_id)
+    for row in query.order_by(WorkoutExercise.workout_id, WorkoutExercise.order, WorkoutExercise.id).yield_per(batch_size):
+        record = WorkoutExercise.row_to_dict(row, exercise_fields)
+        exercise = exercise_catalog.get(record['exercise_id'])
+        record.update(type="workout_exercise", exercise=exercise['name'] if exercise else None)
+        yield record
+
+    log_fields = RECORD_FIELDS["progress_log"]
+    query = db.session.query(*ProgressLog.serialize_columns(log_fields)).filter(ProgressLog.user_id == user_id)
+    for row in query.order_by(ProgressLog.log_date, ProgressLog.id).yield_per(batch_size):
+        yield dict(ProgressLog.row_to_dict(row, log_fields), type="progress_log")
+
+
+def _batched(records, batch_size):
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def ndjson_chunks(records, batch_size=IMPORT_BATCH_SIZE):
+    """Encode records as NDJSON, one chunk per batch"""
+    for batch in _batched(records, batch_size):
+        yield b"".join(dumps(record) + b"\n" for record in batch)
+
+
+def csv_chunks(records, batch_size=IMPORT_BATCH_SIZE):
+    """Encode records as one CSV with a type column, one chunk per batch"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS, extrasaction='ignore')
+    writer.writeheader()
+    for batch in _batched(records, batch_size):
+        writer.writerows(batch)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()  # header only
+
+
+# -----------------------
+# Import
+# -----------------------
+def read_ndjson(stream):
+    """Yield (line number, record) from a binary NDJSON stream"""
+    for number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            raise RecordError(number, f"invalid JSON ({e})")
+        if not isinstance(record, dict):
+            raise RecordError(number, "expected a JSON object")
+        yield number, record
+
+
+def read_csv(stream):
+    """Yield (line number, record) from a binary CSV stream; empty cells become null"""
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8", newline=""))
+    while True:
+        try:
+            record = next(reader)
+        except StopIteration:
+            return
+        except (UnicodeDecodeError, csv.Error) as e:
+            # Decoding runs ahead in chunks, so the line is approximate for bad UTF-8
+            raise RecordError(reader.line_num + 1, f"unreadable CSV ({e})")
+        yield reader.line_num, {key: (value if value != "" else None) for key, value in record.items()}
+
+
+def _coerce(model, number, record, fields):
+    """Pick the known fields of a record and convert them to the column types"""
+    columns = model.__table__.c
+    values = {}
+    for name in fields:
+        value = record.get(name)
+        if value is None:
+            values[name] = None
+            continue
+        # Fields that aren't columns (the exercise name) are plain text
+        python_type = columns[name].type.python_type if name in columns else str
+        try:
+            values[name] = _convert(python_type, value)
+        except (TypeError, ValueError):
+            raise RecordError(number, f"invalid {name}: {value!r}")
+    return values
+
+
+def _convert(python_type, value):
+    """value as python_type; strings are parsed, any other mismatched type is a TypeError"""
+    if isinstance(value, bool):
+        raise TypeError(value)
+    if python_type is date:
+        if isinstance(value, str):
+            return date.fromisoformat(value)
+        if type(value) is date:
+            return value
+    elif python_type is int:
+        if isinstance(value, (str, int)):
+            value = int(value)
+            if value not in INTEGER_RANGE:
+                raise ValueError(value)
+            return value
+    elif python_type is float:
+        if isinstance(value, (str, int, float)):
+            return float(value)
+    elif isinstance(value, python_type):
+        return value
+    raise TypeError(value)
+
+
+class _Importer:
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self.workout_ids = {}   # id in the file -> new id
+        self.counts = dict.fromkeys(RECORD_FIELDS, 0)
+        self.workouts, self.exercises, self.logs = [], [], []
+
+    def add(self, number, record):
+        kind = record.get('type')
+        if kind not in RECORD_FIELDS:
+            raise RecordError(number, f"unknown record type {kind!r}")
+        getattr(self, f"_add_{kind}")(number, record)
+        self.counts[kind] += 1
+
+    def _add_workout(self, number, record):
+        values = _coerce(Workout, number, record, RECORD_FIELDS["workout"])
+        if not values['name']:
+            raise RecordError(number, "workout name is required")
+        source_id = values.pop('id')
+        if values['date'] is None:
+            values.pop('date')  # column default: today
+        self.workouts.append((source_id, Workout(user_id=self.user_id, **values)))
+        if len(self.workouts) >= IMPORT_BATCH_SIZE:
+            self.flush_workouts()
+
+    def _add_workout_exercise(self, number, record):
+        values = _coerce(WorkoutExercise, number, record, RECORD_FIELDS["workout_exercise"])
+        # Match on the exercise name when there is one - ids differ between deployments
+        name = values.pop('exercise')
+        exercise_id = exercise_catalog.id_for_name(name) if name else values['exercise_id']
+        if exercise_id is None or exercise_catalog.get(exercise_id) is None:
+            raise RecordError(number, f"unknown exercise {name or values['exercise_id']!r}")
+
+        # The workout may still be waiting in the current batch
+        if values['workout_id'] not in self.workout_ids:
+            self.flush_workouts()
+        workout_id = self.workout_ids.get(values['workout_id'])
+        if workout_id is None:
+            raise RecordError(number, f"workout {values['workout_id']!r} is not in the file")
+
+        values.update(user_id=self.user_id, workout_id=workout_id, exercise_id=exercise_id)
+        self.exercises.append(values)
+        if len(self.exercises) >= IMPORT_BATCH_SIZE:
+            self.flush_rows()
+
+    def _add_progress_log(self, number, record):
+        values = _coerce(ProgressLog, number, record, RECORD_FIELDS["progress_log"])
+        if values['log_date'] is None:
+            raise RecordError(number, "log_date is required")
+        values['user_id'] = self.user_id
+        self.logs.append(values)
+        if len(self.logs) >= IMPORT_BATCH_SIZE:
+            self.flush_rows()
+
+    def flush_workouts(self):
+        """Insert pending workouts (their new ids are needed for exercises) and update the rollup"""
+        if not self.workouts:
+            return
+        workouts = [workout for _, workout in self.workouts]
+        db.session.add_all(workouts)
+        db.session.flush()
+        for source_id, workout in self.workouts:
+            if source_id is not None:
+                self.workout_ids[source_id] = workout.id
+        apply_deltas(merge_deltas(*(workout_delta(workout) for workout in workouts)))
+        # Nothing reads these objects again - keep the identity map small
+        for workout in workouts:
+            db.session.expunge(workout)
+        self.workouts = []
+
+    def flush_rows(self):
+        """One executemany per table for pending exercises and logs"""
+        if self.exercises:
+            db.session.execute(insert(WorkoutExercise.__table__), self.exercises)
+            self.exercises = []
+        if self.logs:
+            db.session.execute(insert(ProgressLog.__table__), self.logs)
+            self.logs = []
+
+    def finish(self):
+        self.flush_workouts()
+        self.flush_rows()
+        return self.counts
+
+
+def import_records(user_id, records):
+    """
+    Add (line number, record) pairs to a user's account in batches, all in
+    the current transaction. Returns counts per record type; raises
+    RecordError on the first bad record. The caller commits or rolls back.
+    """
+    importer = _Importer(user_id)
+    for number, record in records:
+        importer.add(number, record)
+    return importer.finish()
@@ -0,0 +1,110 @@
+import threading
+import time
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that also records how long checkouts waited for a free connection"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def _do_get(self):
+        began = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - began
+            with self._stats_lock:
+                self.checkouts += 1
+                self.wait_total += waited
+                self.wait_max = max(self.wait_max, waited)
+
+
+def engine_options(config):
+    """
+    SQLALCHEMY_ENGINE_OPTIONS built from the DB_* settings in Config.
+
+    Only server databases get a pool. The defaults assume one gunicorn
+    worker handles a few requests at a time, so each worker keeps a small
+    pool instead of exhausting the server's connection limit.
+    """
+    uri = config["SQLALCHEMY_DATABASE_URI"]
+    if uri.startswith("sqlite"):
+        return {}
+
+    options = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": config["DB_POOL_SIZE"],
+        "max_overflow": config["DB_MAX_OVERFLOW"],
+        "pool_timeout": config["DB_POOL_TIMEOUT"],
+        "pool_recycle": config["DB_POOL_RECYCLE"],
+        "pool_pre_ping": config["DB_POOL_PRE_PING"],
+    }
+    timeout_ms = config["DB_STATEMENT_TIMEOUT_MS"]
+    if timeout_ms and uri.startswith("postgresql"):
+        options["connect_args"] = {"options": f"-c statement_timeout={timeout_ms}"}
+    return options
+
+
+def pool_stats(engine):
+    """Current pool usage - reads counters only, never opens a connection"""
+    pool = engine.pool
+    stats = {"pool": type(pool).__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, name, None)
+        if callable(method):
+            stats[name] = method()
+
+    if isinstance(pool, InstrumentedQueuePool):
+        with pool._stats_lock:
+            stats.update(
+                checkouts=pool.checkouts,
+                timeouts=pool.timeouts,
+                wait_ms_total=round(pool.wait_total * 1000, 3),
+                wait_ms_avg=round(pool.wait_total * 1000 / pool.checkouts, 3) if pool.checkouts else 0.0,
+                wait_ms_max=round(pool.wait_max * 1000, 3),
+            )
+    return stats
+
+
+def sqlite_pragmas(config):
+    """
+    PRAGMAs for the single-node SQLite profile (SQLITE_TUNING=1).
+
+    WAL lets readers run while a writer commits instead of everyone
+    queueing on the rollback journal, and synchronous=NORMAL is safe under
+    WAL (a power cut can lose the last commits but never corrupts the file).
+    """
+    if not config["SQLITE_TUNING"]:
+        return {}
+    return {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": config["SQLITE_BUSY_TIMEOUT_MS"],
+        "cache_size": config["SQLITE_CACHE_SIZE"],
+        "mmap_size": config["SQLITE_MMAP_SIZE"],
+    }
+
+
+def install_sqlite_pragmas(engine, pragmas):
+    """Run the PRAGMAs on every new connection the engine opens"""
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
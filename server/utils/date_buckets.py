@@ -0,0 +1,43 @@
+from datetime import date
+from sqlalchemy import Date, cast, func
+from extensions import db
+
+BUCKETS = ("day", "week", "month")
+
+
+def bucket_start(column, bucket):
+    """
+    SQL expression for the day, or the first day of the week (Monday) or
+    month, containing `column`, so rows can be grouped by it in the database.
+    """
+    if bucket not in BUCKETS:
+        raise ValueError(f"bucket must be one of: {', '.join(BUCKETS)}")
+
+    if db.engine.dialect.name == "postgresql":
+        return cast(func.date_trunc(bucket, column), Date)
+
+    if bucket == "day":
+        return func.date(column)
+    # SQLite: 'weekday 0' moves forward to Sunday, then back 6 days to Monday
+    if bucket == "week":
+        return func.date(column, "weekday 0", "-6 days")
+    return func.date(column, "start of month")
+
+
+def parse_date_range(args):
+    """Read optional ?from=YYYY-MM-DD&to=YYYY-MM-DD. Raises ValueError if malformed."""
+    start = args.get("from")
+    end = args.get("to")
+    try:
+        start = date.fromisoformat(start) if start else None
+        end = date.fromisoformat(end) if end else None
+    except ValueError:
+        raise ValueError("from and to must be dates in YYYY-MM-DD format")
+    if start and end and start > end:
+        raise ValueError("from must not be after to")
+    return start, end
+
+
+def isoformat(value):
+    """Bucket values come back as dates on Postgres and strings on SQLite"""
+    return value.isoformat() if hasattr(value, "isoformat") else value
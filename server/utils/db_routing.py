@@ -0,0 +1,81 @@
+from contextlib import contextmanager
+from functools import wraps
+from flask import current_app, g, has_app_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine, event
+
+
+class RoutingSession(Session):
+    """
+    Session that sends reads to the read replica engine (see init_replica) while
+    a handler wrapped in @use_replica runs. Everything else goes to the
+    primary: writes, flushes, and any read that comes after a write in the
+    same request, so a request always sees its own changes.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self._can_use_replica(clause):
+            replica = current_app.extensions.get("read_replica")
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _can_use_replica(self, clause):
+        if not has_app_context() or not g.get("use_replica") or g.get("wrote_primary"):
+            return False
+        if self._flushing or self.new or self.dirty or self.deleted:
+            return False
+        return not getattr(clause, "is_dml", False)
+
+
+def _mark_primary_write():
+    if has_app_context():
+        g.wrote_primary = True
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _flushed(session, flush_context):
+    _mark_primary_write()
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _executed(orm_execute_state):
+    if getattr(orm_execute_state.statement, "is_dml", False):
+        _mark_primary_write()
+
+
+def use_replica(f):
+    """Let the reads in this handler go to the read replica, if one is configured"""
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        previous = g.get("use_replica", False)
+        g.use_replica = True
+        try:
+            return f(*args, **kwargs)
+        finally:
+            g.use_replica = previous
+    return decorated
+
+
+@contextmanager
+def use_primary():
+    """Send the reads in this block to the primary even inside a @use_replica handler"""
+    if not has_app_context():
+        yield
+        return
+    previous = g.get("use_replica", False)
+    g.use_replica = False
+    try:
+        yield
+    finally:
+        g.use_replica = previous
+
+
+def init_replica(app, engine_options):
+    """Create the READ_REPLICA_URL engine, if one is configured. Returns it or None."""
+    url = app.config.get("READ_REPLICA_URL")
+    if not url:
+        return None
+    engine = create_engine(url, **engine_options(dict(app.config, SQLALCHEMY_DATABASE_URI=url)))
+    app.extensions["read_replica"] = engine
+    return engine
@@ -0,0 +1,93 @@
+import threading
+import time
+from flask import current_app
+
+
+class _Snapshot:
+    """One loaded copy of the library. Never modified - a reload builds a new one."""
+    __slots__ = ("version", "items", "by_id", "by_name")
+
+    def __init__(self, version, items):
+        self.version = version
+        self.items = items    # every exercise, in id order
+        self.by_id = {item["id"]: item for item in items}
+        self.by_name = {item["name"].lower(): item["id"] for item in items}
+
+
+class _CatalogState:
+    def __init__(self, check_interval):
+        self.check_interval = check_interval
+        self.lock = threading.Lock()
+        self.snapshot = None
+        self.checked_at = 0.0
+
+
+class ExerciseCatalog:
+    """
+    Process-local, read-mostly copy of the exercise library.
+
+    Loaded on first use and kept as id -> dict and name -> id indexes.
+    At most every EXERCISE_CATALOG_CHECK_INTERVAL seconds it compares its
+    version with catalog_versions and reloads if another worker changed
+    the library. ExerciseResource writes call invalidate() so this
+    worker sees its own changes immediately.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("EXERCISE_CATALOG_CHECK_INTERVAL", 5)
+        app.extensions["exercise_catalog"] = _CatalogState(app.config["EXERCISE_CATALOG_CHECK_INTERVAL"])
+
+    def snapshot(self):
+        """
+        The current copy of the library. Read everything a response needs
+        (version, items, by_id) from one snapshot so a reload in between
+        can't mix two versions.
+        """
+        state = current_app.extensions["exercise_catalog"]
+        snapshot = state.snapshot
+        now = time.monotonic()
+        if snapshot is not None and now - state.checked_at < state.check_interval:
+            return snapshot
+
+        from server.utils.catalog_version import get_version
+        with state.lock:
+            version = get_version()
+            snapshot = state.snapshot
+            if snapshot is None or version != snapshot.version:
+                snapshot = state.snapshot = self._load(version)
+            state.checked_at = now
+        return snapshot
+
+    def _load(self, version):
+        from models import db, Exercise
+        rows = db.session.query(*Exercise.serialize_columns()).order_by(Exercise.id)
+        return _Snapshot(version, [Exercise.row_to_dict(row) for row in rows])
+
+    @property
+    def version(self):
+        return self.snapshot().version
+
+    def all(self):
+        """Every exercise as a dict. Treat the result as read-only."""
+        return self.snapshot().items
+
+    def get(self, exercise_id):
+        return self.snapshot().by_id.get(exercise_id)
+
+    def id_for_name(self, name):
+        return self.snapshot().by_name.get(name.lower()) if name else None
+
+    def missing(self, exercise_ids):
+        """The ids in exercise_ids that are not in the library"""
+        by_id = self.snapshot().by_id
+        return {exercise_id for exercise_id in exercise_ids if exercise_id not in by_id}
+
+    def invalidate(self):
+        """Reload on next use"""
+        state = current_app.extensions["exercise_catalog"]
+        with state.lock:
+            state.snapshot = None
@@ -0,0 +1,29 @@
+import json
+from flask import make_response
+
+try:
+    import orjson
+except ImportError:  # orjson is optional - fall back to the stdlib encoder
+    orjson = None
+
+
+def _default(value):
+    # Dates and datetimes that slipped through to_dict()
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(data):
+    """Encode data as JSON bytes, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    # UTF-8 rather than \u escapes, like orjson
+    return json.dumps(data, default=_default, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def output_json(data, code, headers=None):
+    """flask-restful representation for application/json using dumps()"""
+    resp = make_response(dumps(data) + b"\n", code)
+    resp.headers.extend(headers or {})
+    return resp
@@ -1,19 +1,21 @@
-import jwt
+import logging
 from functools import wraps
-from flask import request, current_app
+from flask import request
 from models import User
+from extensions import user_cache, token_verifier, revocation_store
+from server.utils.db_routing import use_primary
 
-def create_token(user_id):
+logger = logging.getLogger(__name__)
+
+def create_token(user_id, **claims):
     try:
-        payload = {"user_id": user_id}
-        print(f"Creating token for user_id: {user_id}")  # Debug
-        print(f"JWT Secret Key: {current_app.config.get('JWT_SECRET_KEY')}")  # Debug
-        
-        token = jwt.encode(payload, current_app.config["JWT_SECRET_KEY"], algorithm="HS256")
-        print(f"Generated token: {token}")  # Debug
+        payload = {"user_id": user_id, **claims}
+        # Adds iat/nbf/exp so tokens no longer live forever
+        token = token_verifier.encode(payload)
+        logger.debug("Issued token", extra={"user_id": user_id})
         return token
-    except Exception as e:
-        print(f"Token creation error: {e}")  # Debug
+    except Exception:
+        logger.exception("Token creation failed", extra={"user_id": user_id})
         return None
 
 def token_required(f):
@@ -25,13 +27,19 @@ def token_required(f):
         if token.startswith("Bearer "):
             token = token.replace("Bearer ", "")
         try:
-            data = jwt.decode(token, current_app.config["JWT_SECRET_KEY"], algorithms=["HS256"])
-            user_id = data.get("user_id")
-            user = User.query.get(user_id)
+            data = token_verifier.decode(token)
+            # Never from the replica: a lagging copy would accept a token that was
+            # just revoked, or reject a user who was just created
+            with use_primary():
+                if revocation_store.is_revoked(data["jti"]):
+                    raise Exception("Token has been revoked")
+                user_id = data.get("user_id")
+                # Served from the per-process cache; only a miss touches the database
+                user = user_cache.get(user_id, User.query.get)
             if not user:
                 raise Exception("User not found")
         except Exception as e:
-            print(f"Token validation error: {e}")
+            logger.warning("Token rejected: %s", e)
             return {"error": "Invalid or expired token"}, 401
         
         # FIXED: Handle both function and method (class-based view) signatures
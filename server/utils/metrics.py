@@ -0,0 +1,176 @@
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from flask import Response, current_app, request
+from server.utils import query_stats
+
+# Seconds - the same buckets for request latency and DB time
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+STATUS_CLASSES = {n: f"{n}xx" for n in range(1, 6)}
+
+# Series layout: [requests, latency sum, db sum, queries, latency buckets, db buckets]
+COUNT, LATENCY_SUM, DB_SUM, QUERIES, LATENCY_HIST, DB_HIST = range(6)
+
+
+def _new_series(buckets):
+    size = len(buckets) + 1
+    return [0, 0.0, 0.0, 0, [0] * size, [0] * size]
+
+
+def _merge(totals, store, buckets):
+    """Add one store's series into totals"""
+    for key, series in list(store.items()):
+        total = totals.get(key)
+        if total is None:
+            total = totals[key] = _new_series(buckets)
+        for index in (COUNT, LATENCY_SUM, DB_SUM, QUERIES):
+            total[index] += series[index]
+        for index in (LATENCY_HIST, DB_HIST):
+            total[index] = [a + b for a, b in zip(total[index], series[index])]
+
+
+class _MetricsState:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.local = threading.local()
+        self.stores = {}    # weakref to thread -> that thread's dict
+        self.retired = {}   # series from threads that have exited
+        self.lock = threading.Lock()
+        self.hooks = None   # (before_request, after_request) when enabled
+
+    def store(self):
+        """This thread's series. Only this thread writes to it, so recording takes no lock."""
+        try:
+            return self.local.store
+        except AttributeError:
+            store = self.local.store = {}
+            with self.lock:
+                # A threaded dev server starts a thread per request, so retire
+                # finished threads here too rather than only when scraped
+                self.retire_dead()
+                self.stores[weakref.ref(threading.current_thread())] = store
+            return store
+
+    def retire_dead(self):
+        """Fold finished threads' series into retired. Caller holds the lock."""
+        for ref in [ref for ref in self.stores if ref() is None or not ref().is_alive()]:
+            _merge(self.retired, self.stores.pop(ref), self.buckets)
+
+
+class Metrics:
+    """
+    Per-endpoint request counters and latency / DB-time histograms,
+    exposed in Prometheus text format at /metrics.
+
+    Series are keyed by (endpoint, method, status class). Every thread
+    aggregates into its own dict without locking; a scrape adds the
+    threads' dicts up, folding those of exited threads into one total.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("METRICS_ENABLED", True)
+        state = app.extensions["metrics"] = _MetricsState(LATENCY_BUCKETS)
+        if not app.config["METRICS_ENABLED"]:
+            return
+
+        # Hooks close over this app's state and keep the start time in a
+        # thread-local: no current_app or g lookups on the hot path
+        local = state.local
+
+        def start():
+            local.started = time.perf_counter()
+
+        def finish(response):
+            started = getattr(local, "started", None)
+            if started is not None:
+                elapsed = time.perf_counter() - started
+                local.started = None
+                # QueryStats' hooks wrap these, so the request's stats are still live
+                stats = query_stats.current() or query_stats.RequestQueryStats()
+                req = request._get_current_object()
+                # Unknown URLs share one series so scanners can't blow up the label set
+                key = (req.endpoint or "unmatched", req.method, STATUS_CLASSES.get(response.status_code // 100, "other"))
+                self.record(state, key, elapsed, stats.seconds, stats.count)
+            return response
+
+        state.hooks = (start, finish)
+        app.before_request(start)
+        app.after_request(finish)
+        app.add_url_rule("/metrics", "metrics", self.export)
+
+    @property
+    def _state(self):
+        return current_app.extensions["metrics"]
+
+    @staticmethod
+    def record(state, key, seconds, db_seconds, queries):
+        store = state.store()
+        series = store.get(key)
+        if series is None:
+            series = store[key] = _new_series(state.buckets)
+        series[COUNT] += 1
+        series[LATENCY_SUM] += seconds
+        series[DB_SUM] += db_seconds
+        series[QUERIES] += queries
+        series[LATENCY_HIST][bisect_left(state.buckets, seconds)] += 1
+        series[DB_HIST][bisect_left(state.buckets, db_seconds)] += 1
+
+    def collect(self):
+        """Every thread's series added together: {key: series}"""
+        state = self._state
+        totals = {}
+        with state.lock:
+            state.retire_dead()
+            _merge(totals, state.retired, state.buckets)
+            stores = list(state.stores.values())
+        for store in stores:
+            _merge(totals, store, state.buckets)
+        return totals
+
+    def export(self):
+        return Response(render(self.collect(), self._state.buckets), content_type=PROMETHEUS_CONTENT_TYPE)
+
+
+def _labels(key, **extra):
+    endpoint, method, status = key
+    pairs = dict(endpoint=endpoint, method=method, status=status, **extra)
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for v in pairs.values())
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(pairs, escaped)) + "}"
+
+
+def _histogram(lines, name, help_text, totals, buckets, hist_index, sum_index):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for key, series in sorted(totals.items()):
+        cumulative = 0
+        for bound, count in zip(buckets + ("+Inf",), series[hist_index]):
+            cumulative += count
+            lines.append(f"{name}_bucket{_labels(key, le=bound)} {cumulative}")
+        lines.append(f"{name}_sum{_labels(key)} {series[sum_index]:.6f}")
+        lines.append(f"{name}_count{_labels(key)} {series[COUNT]}")
+
+
+def render(totals, buckets=LATENCY_BUCKETS):
+    """Prometheus text exposition of collected series"""
+    lines = [
+        "# HELP fitflow_http_requests_total Requests handled, by endpoint, method and status class.",
+        "# TYPE fitflow_http_requests_total counter",
+    ]
+    for key, series in sorted(totals.items()):
+        lines.append(f"fitflow_http_requests_total{_labels(key)} {series[COUNT]}")
+    _histogram(lines, "fitflow_http_request_duration_seconds", "Time spent in the handler.",
+               totals, buckets, LATENCY_HIST, LATENCY_SUM)
+    _histogram(lines, "fitflow_http_request_db_seconds", "Time spent in SQL statements per request.",
+               totals, buckets, DB_HIST, DB_SUM)
+    lines.append("# HELP fitflow_db_queries_total SQL statements run, by endpoint, method and status class.")
+    lines.append("# TYPE fitflow_db_queries_total counter")
+    for key, series in sorted(totals.items()):
+        lines.append(f"fitflow_db_queries_total{_labels(key)} {series[QUERIES]}")
+    return "\n".join(lines) + "\n"
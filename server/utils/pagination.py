@@ -0,0 +1,72 @@
+import base64
+from datetime import date
+from sqlalchemy import and_, or_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(sort_value, row_id):
+    """Build an opaque cursor from the last row of a page"""
+    raw = f"{sort_value.isoformat()},{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Turn a cursor back into (date, id). Raises ValueError if it is malformed."""
+    # Accept the plain "<date>,<id>" form as well as the opaque one
+    raw = cursor
+    if "," not in cursor:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        try:
+            raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        except Exception:
+            raise ValueError("Invalid cursor")
+    try:
+        sort_value, row_id = raw.split(",", 1)
+        return date.fromisoformat(sort_value), int(row_id)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+
+def wants_page(args):
+    """Only paginate when the client asks for it, so old clients keep getting a plain list"""
+    return "after" in args or "limit" in args
+
+
+def parse_page_args(args):
+    """Read ?after= and ?limit= from the query string"""
+    after = args.get("after")
+    after = decode_cursor(after) if after else None
+
+    limit = args.get("limit", DEFAULT_PAGE_SIZE)
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        raise ValueError("limit must be an integer")
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+    return after, min(limit, MAX_PAGE_SIZE)
+
+
+def keyset_page(query, sort_column, id_column, after=None, limit=DEFAULT_PAGE_SIZE):
+    """
+    Fetch one page ordered by (sort_column, id_column), starting after the cursor.
+    Returns (rows, next_cursor) - next_cursor is None on the last page.
+    """
+    if after:
+        sort_value, row_id = after
+        query = query.filter(or_(
+            sort_column > sort_value,
+            and_(sort_column == sort_value, id_column > row_id),
+        ))
+
+    # Ask for one extra row so we know whether another page exists
+    rows = query.order_by(sort_column, id_column).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    next_cursor = encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+    return rows, next_cursor
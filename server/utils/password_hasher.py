@@ -0,0 +1,124 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+from werkzeug.exceptions import ServiceUnavailable
+from werkzeug.security import generate_password_hash, check_password_hash
+
+CALIBRATION_ITERATIONS = 20000
+MIN_PBKDF2_ITERATIONS = 100000
+
+
+class HasherBusy(ServiceUnavailable):
+    """Every hashing slot stayed busy for PASSWORD_HASH_QUEUE_TIMEOUT - the client should retry"""
+    description = "Too many logins in progress, please retry shortly."
+
+
+def calibrate_pbkdf2(target_ms, hash_name="sha256"):
+    """pbkdf2 method string whose hashes take about target_ms on this machine"""
+    began = time.perf_counter()
+    generate_password_hash("calibration", f"pbkdf2:{hash_name}:{CALIBRATION_ITERATIONS}")
+    elapsed_ms = (time.perf_counter() - began) * 1000
+    iterations = int(CALIBRATION_ITERATIONS * target_ms / max(elapsed_ms, 0.001))
+    iterations = max(MIN_PBKDF2_ITERATIONS, iterations // 1000 * 1000)
+    return f"pbkdf2:{hash_name}:{iterations}"
+
+
+class _HasherState:
+    def __init__(self, method, workers, queue_size, timeout):
+        self.method = method
+        self.prefix = None   # method as werkzeug writes it into the stored hash
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        # Hashes running plus hashes waiting for a worker
+        self.slots = threading.BoundedSemaphore(workers + queue_size)
+
+
+class PasswordHasher:
+    """
+    Password hashing off the request thread, on a small dedicated pool.
+
+    At most PASSWORD_HASH_WORKERS hashes run at once (hashlib releases the
+    GIL while it works, so other requests keep being served) and
+    PASSWORD_HASH_QUEUE_SIZE more may wait. A request that can't get a slot
+    within PASSWORD_HASH_QUEUE_TIMEOUT seconds gets a 503 instead of piling
+    up. PASSWORD_HASH_METHOD picks the werkzeug method; setting
+    PASSWORD_HASH_TARGET_MS instead calibrates pbkdf2 iterations to that
+    latency when the app starts.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("PASSWORD_HASH_METHOD", "pbkdf2:sha256:600000")
+        app.config.setdefault("PASSWORD_HASH_TARGET_MS", 0)
+        app.config.setdefault("PASSWORD_HASH_WORKERS", 2)
+        app.config.setdefault("PASSWORD_HASH_QUEUE_SIZE", 8)
+        app.config.setdefault("PASSWORD_HASH_QUEUE_TIMEOUT", 5)
+
+        method = app.config["PASSWORD_HASH_METHOD"]
+        if app.config["PASSWORD_HASH_TARGET_MS"]:
+            method = calibrate_pbkdf2(app.config["PASSWORD_HASH_TARGET_MS"])
+        app.extensions["password_hasher"] = _HasherState(
+            method=method,
+            workers=app.config["PASSWORD_HASH_WORKERS"],
+            queue_size=app.config["PASSWORD_HASH_QUEUE_SIZE"],
+            timeout=app.config["PASSWORD_HASH_QUEUE_TIMEOUT"],
+        )
+
+    @property
+    def _state(self):
+        return current_app.extensions["password_hasher"]
+
+    @property
+    def method(self):
+        return self._state.method
+
+    def _run(self, fn, *args):
+        state = self._state
+        if not state.slots.acquire(timeout=state.timeout):
+            raise HasherBusy(retry_after=max(1, int(state.timeout)))
+        try:
+            return state.executor.submit(fn, *args).result()
+        finally:
+            state.slots.release()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash, password):
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """
+        True when a stored hash was made with a different method than the
+        current one, or with fewer pbkdf2 iterations. A higher count is left
+        alone: calibrated workers disagree slightly, and logins landing on
+        another worker shouldn't rewrite the row each time.
+        """
+        state = self._state
+        if state.prefix is None:
+            if state.method.startswith("pbkdf2:") and state.method.count(":") == 2:
+                state.prefix = state.method
+            else:
+                # Let werkzeug normalise the method (e.g. "scrypt" -> "scrypt:32768:8:1")
+                state.prefix = self._run(generate_password_hash, "", state.method).split("$", 1)[0]
+        stored = password_hash.split("$", 1)[0]
+        if stored == state.prefix:
+            return False
+        stored_iterations = _pbkdf2_iterations(stored)
+        current_iterations = _pbkdf2_iterations(state.prefix)
+        if stored_iterations is None or current_iterations is None:
+            return True
+        # Same pbkdf2 hash function: only a weaker hash is outdated
+        return stored.rsplit(":", 1)[0] != state.prefix.rsplit(":", 1)[0] or stored_iterations < current_iterations
+
+
+def _pbkdf2_iterations(prefix):
+    """Iteration count of a "pbkdf2:<hash>:<iterations>" prefix, or None for other methods"""
+    parts = prefix.split(":")
+    if len(parts) == 3 and parts[0] == "pbkdf2" and parts[2].isdigit():
+        return int(parts[2])
+    return None
@@ -0,0 +1,193 @@
+import logging
+import os
+import sys
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from flask import request
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+_slow_query_seconds = weakref.WeakKeyDictionary()   # engine -> threshold
+_PACKAGE_DIRS = ("site-packages", "dist-packages")
+_STDLIB_DIR = os.path.dirname(os.__file__)
+_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SENSITIVE_PARAMS = ("password", "token", "secret", "jti")
+
+
+class RequestQueryStats:
+    """SQL statements and time spent in the database for one request (or one query_budget block)"""
+
+    def __init__(self, repeat_threshold=0):
+        self.count = 0
+        self.seconds = 0.0
+        self.started = time.perf_counter()
+        self.statements = {}     # statement -> times run
+        self.repeat_threshold = repeat_threshold
+        self.repeated = []       # (statement, call site) that hit repeat_threshold
+
+    def add(self, statement, seconds):
+        self.count += 1
+        self.seconds += seconds
+        runs = self.statements[statement] = self.statements.get(statement, 0) + 1
+        if runs == self.repeat_threshold:
+            # The stack right now points at the loop issuing the query
+            self.repeated.append((statement, call_site()))
+
+
+def call_site():
+    """file:line of the innermost frame in our own code (not SQLAlchemy, Flask or the stdlib)"""
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        # "<string>" frames are code SQLAlchemy generates at runtime
+        if (filename != __file__ and not filename.startswith(("<", _STDLIB_DIR))
+                and not any(part in filename for part in _PACKAGE_DIRS)):
+            return f"{os.path.relpath(filename, _ROOT)}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return "unknown"
+
+
+def safe_parameters(context, executemany):
+    """Bound parameters for the log, with password/token values masked"""
+    params = getattr(context, "compiled_parameters", None) or []
+    first = {
+        key: "[REDACTED]" if any(word in key.lower() for word in SENSITIVE_PARAMS) else value
+        for key, value in (params[0] if params else {}).items()
+    }
+    return f"{first!r} (+{len(params) - 1} more rows)" if executemany and len(params) > 1 else repr(first)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # On the statement's own execution context, not the pooled connection: a
+    # statement that raises never reaches after_cursor_execute, and its start
+    # time goes away with the context
+    if context is not None:
+        context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    stats = getattr(_local, "stats", None)
+    if stats is not None:
+        stats.add(statement, elapsed)
+    for budget in getattr(_local, "budgets", ()):
+        budget.add(statement, elapsed)
+
+    threshold = _slow_query_seconds.get(conn.engine)
+    if threshold and elapsed >= threshold:
+        logger.warning(
+            "Slow query (%.1f ms): %s", elapsed * 1000, " ".join(statement.split()),
+            extra={"duration_ms": round(elapsed * 1000, 3), "parameters": safe_parameters(context, executemany),
+                   "call_site": call_site()},
+        )
+
+
+def install(engine, slow_query_ms=0):
+    """Time every statement run on engine and log those over slow_query_ms (0 = never). Safe to call again."""
+    _slow_query_seconds[engine] = slow_query_ms / 1000 if slow_query_ms else 0
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def start(repeat_threshold=0):
+    """Begin counting for the request on this thread"""
+    _local.stats = RequestQueryStats(repeat_threshold)
+    return _local.stats
+
+
+def stop():
+    """Stop counting and return what the request used (None if start() wasn't called)"""
+    stats = getattr(_local, "stats", None)
+    _local.stats = None
+    return stats
+
+
+def current():
+    return getattr(_local, "stats", None)
+
+
+@contextmanager
+def query_budget(limit):
+    """
+    Test helper: fail if the block runs more than `limit` SQL statements.
+
+        with query_budget(2):
+            client.get("/workouts?expand=exercises", headers=headers)
+
+    Counts everything on this thread, including requests made through
+    the Flask test client.
+    """
+    budget = RequestQueryStats()
+    budgets = _local.__dict__.setdefault("budgets", [])
+    budgets.append(budget)
+    try:
+        yield budget
+    finally:
+        budgets.remove(budget)
+    if budget.count > limit:
+        worst = sorted(budget.statements.items(), key=lambda item: -item[1])[:5]
+        details = "\n".join(f"  {runs}x {' '.join(statement.split())[:200]}" for statement, runs in worst)
+        raise AssertionError(f"{budget.count} queries, budget was {limit}:\n{details}")
+
+
+class QueryStats:
+    """
+    Per-request SQL instrumentation on every engine the app uses:
+
+      - statement count and DB time per request (read by /metrics)
+      - statements slower than SLOW_QUERY_MS logged with parameters and call site
+      - N+1 warning when one statement runs N_PLUS_ONE_THRESHOLD times in a request
+      - Server-Timing header with DB time (SERVER_TIMING, on in debug by default)
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        from extensions import db
+        app.config.setdefault("SLOW_QUERY_MS", 200)
+        app.config.setdefault("N_PLUS_ONE_THRESHOLD", 10)
+        if app.config.get("SERVER_TIMING") is None:
+            app.config["SERVER_TIMING"] = app.debug
+
+        with app.app_context():
+            engines = [db.engine, app.extensions.get("read_replica")]
+        for engine in engines:
+            if engine is not None:
+                install(engine, app.config["SLOW_QUERY_MS"])
+
+        repeat_threshold = app.config["N_PLUS_ONE_THRESHOLD"]
+        server_timing = app.config["SERVER_TIMING"]
+
+        def begin():
+            start(repeat_threshold)
+
+        def finish(response):
+            stats = stop()
+            if stats is None:
+                return response
+            for statement, site in stats.repeated:
+                logger.warning(
+                    "Possible N+1: the same query ran %d+ times in one request at %s: %s",
+                    repeat_threshold, site, " ".join(statement.split())[:300],
+                    extra={"endpoint": request.endpoint, "query_count": stats.count},
+                )
+            if server_timing:
+                total_ms = (time.perf_counter() - stats.started) * 1000
+                response.headers.add(
+                    "Server-Timing",
+                    f'db;dur={stats.seconds * 1000:.2f};desc="{stats.count} queries", app;dur={total_ms:.2f}',
+                )
+            return response
+
+        app.before_request(begin)
+        app.after_request(finish)
@@ -0,0 +1,248 @@
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from flask import current_app, jsonify, request
+
+# Per-endpoint cost in tokens (flask-restful endpoints are the lowercased class name).
+# Anything not listed costs 1. RATE_LIMIT_COSTS overrides these.
+DEFAULT_COSTS = {
+    "loginapi": 5,
+    "userloginresource": 5,
+    "registerapi": 5,
+    "userregisterresource": 5,
+    "importresource": 20,
+    "exportresource": 10,
+    "progresslogbulkresource": 5,
+}
+EXEMPT_ENDPOINTS = {"index", "health", "metrics", "static"}
+
+logger = logging.getLogger(__name__)
+
+
+def refill(tokens, updated, now, capacity, rate):
+    return min(capacity, tokens + max(0.0, now - updated) * rate)
+
+
+def take_tokens(tokens, cost, rate):
+    """Returns (tokens left, seconds to wait) - wait is 0 when the request may go ahead"""
+    if tokens >= cost:
+        return tokens - cost, 0.0
+    return tokens, (cost - tokens) / rate
+
+
+class MemoryRateLimitBackend:
+    """Buckets in this process. Each gunicorn worker counts separately."""
+
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def take(self, key, cost, capacity, rate, now):
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens, wait = take_tokens(refill(tokens, updated, now, capacity, rate), cost, rate)
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._prune(now, capacity, rate)
+        return wait
+
+    def _prune(self, now, capacity, rate):
+        # A bucket that has refilled completely is the same as no bucket
+        full_after = capacity / rate
+        for key, (_, updated) in list(self._buckets.items()):
+            if now - updated >= full_after:
+                del self._buckets[key]
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class SQLiteRateLimitBackend:
+    """
+    Buckets in a small SQLite file of their own (not the app database), so
+    every worker on the host shares them. Each take is one BEGIN IMMEDIATE
+    transaction on a per-thread connection.
+    """
+
+    prune_every = 1000
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._calls = 0
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limit_buckets "
+                "(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=1.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def take(self, key, cost, capacity, rate, now):
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, updated FROM rate_limit_buckets WHERE key = ?", (key,)).fetchone()
+            tokens, updated = row if row else (capacity, now)
+            tokens, wait = take_tokens(refill(tokens, updated, now, capacity, rate), cost, rate)
+            conn.execute("INSERT OR REPLACE INTO rate_limit_buckets (key, tokens, updated) VALUES (?, ?, ?)", (key, tokens, now))
+            self._calls += 1
+            if self._calls % self.prune_every == 0:
+                conn.execute("DELETE FROM rate_limit_buckets WHERE updated < ?", (now - capacity / rate,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return wait
+
+
+class RedisRateLimitBackend:
+    """Buckets in Redis (or any server speaking its protocol), updated atomically by a Lua script"""
+
+    key_prefix = "fitflow:ratelimit:"
+    script = """
+local capacity, rate, cost, now = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3]), tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local wait = 0
+if tokens >= cost then tokens = tokens - cost else wait = (cost - tokens) / rate end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait)
+"""
+
+    def __init__(self, url, client=None):
+        if client is None:
+            import redis
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self._take = self.client.register_script(self.script)
+
+    def take(self, key, cost, capacity, rate, now):
+        return float(self._take(keys=[self.key_prefix + key], args=[capacity, rate, cost, now]))
+
+
+def client_address(trusted_proxies):
+    """
+    The client's IP. Behind trusted_proxies reverse proxies it is the entry
+    that many hops from the end of X-Forwarded-For (each proxy appends the
+    address it saw); anything further left was sent by the client and can't
+    be trusted. With no proxies, or a shorter chain, the socket address.
+    """
+    if trusted_proxies:
+        forwarded = [part.strip() for part in request.headers.get("X-Forwarded-For", "").split(",")]
+        if len(forwarded) >= trusted_proxies and forwarded[-trusted_proxies]:
+            return forwarded[-trusted_proxies]
+    return request.remote_addr
+
+
+class _LimiterState:
+    def __init__(self, backend, config):
+        self.backend = backend
+        self.enabled = config["RATE_LIMIT_ENABLED"]
+        self.user_limit = (config["RATE_LIMIT_USER_CAPACITY"], config["RATE_LIMIT_USER_REFILL"])
+        self.ip_limit = (config["RATE_LIMIT_IP_CAPACITY"], config["RATE_LIMIT_IP_REFILL"])
+        self.costs = dict(DEFAULT_COSTS, **config["RATE_LIMIT_COSTS"])
+        self.trusted_proxies = config["RATE_LIMIT_TRUSTED_PROXIES"]
+
+
+class RateLimiter:
+    """
+    Token-bucket rate limiting, checked in before_request - ahead of auth
+    and any database work.
+
+    Requests with a valid token draw from the user's bucket; anonymous ones
+    (login, register) from the client IP's. Each endpoint costs
+    RATE_LIMIT_COSTS tokens (default 1) and buckets refill continuously.
+    An empty bucket means 429 with Retry-After.
+
+    Behind a reverse proxy set RATE_LIMIT_TRUSTED_PROXIES to the number of
+    proxy hops, so anonymous clients are told apart by X-Forwarded-For
+    rather than all sharing the proxy's address.
+
+    RATE_LIMIT_BACKEND picks where buckets live:
+      memory - this process only (default)
+      sqlite - RATE_LIMIT_SQLITE_PATH, shared by the workers on one host
+      redis  - RATE_LIMIT_REDIS_URL, shared by every host
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("RATE_LIMIT_ENABLED", True)
+        app.config.setdefault("RATE_LIMIT_BACKEND", "memory")
+        app.config.setdefault("RATE_LIMIT_SQLITE_PATH", os.path.join(app.instance_path, "rate_limits.db"))
+        app.config.setdefault("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0")
+        app.config.setdefault("RATE_LIMIT_USER_CAPACITY", 60)
+        app.config.setdefault("RATE_LIMIT_USER_REFILL", 2.0)
+        app.config.setdefault("RATE_LIMIT_IP_CAPACITY", 30)
+        app.config.setdefault("RATE_LIMIT_IP_REFILL", 1.0)
+        app.config.setdefault("RATE_LIMIT_COSTS", {})
+        app.config.setdefault("RATE_LIMIT_TRUSTED_PROXIES", 0)
+
+        backend = app.config["RATE_LIMIT_BACKEND"]
+        if backend == "memory":
+            store = MemoryRateLimitBackend()
+        elif backend == "sqlite":
+            os.makedirs(os.path.dirname(app.config["RATE_LIMIT_SQLITE_PATH"]) or ".", exist_ok=True)
+            store = SQLiteRateLimitBackend(app.config["RATE_LIMIT_SQLITE_PATH"])
+        elif backend == "redis":
+            store = RedisRateLimitBackend(app.config["RATE_LIMIT_REDIS_URL"])
+        else:
+            raise ValueError(f"Unknown RATE_LIMIT_BACKEND: {backend}")
+
+        app.extensions["rate_limiter"] = _LimiterState(store, app.config)
+        app.before_request(self.check)
+
+    @property
+    def _state(self):
+        return current_app.extensions["rate_limiter"]
+
+    def _identity(self):
+        """user:<id> for a valid bearer token, otherwise ip:<address>"""
+        auth_header = request.headers.get("Authorization", "")
+        if auth_header.startswith("Bearer "):
+            from extensions import token_verifier
+            try:
+                # Memoized - usually no signature check, never a query
+                return f"user:{token_verifier.decode(auth_header[7:])['user_id']}"
+            except Exception:
+                pass  # token_required will reject it; charge the IP meanwhile
+        return f"ip:{client_address(self._state.trusted_proxies)}"
+
+    def check(self):
+        state = self._state
+        if not state.enabled or request.method == "OPTIONS" or request.endpoint in EXEMPT_ENDPOINTS:
+            return None
+
+        identity = self._identity()
+        capacity, rate = state.user_limit if identity.startswith("user:") else state.ip_limit
+        cost = min(state.costs.get(request.endpoint, 1), capacity)
+        try:
+            wait = state.backend.take(identity, cost, capacity, rate, time.time())
+        except Exception:
+            # A broken limiter store must not take the API down with it
+            logger.warning("Rate limiter backend failed, letting request through", exc_info=True)
+            return None
+        if wait <= 0:
+            return None
+
+        response = jsonify({"error": "Too many requests, slow down"})
+        response.status_code = 429
+        response.headers["Retry-After"] = str(max(1, math.ceil(wait)))
+        return response
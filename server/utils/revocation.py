@@ -0,0 +1,115 @@
+import heapq
+import threading
+import time
+from datetime import datetime
+from flask import current_app
+
+
+class MemoryRevocationBackend:
+    """
+    Revoked jtis kept in this process. Entries are dropped once the token
+    they belong to has expired, so memory only holds tokens that could
+    still be used. Not shared between gunicorn workers.
+    """
+
+    def __init__(self):
+        self._expiry = {}
+        self._heap = []
+        self._lock = threading.Lock()
+
+    def revoke(self, jti, expires_at):
+        with self._lock:
+            self._evict(time.time())
+            self._expiry[jti] = expires_at
+            heapq.heappush(self._heap, (expires_at, jti))
+
+    def is_revoked(self, jti):
+        expires_at = self._expiry.get(jti)
+        return expires_at is not None and expires_at > time.time()
+
+    def _evict(self, now):
+        while self._heap and self._heap[0][0] <= now:
+            expires_at, jti = heapq.heappop(self._heap)
+            if self._expiry.get(jti) == expires_at:
+                del self._expiry[jti]
+
+    def __len__(self):
+        return len(self._expiry)
+
+
+class DatabaseRevocationBackend:
+    """Revoked jtis in the revoked_tokens table (SQLite or Postgres), shared by every worker"""
+
+    def __init__(self):
+        from models import db, RevokedToken
+        self.db = db
+        self.model = RevokedToken
+
+    def revoke(self, jti, expires_at):
+        session = self.db.session
+        session.query(self.model).filter(self.model.expires_at <= datetime.utcnow()).delete()
+        session.merge(self.model(jti=jti, expires_at=datetime.utcfromtimestamp(expires_at)))
+        session.commit()
+
+    def is_revoked(self, jti):
+        # Primary key lookup
+        token = self.db.session.get(self.model, jti)
+        return token is not None and token.expires_at > datetime.utcnow()
+
+
+class RedisRevocationBackend:
+    """Revoked jtis in Redis (or any server speaking its protocol); keys expire with the token"""
+
+    key_prefix = "fitflow:revoked:"
+
+    def __init__(self, url):
+        import redis
+        self.client = redis.Redis.from_url(url)
+
+    def revoke(self, jti, expires_at):
+        ttl = int(expires_at - time.time())
+        if ttl > 0:
+            self.client.set(self.key_prefix + jti, 1, ex=ttl)
+
+    def is_revoked(self, jti):
+        return bool(self.client.exists(self.key_prefix + jti))
+
+
+class RevocationStore:
+    """
+    Token revocation keyed by jti.
+
+    REVOCATION_BACKEND picks where revocations live:
+      memory   - this process only (default, fine for a single worker)
+      database - the revoked_tokens table
+      redis    - REVOCATION_REDIS_URL
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("REVOCATION_BACKEND", "memory")
+        app.config.setdefault("REVOCATION_REDIS_URL", "redis://localhost:6379/0")
+
+        backend = app.config["REVOCATION_BACKEND"]
+        if backend == "memory":
+            app.extensions["revocation_store"] = MemoryRevocationBackend()
+        elif backend == "database":
+            app.extensions["revocation_store"] = DatabaseRevocationBackend()
+        elif backend == "redis":
+            app.extensions["revocation_store"] = RedisRevocationBackend(app.config["REVOCATION_REDIS_URL"])
+        else:
+            raise ValueError(f"Unknown REVOCATION_BACKEND: {backend}")
+
+    @property
+    def backend(self):
+        return current_app.extensions["revocation_store"]
+
+    def revoke(self, jti, expires_at):
+        """Revoke a token until its exp (a unix timestamp)"""
+        self.backend.revoke(jti, expires_at)
+
+    def is_revoked(self, jti):
+        return self.backend.is_revoked(jti)
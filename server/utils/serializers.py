@@ -0,0 +1,75 @@
+from operator import itemgetter
+
+
+class ColumnSerializerMixin:
+    """
+    to_dict() built from a fixed tuple of column names.
+
+    Loaded column values are read straight out of the instance __dict__ in
+    one itemgetter call instead of going through the ORM attribute
+    descriptors one by one. Expired or unloaded instances fall back to
+    normal attribute access, which lets the ORM refresh them.
+
+    Subclasses set serialize_fields (and serialize_dates for date columns,
+    which are sent as ISO strings).
+    """
+    serialize_fields = ()
+    serialize_dates = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        fields = cls.serialize_fields
+        if not fields:
+            return
+        # itemgetter with one name returns a bare value, not a tuple
+        getter = itemgetter(*fields) if len(fields) > 1 else (lambda d: (d[fields[0]],))
+        cls._field_getter = staticmethod(getter)
+
+    def to_dict(self):
+        try:
+            values = self._field_getter(self.__dict__)
+        except KeyError:
+            values = tuple(getattr(self, name) for name in self.serialize_fields)
+        return self.row_to_dict(values)
+
+    @classmethod
+    def row_to_dict(cls, row, fields=None):
+        """
+        Serialize a row of values in fields order (serialize_fields by default),
+        e.g. a column-projected query result. Extra trailing values are ignored.
+        """
+        fields = fields or cls.serialize_fields
+        data = dict(zip(fields, row))
+        for name in cls.serialize_dates:
+            value = data.get(name)
+            if value is not None:
+                data[name] = value.isoformat()
+        return data
+
+    @classmethod
+    def parse_fields(cls, value):
+        """
+        Turn a ?fields=a,b sparse fieldset into a tuple of field names, in
+        serialize_fields order. A missing or empty parameter means every
+        field. Raises ValueError on unknown names, or on a list that names
+        nothing (?fields=,).
+        """
+        if not value:
+            return cls.serialize_fields
+        wanted = {name.strip() for name in value.split(",") if name.strip()}
+        if not wanted:
+            raise ValueError("fields must name at least one field")
+        unknown = wanted.difference(cls.serialize_fields)
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        return tuple(name for name in cls.serialize_fields if name in wanted)
+
+    @classmethod
+    def serialize_columns(cls, fields=None, extra=()):
+        """
+        The mapped columns behind fields, for db.session.query(*Model.serialize_columns()).
+        Columns in extra (e.g. the sort keys for paging) are appended if not already selected.
+        """
+        fields = fields or cls.serialize_fields
+        names = tuple(fields) + tuple(name for name in extra if name not in fields)
+        return [getattr(cls, name) for name in names]
@@ -0,0 +1,55 @@
+from flask import Response, stream_with_context
+from server.utils.json_output import dumps
+
+NDJSON = "application/x-ndjson"
+STREAM_BATCH_SIZE = 1000
+
+
+def stream_format(request):
+    """
+    "ndjson" for Accept: application/x-ndjson (or ?stream=ndjson), "json"
+    for ?stream=1, None when the client did not ask for a stream.
+    """
+    stream = request.args.get("stream", "").lower()
+    if stream == "ndjson" or request.accept_mimetypes.best == NDJSON:
+        return "ndjson"
+    if stream in ("1", "true", "json"):
+        return "json"
+    return None
+
+
+def stream_rows(query, serialize, fmt="json", batch_size=STREAM_BATCH_SIZE):
+    """
+    Stream a query as NDJSON (one object per line) or as one chunked JSON
+    array. Rows are fetched batch_size at a time with yield_per and each
+    batch is written as it is encoded, so memory stays flat however many
+    rows there are.
+    """
+    # Run the query now, inside the handler, so it uses the same bind
+    # (e.g. the read replica) as a non-streamed response would
+    rows = iter(query.yield_per(batch_size))
+    ndjson = fmt == "ndjson"
+
+    def batches():
+        batch = []
+        for row in rows:
+            batch.append(dumps(serialize(row)))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def generate():
+        if ndjson:
+            for batch in batches():
+                yield b"\n".join(batch) + b"\n"
+            return
+        yield b"["
+        prefix = b""
+        for batch in batches():
+            yield prefix + b",".join(batch)
+            prefix = b","
+        yield b"]\n"
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON if ndjson else "application/json")
@@ -0,0 +1,171 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import re
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from flask import has_request_context, request
+
+REDACTED = "[REDACTED]"
+SENSITIVE_KEYS = ("password", "secret", "token", "authorization", "api_key", "jwt")
+SENSITIVE_PATTERNS = [
+    re.compile(r"eyJ[\w-]+\.[\w-]+\.[\w-]+"),       # JWTs
+    re.compile(r"(?i)(bearer\s+)[\w.~+/=-]+"),       # Authorization header values
+]
+
+# Attributes every LogRecord has - anything else came in through extra=
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener = None
+_lock = threading.Lock()
+
+
+def redact(value, secrets=()):
+    """Mask JWTs, bearer tokens and known secret values inside a string"""
+    for secret in secrets:
+        value = value.replace(secret, REDACTED)
+    for pattern in SENSITIVE_PATTERNS:
+        value = pattern.sub(lambda m: (m.group(1) if m.groups() else "") + REDACTED, value)
+    return value
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line. Runs on the listener thread, so redaction costs the request nothing."""
+
+    def __init__(self, secrets=()):
+        super().__init__()
+        self.secrets = [s for s in secrets if s]
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": redact(record.getMessage(), self.secrets),
+        }
+        for key, value in vars(record).items():
+            if key in _RECORD_ATTRS or key.startswith("_"):
+                continue
+            if any(word in key.lower() for word in SENSITIVE_KEYS):
+                value = REDACTED
+            elif isinstance(value, str):
+                value = redact(value, self.secrets)
+            entry[key] = value
+        if record.exc_info:
+            entry["exception"] = redact(self.formatException(record.exc_info), self.secrets)
+        return json.dumps(entry, default=str)
+
+
+class RequestContextFilter(logging.Filter):
+    """Stamp records with the request they came from (must run before the record leaves the thread)"""
+
+    def filter(self, record):
+        if has_request_context() and not hasattr(record, "path"):
+            record.method = request.method
+            record.path = request.path
+            record.remote_addr = request.remote_addr
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Repetitive warnings and errors: the first `burst` records with the same
+    logger, message template and exception type in each `window` seconds
+    pass, then only every `every`th. Passed records carry how many were
+    dropped since the last one (suppressed=N).
+    """
+
+    def __init__(self, level=logging.WARNING, burst=10, every=100, window=60.0, timer=time.monotonic):
+        super().__init__()
+        self.level = level
+        self.burst = burst
+        self.every = max(1, every)
+        self.window = window
+        self.timer = timer
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno < self.level:
+            return True
+        exc_type = record.exc_info[0].__name__ if record.exc_info and record.exc_info[0] else None
+        key = (record.name, record.msg, exc_type)
+        now = self.timer()
+        with self._lock:
+            started, seen, dropped = self._counts.get(key, (now, 0, 0))
+            if now - started >= self.window:
+                started, seen = now, 0
+            seen += 1
+            keep = seen <= self.burst or (seen - self.burst) % self.every == 0
+            self._counts[key] = (started, seen, 0 if keep else dropped + 1)
+        if keep and dropped:
+            record.suppressed = dropped
+        return keep
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Hands records to the listener thread untouched - formatting, traceback
+    rendering and redaction all happen there. A full queue drops the record
+    instead of blocking the request.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def configure_logging(app):
+    """
+    Route all logging through one bounded queue drained by a background
+    thread that writes JSON lines to stderr. Installed once per process;
+    later apps only update the levels.
+    """
+    global _listener
+    config = app.config
+    root = logging.getLogger()
+    root.setLevel(config.get("LOG_LEVEL", "INFO"))
+    for name, level in config.get("LOG_LEVELS", {}).items():
+        logging.getLogger(name).setLevel(level)
+
+    with _lock:
+        if _listener is not None:
+            return
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(JsonFormatter(secrets=[config.get("SECRET_KEY"), config.get("JWT_SECRET_KEY")]))
+
+        log_queue = queue.Queue(maxsize=config.get("LOG_QUEUE_SIZE", 10000))
+        queue_handler = DroppingQueueHandler(log_queue)
+        queue_handler.addFilter(SamplingFilter(
+            burst=config.get("LOG_SAMPLE_BURST", 10),
+            every=config.get("LOG_SAMPLE_EVERY", 100),
+            window=config.get("LOG_SAMPLE_WINDOW", 60.0),
+        ))
+        queue_handler.addFilter(RequestContextFilter())
+        root.addHandler(queue_handler)
+
+        _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)  # flush what is queued on shutdown
+        if hasattr(os, "register_at_fork"):
+            # Threads don't survive fork (gunicorn --preload) - give each worker its own
+            os.register_at_fork(after_in_child=_restart_listener)
+
+
+def _restart_listener():
+    _listener._thread = None
+    _listener.start()
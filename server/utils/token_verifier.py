@@ -0,0 +1,79 @@
+import time
+import uuid
+import jwt
+from flask import current_app
+from server.utils.cache import TTLCache
+
+
+class _VerifierState:
+    def __init__(self, key, algorithm, expires_in, leeway, cache_size):
+        self.key = key
+        self.algorithm = algorithm
+        self.algorithms = [algorithm]
+        self.expires_in = expires_in
+        self.leeway = leeway
+        self.options = {"require": ["exp", "iat", "jti"]}
+        self.cache = TTLCache(maxsize=cache_size, ttl=expires_in)
+
+
+class TokenVerifier:
+    """
+    Issues and verifies our JWTs.
+
+    The key and decode options are read once in init_app instead of on
+    every request. Tokens that verified recently are remembered until they
+    expire, so a client sending the same token again skips the HMAC check
+    and JSON parsing.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("JWT_ALGORITHM", "HS256")
+        app.config.setdefault("JWT_EXPIRATION_SECONDS", 24 * 60 * 60)
+        app.config.setdefault("JWT_LEEWAY_SECONDS", 0)
+        app.config.setdefault("JWT_VERIFY_CACHE_SIZE", 4096)
+        app.extensions["token_verifier"] = _VerifierState(
+            key=app.config["JWT_SECRET_KEY"],
+            algorithm=app.config["JWT_ALGORITHM"],
+            expires_in=app.config["JWT_EXPIRATION_SECONDS"],
+            leeway=app.config["JWT_LEEWAY_SECONDS"],
+            cache_size=app.config["JWT_VERIFY_CACHE_SIZE"],
+        )
+
+    @property
+    def _state(self):
+        return current_app.extensions["token_verifier"]
+
+    def encode(self, claims):
+        """Sign claims, adding iat/nbf/exp and a unique jti"""
+        state = self._state
+        now = int(time.time())
+        payload = {"iat": now, "nbf": now, "exp": now + state.expires_in, "jti": uuid.uuid4().hex}
+        payload.update(claims)
+        return jwt.encode(payload, state.key, algorithm=state.algorithm)
+
+    def decode(self, token):
+        """Return the token's claims. Raises jwt.InvalidTokenError if it is bad or expired."""
+        state = self._state
+        claims = state.cache.get(token)
+        if claims is not None:
+            # Signature was already checked - only the clock can have changed
+            if claims["exp"] + state.leeway <= time.time():
+                state.cache.pop(token)
+                raise jwt.ExpiredSignatureError("Signature has expired")
+            return claims
+
+        claims = jwt.decode(
+            token,
+            state.key,
+            algorithms=state.algorithms,
+            options=state.options,
+            leeway=state.leeway,
+        )
+        remaining = claims["exp"] + state.leeway - time.time()
+        if remaining > 0:
+            state.cache.set(token, claims, ttl=remaining)
+        return claims
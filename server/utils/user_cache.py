@@ -0,0 +1,85 @@
+import threading
+from flask import current_app
+from server.utils.cache import TTLCache
+
+
+class CachedUser:
+    """The bit of a user that authenticated handlers actually need"""
+    __slots__ = ("id", "username")
+
+    def __init__(self, id, username):
+        self.id = id
+        self.username = username
+
+    def __repr__(self):
+        return f"<CachedUser {self.id} {self.username!r}>"
+
+
+class _UserCacheState:
+    def __init__(self, maxsize, ttl):
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        # user id -> [loads in flight, invalidations seen]; only held while a
+        # load is running, so it never outgrows the number of busy threads
+        self.loading = {}
+        self.lock = threading.Lock()
+
+
+class UserCache:
+    """
+    Per-process cache of authenticated user identities, keyed by user id.
+
+    Entries live for USER_CACHE_TTL seconds, so a change made by another
+    worker shows up within that window. Changes made in this process are
+    seen straight away through invalidate().
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("USER_CACHE_TTL", 60)
+        app.config.setdefault("USER_CACHE_SIZE", 10000)
+        app.extensions["user_cache"] = _UserCacheState(
+            maxsize=app.config["USER_CACHE_SIZE"],
+            ttl=app.config["USER_CACHE_TTL"],
+        )
+
+    @property
+    def _state(self):
+        return current_app.extensions["user_cache"]
+
+    def get(self, user_id, loader):
+        """Return the cached identity, calling loader(user_id) on a miss. None if the user is gone."""
+        state = self._state
+        identity = state.cache.get(user_id)
+        if identity is not None:
+            return identity
+
+        with state.lock:
+            pending = state.loading.setdefault(user_id, [0, 0])
+            pending[0] += 1
+            version = pending[1]
+        identity = None
+        try:
+            user = loader(user_id)
+            if user is not None:
+                identity = CachedUser(user.id, user.username)
+        finally:
+            with state.lock:
+                pending[0] -= 1
+                if not pending[0]:
+                    del state.loading[user_id]
+                # Don't store what we loaded if the user changed while we were loading
+                if identity is not None and pending[1] == version:
+                    state.cache.set(user_id, identity)
+        return identity
+
+    def invalidate(self, user_id):
+        """Drop a user after their profile changes or they are deleted"""
+        state = self._state
+        with state.lock:
+            pending = state.loading.get(user_id)
+            if pending is not None:
+                pending[1] += 1
+            state.cache.pop(user_id)
@@ -0,0 +1,93 @@
+from sqlalchemy import func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from models import db, Workout, WorkoutDailyStat
+
+table = WorkoutDailyStat.__table__
+TOTALS = ("workout_count", "total_duration", "total_calories")
+
+
+def stat_key(workout):
+    """Rollup row a workout counts towards"""
+    return workout.user_id, workout.date, workout.workout_type or ''
+
+
+def workout_delta(workout, sign=1):
+    """The change one workout makes to its rollup row (sign=-1 to take it away)"""
+    return {
+        stat_key(workout): (
+            sign,
+            sign * (workout.duration or 0),
+            sign * (workout.calories_burned or 0),
+        )
+    }
+
+
+def merge_deltas(*deltas):
+    merged = {}
+    for delta in deltas:
+        for key, values in delta.items():
+            current = merged.get(key, (0, 0, 0))
+            merged[key] = tuple(a + b for a, b in zip(current, values))
+    return merged
+
+
+def apply_deltas(deltas):
+    """
+    Add deltas to the rollup rows in the current transaction. Call after
+    flush and before commit so the rollup commits with the workout change.
+    """
+    deltas = {key: values for key, values in deltas.items() if any(values)}
+    if not deltas:
+        return
+
+    rows = [
+        dict(zip(("user_id", "day", "workout_type") + TOTALS, key + values))
+        for key, values in deltas.items()
+    ]
+    dialect = db.session.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        insert_stmt = (sqlite.insert if dialect == "sqlite" else postgresql.insert)(table)
+        db.session.execute(
+            insert_stmt.on_conflict_do_update(
+                index_elements=["user_id", "day", "workout_type"],
+                set_={name: table.c[name] + insert_stmt.excluded[name] for name in TOTALS},
+            ),
+            rows,
+        )
+    else:
+        for row in rows:
+            stat = db.session.get(WorkoutDailyStat, (row["user_id"], row["day"], row["workout_type"]))
+            if stat is None:
+                db.session.add(WorkoutDailyStat(**row))
+            else:
+                for name in TOTALS:
+                    setattr(stat, name, getattr(stat, name) + row[name])
+        db.session.flush()
+
+    # Days with no workouts left don't need a row
+    db.session.query(WorkoutDailyStat).filter(
+        WorkoutDailyStat.user_id.in_({key[0] for key in deltas}),
+        WorkoutDailyStat.day.in_({key[1] for key in deltas}),
+        WorkoutDailyStat.workout_count <= 0,
+    ).delete(synchronize_session=False)
+
+
+def rebuild_workout_stats(user_id=None):
+    """Recompute rollup rows from the workouts table, e.g. after seeding or a bulk load"""
+    stats = db.session.query(WorkoutDailyStat)
+    source = select(
+        Workout.user_id,
+        Workout.date,
+        func.coalesce(Workout.workout_type, ''),
+        func.count(),
+        func.coalesce(func.sum(Workout.duration), 0),
+        func.coalesce(func.sum(Workout.calories_burned), 0),
+    ).group_by(Workout.user_id, Workout.date, func.coalesce(Workout.workout_type, ''))
+    if user_id is not None:
+        stats = stats.filter_by(user_id=user_id)
+        source = source.where(Workout.user_id == user_id)
+
+    stats.delete(synchronize_session=False)
+    db.session.execute(
+        insert(table).from_select(["user_id", "day", "workout_type"] + list(TOTALS), source)
+    )